@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from . import db, signals  # noqa: F401
+
+        db.check_replicas()
+        connection_created.connect(db.configure_sqlite)
+        connection_created.connect(db.install_execute_wrappers)
+        request_started.connect(db.check_connections)
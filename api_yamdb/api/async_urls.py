@@ -0,0 +1,4 @@
+from .async_views import async_read_patterns
+from .urls import app_name, urlpatterns as sync_urlpatterns  # noqa: F401
+
+urlpatterns = async_read_patterns(sync_urlpatterns)
@@ -0,0 +1,95 @@
+"""
+Асинхронные представления для горячих GET-маршрутов под ASGI: список
+и карточка произведения, отзывы и комментарии, а также выгрузка таблиц,
+потоковый ответ которой Django 3.2 под ASGI перебирает прямо в цикле
+событий, где запросы к базе запрещены. Цикл событий только
+принимает и отдаёт данные, а представление DRF (фильтры, пагинация,
+кэш, условные запросы) выполняется в ограниченном пуле потоков
+db.run_in_pool, поэтому медленные клиенты не занимают потоки. Прочие
+методы тех же маршрутов вызываются как обычные синхронные
+представления.
+"""
+import tempfile
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import URLPattern
+
+from . import db
+
+READ_METHODS = ('GET', 'HEAD')
+ASYNC_READ_ROUTES = ('title-list', 'title-detail', 'review-list',
+                     'comment-list', 'export')
+# Больше этого размера потоковый ответ пишется во временный файл.
+SPOOL_MAX_SIZE = 1024 * 1024
+SPOOL_CHUNK_SIZE = 64 * 1024
+
+
+def read_spooled(spooled):
+    try:
+        while True:
+            chunk = spooled.read(SPOOL_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        spooled.close()
+
+
+def spool(response):
+    """
+    Перебирает потоковый ответ в потоке пула: цикл событий потом только
+    читает готовые байты из памяти или временного файла.
+    """
+    spooled = tempfile.SpooledTemporaryFile(SPOOL_MAX_SIZE)
+    for chunk in response:
+        spooled.write(chunk)
+    spooled.seek(0)
+    return StreamingHttpResponse(
+        read_spooled(spooled), status=response.status_code,
+        headers=response.headers
+    )
+
+
+def render(view, request, *args, **kwargs):
+    response = view(request, *args, **kwargs)
+    if response.streaming:
+        return spool(response)
+    if not hasattr(response, 'render'):
+        return response
+    response.render()
+    # Готовый HttpResponse: иначе Django отправит отложенный рендеринг
+    # в общий поток синхронного кода.
+    plain = HttpResponse(
+        response.content, status=response.status_code,
+        headers=response.headers
+    )
+    plain.cookies = response.cookies
+    return plain
+
+
+def read_view(view):
+    """Асинхронная обёртка синхронного представления view."""
+    sync_view = sync_to_async(view)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in READ_METHODS:
+            return await db.run_in_pool(render, view, request, *args,
+                                        **kwargs)
+        return await sync_view(request, *args, **kwargs)
+
+    return async_view
+
+
+def async_read_patterns(urlpatterns):
+    """Копия urlpatterns, где маршруты ASYNC_READ_ROUTES асинхронные."""
+    return [
+        URLPattern(
+            pattern.pattern, read_view(pattern.callback),
+            pattern.default_args, pattern.name
+        ) if getattr(pattern, 'name', None) in ASYNC_READ_ROUTES
+        else pattern
+        for pattern in urlpatterns
+    ]
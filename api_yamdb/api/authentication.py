@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+ROLE_CLAIM = 'role'
+
+
+class RoleAccessToken(AccessToken):
+    """Access-токен с логином, ролью и признаком суперпользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['username'] = user.username
+        token[ROLE_CLAIM] = user.role
+        token['is_superuser'] = user.is_superuser
+        return token
+
+
+class ClaimsUser(TokenUser):
+    """
+    Пользователь, собранный из утверждений токена без запроса к базе.
+    Сравнивается с экземплярами User по id, поэтому проверки авторства
+    в permissions работают без изменений.
+    """
+
+    @property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @property
+    def is_user(self):
+        return self.role == User.USER
+
+    @property
+    def is_admin(self):
+        return self.role == User.ADMIN
+
+    @property
+    def is_moderator(self):
+        return self.role == User.MODERATOR
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Для безопасных методов берёт пользователя из утверждений токена.
+    Пользователь загружается из базы для изменяющих запросов,
+    для представлений с requires_db_user = True (/users/ и выгрузки
+    только для администраторов: роль в токене живёт до его истечения,
+    и разжалованный администратор не должен их читать) и для токенов
+    без утверждения о роли.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if self.requires_db_user(request, validated_token):
+            return self.get_user(validated_token), validated_token
+        return ClaimsUser(validated_token), validated_token
+
+    def requires_db_user(self, request, validated_token):
+        view = request.parser_context.get('view')
+        return (
+            request.method not in SAFE_METHODS
+            or getattr(view, 'requires_db_user', False)
+            or ROLE_CLAIM not in validated_token
+        )
+
+
+def requires_db_user(view):
+    """
+    Декоратор поверх @api_view: пользователь представления-функции
+    загружается из базы, а не из утверждений токена.
+    """
+    view.cls.requires_db_user = True
+    return view
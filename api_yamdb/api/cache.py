@@ -0,0 +1,128 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+CATEGORIES = 'categories'
+GENRES = 'genres'
+TITLES = 'titles'
+REVIEWS = 'reviews'
+COMMENTS = 'comments'
+RESOURCES = (CATEGORIES, GENRES, TITLES, REVIEWS, COMMENTS)
+# Кэши, которые видит только текущий процесс.
+PROCESS_LOCAL_BACKENDS = (DummyCache, LocMemCache)
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def is_shared():
+    """Версии ресурсов общие для всех процессов (Redis, Memcached, файлы)."""
+    return not isinstance(get_cache(), PROCESS_LOCAL_BACKENDS)
+
+
+def count(event, resource):
+    with _stats_lock:
+        _stats[event, resource] += 1
+
+
+def get_stats():
+    """Счётчики попаданий, промахов и сбросов кэша в текущем процессе."""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    stats = {}
+    for resource in RESOURCES:
+        hits = snapshot.get(('hits', resource), 0)
+        misses = snapshot.get(('misses', resource), 0)
+        stats[resource] = {
+            'hits': hits,
+            'misses': misses,
+            'invalidations': snapshot.get(('invalidations', resource), 0),
+            'hit_ratio': round(hits / (hits + misses), 4)
+            if hits + misses else None,
+        }
+    return stats
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def scoped(resource, pk):
+    """
+    Ресурс одного объекта, например отзывы произведения. Его версия
+    сбрасывается и вместе с общей версией resource.
+    """
+    return f'{resource}:{pk}'
+
+
+def get_versions(*resources):
+    """
+    Версии ресурсов входят в ключи кэша и ETag. Если версия вытеснена
+    из кэша, создаётся новая, поэтому старые ответы никогда не
+    используются повторно. Для scoped-ресурса учитывается и общая версия.
+    """
+    cache = get_cache()
+    names = []
+    for resource in resources:
+        base = resource.partition(':')[0]
+        if base != resource and base not in names:
+            names.append(base)
+        names.append(resource)
+    keys = {f'api:version:{name}': name for name in names}
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_version(resource):
+    return get_versions(resource)[-1]
+
+
+def invalidate(*resources):
+    cache = get_cache()
+    now = time.time_ns()
+    cache.set_many(
+        {f'api:version:{resource}': now for resource in resources}, None
+    )
+    for resource in resources:
+        count('invalidations', resource.partition(':')[0])
+
+
+def get_url_digest(request):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    url = f'{request.scheme}://{request.get_host()}{request.path}?{query}'
+    return hashlib.md5(url.encode()).hexdigest()
+
+
+def make_key(request, resource):
+    return f'api:{resource}:{get_version(resource)}:{get_url_digest(request)}'
+
+
+def get_etag(request, *resources):
+    """
+    ETag и время последнего изменения (Unix-время в секундах, дробное)
+    ответа по версиям ресурсов, адресу и формату ответа, без обращения
+    к базе.
+    """
+    versions = get_versions(*resources)
+    renderer = getattr(request, 'accepted_renderer', None)
+    digest = hashlib.md5(
+        f'{versions}:{get_url_digest(request)}:'
+        f'{getattr(renderer, "format", "")}'.encode()
+    ).hexdigest()
+    return f'"{digest}"', max(versions) / 10 ** 9
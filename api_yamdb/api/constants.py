@@ -5,3 +5,8 @@ MAX_EMAIL_LENGTH = 254
 MIN_YEAR_VALUE_VALIDATOR = 1800
 MIN_SCORE_VALUE_VALIDATOR = 1
 MAX_SCORE_VALUE_VALIDATOR = 10
+MAX_SEARCH_TERM_LENGTH = 64
+MAX_LEADERBOARD_KIND_LENGTH = 16
+MAX_LEADERBOARD_BOARD_LENGTH = 64
+MAX_DICTIONARY_RESOURCE_LENGTH = 16
+MAX_BULK_ITEMS = 500
@@ -0,0 +1,181 @@
+"""
+Настройка соединений с базой: прагмы SQLite при подключении, проверка
+постоянных соединений перед запросом (аналог CONN_HEALTH_CHECKS из
+Django 4.1), маршрутизация чтения на реплики, обёртки SQL-запросов
+из контекста и пул потоков для работы с базой из асинхронного кода.
+"""
+import asyncio
+import contextvars
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections, connections
+
+from .cache import get_cache, is_shared
+
+DEFAULT_DB_ALIAS = 'default'
+
+_replica = contextvars.ContextVar('replica', default=None)
+_execute_wrappers = contextvars.ContextVar('execute_wrappers', default=())
+_executor = None
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def install_execute_wrappers(sender, connection, **kwargs):
+    if context_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(context_execute_wrapper)
+
+
+def context_execute_wrapper(execute, sql, params, many, context):
+    for wrapper in reversed(_execute_wrappers.get()):
+        execute = partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def execute_wrapper(wrapper):
+    """
+    Как connection.execute_wrapper, но для всех соединений и потоков,
+    куда передаётся текущий контекст: обёртка видит и запросы,
+    выполненные через sync_to_async или run_in_pool.
+    """
+    token = _execute_wrappers.set((*_execute_wrappers.get(), wrapper))
+    try:
+        yield
+    finally:
+        _execute_wrappers.reset(token)
+
+
+def check_connections(sender, **kwargs):
+    """
+    Закрывает переиспользуемые (CONN_MAX_AGE) соединения, которые
+    перестали отвечать, чтобы запрос открыл новое.
+    """
+    if not settings.DB_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
+
+
+class ReplicaRouter:
+    """
+    Запись всегда идёт в основную базу. Чтение - на реплику, выбранную
+    для текущего запроса через use_replica, иначе тоже в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+
+def check_replicas():
+    """
+    Отметки pin() хранятся в кэше API: если он живёт в памяти процесса,
+    следующий запрос пользователя может попасть в другой процесс и
+    прочитать с реплики ещё не видные там изменения.
+    """
+    if settings.DATABASE_REPLICAS and not is_shared():
+        raise ImproperlyConfigured(
+            'DB_REPLICAS требует общего для всех процессов кэша API: '
+            'задайте API_CACHE_BACKEND (например, Memcached или Redis).'
+        )
+
+
+def get_pin_key(user):
+    return f'api:replica-pin:{user.pk}'
+
+
+def pin(user):
+    """
+    После записи пользователь DB_REPLICA_LAG секунд читает из основной
+    базы и видит свои изменения, даже если реплики отстают.
+    """
+    if user.is_authenticated and settings.DATABASE_REPLICAS:
+        get_cache().set(get_pin_key(user), True, settings.DB_REPLICA_LAG)
+
+
+def is_pinned(user):
+    return user.is_authenticated and bool(get_cache().get(get_pin_key(user)))
+
+
+def use_replica(user):
+    """Выбирает реплику для чтения до конца текущего запроса."""
+    if settings.DATABASE_REPLICAS and not is_pinned(user):
+        _replica.set(random.choice(settings.DATABASE_REPLICAS))
+
+
+@contextmanager
+def replica_scope():
+    """Реплика, выбранная внутри блока, после него больше не используется."""
+    token = _replica.set(None)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+def may_be_stale(changed_at):
+    """
+    Чтение с реплики могло не увидеть изменение, сделанное в момент
+    changed_at (Unix-время в секундах): реплика ещё не догнала базу.
+    """
+    return (
+        _replica.get() is not None
+        and time.time() - changed_at < settings.DB_REPLICA_LAG
+    )
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            settings.ASYNC_DB_THREADS, thread_name_prefix='db'
+        )
+    return _executor
+
+
+def run_with_connections(func, *args, **kwargs):
+    """
+    Вызов func в потоке пула. Соединения потока обслуживаются так же,
+    как между запросами: устаревшие закрываются до и после вызова.
+    """
+    close_old_connections()
+    check_connections(sender=None)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_in_pool(func, *args, **kwargs):
+    """
+    Выполняет синхронную func с доступом к базе в ограниченном пуле
+    потоков (ASYNC_DB_THREADS) с копией текущего контекста. Пока func
+    работает, цикл событий обслуживает другие соединения.
+    """
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        get_executor(),
+        partial(context.run, run_with_connections, func, *args, **kwargs)
+    )
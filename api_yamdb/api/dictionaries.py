@@ -0,0 +1,185 @@
+"""
+Категории и жанры в памяти процесса. Таблицы маленькие и меняются редко,
+а нужны при выводе каждого произведения, в фильтрах и при проверке
+слагов. Словарь перечитывается целиком, когда меняется его версия
+в таблице DictionaryVersion (её сдвигают сигналы при записи, поэтому
+изменение в одном процессе видят и остальные) или когда снимку больше
+DICTIONARY_SNAPSHOT_TTL секунд - на случай записи в обход сигналов.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import router, transaction
+
+from reviews.models import Category, DictionaryVersion, Genre
+from .cache import CATEGORIES, GENRES
+
+
+def get_versions(resources):
+    """Версии справочников одним запросом к основной базе."""
+    versions = DictionaryVersion.objects.using(
+        router.db_for_write(DictionaryVersion)
+    )
+    found = dict(
+        versions.filter(resource__in=resources).values_list(
+            'resource', 'version'
+        )
+    )
+    missing = set(resources) - found.keys()
+    if missing:
+        versions.bulk_create(
+            [DictionaryVersion(resource=resource, version=time.time_ns())
+             for resource in missing],
+            ignore_conflicts=True
+        )
+        found.update(
+            versions.filter(resource__in=missing).values_list(
+                'resource', 'version'
+            )
+        )
+    return found
+
+
+def invalidate(*resources):
+    versions = DictionaryVersion.objects.using(
+        router.db_for_write(DictionaryVersion)
+    )
+    for resource in resources:
+        versions.update_or_create(
+            resource=resource, defaults={'version': time.time_ns()}
+        )
+
+
+class Snapshot:
+    """Все объекты справочника для одной версии ресурса."""
+
+    def __init__(self, version, objects):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.by_id = {obj.pk: obj for obj in objects}
+        self.by_slug = {obj.slug: obj for obj in objects}
+        # Порядок Meta.ordering модели.
+        self.positions = {obj.pk: pos for pos, obj in enumerate(objects)}
+        self.representations = {}
+
+
+class Dictionary:
+
+    def __init__(self, model, resource):
+        self.model = model
+        self.resource = resource
+        self.snapshot = None
+        # Поток изменил таблицу в ещё не зафиксированной транзакции.
+        self.local = threading.local()
+
+    def __deepcopy__(self, memo):
+        # DRF копирует аргументы полей сериализатора для каждого экземпляра.
+        return self
+
+    def changed(self):
+        """
+        Вызывается при записи в таблицу справочника. Версия сдвигается
+        в той же транзакции, что и запись.
+        """
+        self.local.dirty = True
+        invalidate(self.resource)
+
+    def get_snapshot(self, context=None):
+        """
+        Актуальный снимок. С context (контекстом сериализатора или
+        запросом DRF) версии всех справочников читаются одним запросом
+        на весь запрос: фильтры, поля и сериализаторы видят одни снимки.
+        """
+        if context is None:
+            return self.load_snapshot(get_versions([self.resource]))
+        request = context.get('request') if isinstance(
+            context, dict
+        ) else context
+        scope = context if request is None else request.__dict__.setdefault(
+            'dictionaries', {}
+        )
+        snapshots = scope.setdefault('snapshots', {})
+        if self.resource not in snapshots:
+            if 'versions' not in scope:
+                scope['versions'] = get_versions(RESOURCES)
+            snapshots[self.resource] = self.load_snapshot(scope['versions'])
+        return snapshots[self.resource]
+
+    def load_snapshot(self, versions):
+        database = router.db_for_write(self.model)
+        # Незафиксированные изменения видны только этому потоку и могут
+        # быть отменены: такой снимок не сохраняется.
+        dirty = getattr(self.local, 'dirty', False)
+        if dirty and not transaction.get_connection(database).in_atomic_block:
+            dirty = self.local.dirty = False
+        version = versions[self.resource]
+        snapshot = self.snapshot
+        if (not dirty and snapshot is not None
+                and snapshot.version == version
+                and time.monotonic() - snapshot.loaded_at
+                < settings.DICTIONARY_SNAPSHOT_TTL):
+            return snapshot
+        # Читается основная база: реплика могла ещё не получить изменение,
+        # из-за которого сменилась версия.
+        snapshot = Snapshot(
+            version, list(self.model.objects.using(database))
+        )
+        if not dirty:
+            self.snapshot = snapshot
+        return snapshot
+
+    def get_by_slug(self, slug, context=None):
+        return self.get_many_by_slug([slug], context).get(slug)
+
+    def get_many_by_slug(self, slugs, context=None):
+        """
+        Объекты по слагам; слагов нет в словаре - значит, объект создан
+        в текущей незафиксированной транзакции или не существует, такие
+        ищутся в базе одним запросом.
+        """
+        by_slug = self.get_snapshot(context).by_slug
+        found = {slug: by_slug[slug] for slug in slugs if slug in by_slug}
+        missing = set(slugs) - found.keys()
+        if missing:
+            found.update(
+                (obj.slug, obj)
+                for obj in self.model.objects.filter(slug__in=missing)
+            )
+        return found
+
+    def get_by_id(self, pk, context=None):
+        obj = self.get_snapshot(context).by_id.get(pk)
+        if obj is None:
+            obj = self.model.objects.filter(pk=pk).first()
+        return obj
+
+    def represent(self, pks, serializer_class, context=None):
+        """
+        Данные serializer_class для объектов pks в порядке справочника.
+        Сериализуется каждый объект один раз на версию.
+        """
+        snapshot = self.get_snapshot(context)
+        pks = sorted(
+            pks, key=lambda pk: snapshot.positions.get(pk, len(pks))
+        )
+        data = []
+        for pk in pks:
+            if pk not in snapshot.by_id:
+                obj = self.model.objects.filter(pk=pk).first()
+                if obj is not None:
+                    data.append(dict(serializer_class(obj).data))
+                continue
+            key = serializer_class, pk
+            if key not in snapshot.representations:
+                snapshot.representations[key] = dict(
+                    serializer_class(snapshot.by_id[pk]).data
+                )
+            data.append(dict(snapshot.representations[key]))
+        return data
+
+
+categories = Dictionary(Category, CATEGORIES)
+genres = Dictionary(Genre, GENRES)
+DICTIONARIES = {Category: categories, Genre: genres}
+RESOURCES = [dictionary.resource for dictionary in DICTIONARIES.values()]
@@ -0,0 +1,84 @@
+from django.utils.encoding import smart_str
+from rest_framework import relations
+
+
+class ManySlugRelatedField(relations.ManyRelatedField):
+    """
+    Список слагов: все объекты ищутся одним запросом IN,
+    все неизвестные слаги перечисляются в одной ошибке.
+    """
+    default_error_messages = {
+        'does_not_exist': 'Объекты с {slug_name}={values} не существуют.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        relation = self.child_relation
+        if relation.preloaded is None:
+            relation.preload(data)
+        missing = [
+            slug for slug in data
+            if isinstance(slug, str) and slug not in relation.preloaded
+        ]
+        if missing:
+            self.fail(
+                'does_not_exist',
+                slug_name=relation.slug_field, values=', '.join(missing)
+            )
+        return [relation.to_internal_value(item) for item in data]
+
+
+class SlugRelatedField(relations.SlugRelatedField):
+    """
+    SlugRelatedField, который может заранее загрузить объекты для всех
+    слагов одним запросом: после preload() значения ищутся в словаре,
+    а не отдельным SELECT на каждый слаг. С dictionary (справочник из
+    api.dictionaries) объекты берутся из памяти процесса. С many=True
+    создаёт ManySlugRelatedField.
+    """
+
+    def __init__(self, slug_field=None, dictionary=None, **kwargs):
+        super().__init__(slug_field=slug_field, **kwargs)
+        self.dictionary = dictionary
+        self.preloaded = None
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in relations.MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManySlugRelatedField(**list_kwargs)
+
+    def preload(self, slugs):
+        slugs = {slug for slug in slugs if isinstance(slug, str)}
+        if self.dictionary is not None:
+            self.preloaded = self.dictionary.get_many_by_slug(
+                slugs, self.context
+            )
+            return
+        self.preloaded = {
+            smart_str(getattr(obj, self.slug_field)): obj
+            for obj in self.get_queryset().filter(
+                **{f'{self.slug_field}__in': slugs}
+            )
+        }
+
+    def to_internal_value(self, data):
+        if self.preloaded is None and self.dictionary is None:
+            return super().to_internal_value(data)
+        if not isinstance(data, str):
+            self.fail('invalid')
+        preloaded = self.preloaded
+        if preloaded is None:
+            preloaded = self.dictionary.get_many_by_slug(
+                [data], self.context
+            )
+        if data not in preloaded:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field, value=data
+            )
+        return preloaded[data]
@@ -1,16 +1,47 @@
 import django_filters as filters
+from django.db.models import Case, When
+from rest_framework.filters import BaseFilterBackend
 
 from reviews.models import Title
+from reviews.search import search_titles
+from .dictionaries import categories, genres
 
 
 class TitleFilter(filters.FilterSet):
     category = filters.CharFilter(
-        field_name='category__slug'
+        field_name='category', method='filter_by_slug'
     )
     genre = filters.CharFilter(
-        field_name='genre__slug'
+        field_name='genre', method='filter_by_slug'
     )
 
     class Meta:
         model = Title
         fields = ('category', 'genre', 'name', 'year')
+
+    def filter_by_slug(self, queryset, name, value):
+        """Слаг переводится в id по справочнику, без JOIN с его таблицей."""
+        dictionary = categories if name == 'category' else genres
+        obj = dictionary.get_by_slug(value, self.request)
+        if obj is None:
+            return queryset.none()
+        return queryset.filter(**{name: obj.pk})
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """
+    Полнотекстовый поиск ?search=... по названию, описанию и отзывам;
+    результаты упорядочены по релевантности.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        ranked_ids = search_titles(query)
+        if not ranked_ids:
+            return queryset.none()
+        return queryset.filter(id__in=ranked_ids).order_by(Case(
+            *[When(id=pk, then=pos) for pos, pk in enumerate(ranked_ids)]
+        ))
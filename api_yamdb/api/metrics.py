@@ -0,0 +1,256 @@
+"""
+Метрики в текстовом формате Prometheus: число и длительность запросов
+по маршрутам, коды ответов, SQL-запросы, эффективность кэша ответов,
+ограничение частоты запросов и размер таблиц отзывов и комментариев.
+На горячем пути каждый поток пишет в свой словарь без блокировок,
+при чтении словари складываются.
+"""
+import asyncio
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from reviews.models import Comment, Review
+from . import db, throttling
+from .cache import get_cache, get_stats
+
+# Границы корзин гистограммы длительности запросов, секунды.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+TABLE_MODELS = {'reviews': Review, 'comments': Comment}
+TABLE_ROWS_KEY = 'metrics:table-rows'
+CACHE_EVENTS = {
+    'hits': 'Попадания в кэш ответов API.',
+    'misses': 'Промахи кэша ответов API.',
+    'invalidations': 'Сбросы версий ресурсов кэша ответов API.',
+}
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class ThreadCounters:
+    """
+    Счётчики по потокам: поток увеличивает только свой Counter, поэтому
+    запись обходится без блокировок. Счётчики завершившихся потоков
+    при чтении переносятся в общий.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.shards = []
+        self.retired = Counter()
+
+    def shard(self):
+        shard = getattr(self.local, 'shard', None)
+        if shard is None:
+            shard = self.local.shard = Counter()
+            with self.lock:
+                self.shards.append((threading.current_thread(), shard))
+        return shard
+
+    def collect(self):
+        with self.lock:
+            total = Counter(self.retired)
+            alive = []
+            for thread, shard in self.shards:
+                # dict.copy не отдаёт управление другим потокам.
+                values = dict.copy(shard)
+                total.update(values)
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    self.retired.update(values)
+            self.shards = alive
+        return total
+
+
+counters = ThreadCounters()
+
+
+def get_route(request):
+    match = request.resolver_match
+    return match.view_name if match else 'unresolved'
+
+
+def record(route, method, status, duration, queries):
+    shard = counters.shard()
+    shard['requests', route, method, status] += 1
+    shard['duration_sum', route, method] += duration
+    shard['duration_count', route, method] += 1
+    for index, bound in enumerate(BUCKETS):
+        if duration <= bound:
+            shard['duration_bucket', route, method, index] += 1
+            break
+    shard['queries', route, method] += queries
+
+
+class QueryCounter:
+
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Так Django распознаёт асинхронный промежуточный слой.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with db.execute_wrapper(counter):
+            response = self.get_response(request)
+        self.record(request, response, started, counter)
+        return response
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with db.execute_wrapper(counter):
+            response = await self.get_response(request)
+        self.record(request, response, started, counter)
+        return response
+
+    @staticmethod
+    def record(request, response, started, counter):
+        record(
+            get_route(request), request.method, response.status_code,
+            time.perf_counter() - started, counter.queries
+        )
+
+
+def format_labels(**labels):
+    return '{' + ','.join(
+        f'{name}="{value}"' for name, value in labels.items()
+    ) + '}'
+
+
+def format_metric(name, kind, help_text, samples):
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+    lines.extend(
+        f'{name}{suffix}{format_labels(**labels)} {value}'
+        for suffix, labels, value in samples
+    )
+    return lines
+
+
+def render_requests(values):
+    requests = []
+    durations = []
+    queries = []
+    for key, value in sorted(values.items(), key=str):
+        if key[0] == 'requests':
+            _, route, method, status = key
+            requests.append(
+                ('', dict(route=route, method=method, status=status), value)
+            )
+        elif key[0] == 'duration_count':
+            _, route, method = key
+            cumulative = 0
+            for index, bound in enumerate(BUCKETS):
+                cumulative += values['duration_bucket', route, method, index]
+                durations.append((
+                    '_bucket', dict(route=route, method=method, le=bound),
+                    cumulative
+                ))
+            labels = dict(route=route, method=method)
+            durations.extend([
+                ('_bucket', dict(labels, le='+Inf'), value),
+                ('_sum', labels, round(
+                    values['duration_sum', route, method], 6
+                )),
+                ('_count', labels, value),
+            ])
+            queries.append(('', labels, values['queries', route, method]))
+    return [
+        *format_metric(
+            'yamdb_http_requests_total', 'counter',
+            'Обработанные HTTP-запросы.', requests
+        ),
+        *format_metric(
+            'yamdb_http_request_duration_seconds', 'histogram',
+            'Длительность обработки HTTP-запросов.', durations
+        ),
+        *format_metric(
+            'yamdb_db_queries_total', 'counter',
+            'SQL-запросы, выполненные при обработке HTTP-запросов.', queries
+        ),
+    ]
+
+
+def render_cache():
+    stats = get_stats()
+    lines = []
+    for event, help_text in CACHE_EVENTS.items():
+        lines.extend(format_metric(
+            f'yamdb_api_cache_{event}_total', 'counter', help_text,
+            [
+                ('', dict(resource=resource), resource_stats[event])
+                for resource, resource_stats in stats.items()
+            ]
+        ))
+    return lines
+
+
+def render_throttles():
+    return format_metric(
+        'yamdb_throttle_requests_total', 'counter',
+        'Запросы к регистрации и получению токена, прошедшие через '
+        'ограничение частоты.',
+        [
+            ('', dict(scope=scope, result=result), value)
+            for (scope, result), value in sorted(
+                throttling.get_stats().items()
+            )
+        ]
+    )
+
+
+def count_table_rows():
+    return {
+        table: model.objects.count()
+        for table, model in TABLE_MODELS.items()
+    }
+
+
+def render_tables():
+    # COUNT(*) обходит всю таблицу, поэтому считается не чаще раза
+    # в METRICS_TABLE_ROWS_TTL секунд, а не при каждом опросе.
+    rows = get_cache().get_or_set(
+        TABLE_ROWS_KEY, count_table_rows, settings.METRICS_TABLE_ROWS_TTL
+    )
+    return format_metric(
+        'yamdb_table_rows', 'gauge', 'Число строк в таблицах.',
+        [('', dict(table=table), count) for table, count in rows.items()]
+    )
+
+
+def render():
+    lines = [
+        *render_requests(counters.collect()),
+        *render_cache(),
+        *render_throttles(),
+        *render_tables(),
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def metrics(request):
+    token = settings.METRICS_TOKEN
+    if token and request.META.get('HTTP_AUTHORIZATION') != f'Bearer {token}':
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
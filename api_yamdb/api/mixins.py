@@ -1,4 +1,23 @@
+import math
+import time
+from http import HTTPStatus
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from rest_framework import viewsets, mixins
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from . import db
+from .cache import (
+    count, get_cache, get_etag, get_version, is_shared, make_key
+)
+from .constants import MAX_BULK_ITEMS
 
 
 class CreateListDeleteViewSet(
@@ -8,3 +27,200 @@ class CreateListDeleteViewSet(
     mixins.DestroyModelMixin
 ):
     pass
+
+
+class ReplicaReadMixin:
+    """
+    Чтение в безопасных запросах идёт на одну из DATABASE_REPLICAS,
+    запись - в основную базу. Пользователь, который недавно изменил
+    данные, DB_REPLICA_LAG секунд читает из основной базы.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with db.replica_scope():
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            db.use_replica(request.user)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (request.method not in SAFE_METHODS
+                and response.status_code < HTTPStatus.BAD_REQUEST):
+            db.pin(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    ETag и Last-Modified GET-ответов по версиям ресурсов из кэша.
+    If-None-Match и If-Modified-Since проверяются до запросов к базе
+    и сериализации: если ресурс не менялся, сразу возвращается 304.
+    Версии должны быть общими для всех процессов, поэтому при
+    CONDITIONAL_GET=auto заголовки отдаются, только если кэш API общий.
+    """
+    cache_resource = None
+
+    def get_version_resources(self):
+        return (self.cache_resource,)
+
+    @staticmethod
+    def is_conditional_get_enabled():
+        mode = settings.CONDITIONAL_GET
+        if mode == 'auto':
+            return is_shared()
+        return mode == 'on'
+
+    @staticmethod
+    def get_last_modified(changed_at):
+        """
+        Last-Modified - время изменения, округлённое вверх до секунды.
+        Пока эта секунда не прошла, заголовок не отдаётся: изменение
+        в ту же секунду не сдвинуло бы его и дало бы ложный 304.
+        """
+        last_modified = math.ceil(changed_at)
+        return last_modified if last_modified <= time.time() else None
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        if not self.is_conditional_get_enabled():
+            return handler(request, *args, **kwargs)
+        etag, changed_at = get_etag(
+            request, *self.get_version_resources()
+        )
+        last_modified = self.get_last_modified(changed_at)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            # Ответ реплики, отстающей от последнего изменения, не должен
+            # закрепиться у клиента под новым ETag.
+            if db.may_be_stale(changed_at):
+                return response
+        if response.status_code in (HTTPStatus.OK, HTTPStatus.NOT_MODIFIED):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedListMixin:
+    """
+    Кэширует сериализованные данные GET-ответов списка.
+    Ключ строится по адресу запроса и версии ресурса cache_resource,
+    которая сбрасывается при изменении связанных моделей.
+    """
+    cache_resource = None
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        key = make_key(request, self.cache_resource)
+        data = cache.get(key)
+        if data is not None:
+            count('hits', self.cache_resource)
+            return Response(data)
+        count('misses', self.cache_resource)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == HTTPStatus.OK and not db.may_be_stale(
+            get_version(self.cache_resource) / 10 ** 9
+        ):
+            cache.set(key, response.data)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ValuesListMixin:
+    """
+    GET-ответы списка строит values_serializer_class
+    (serializers.ValuesSerializer) из строк values() отфильтрованного
+    запроса; детальные ответы и запись - serializer_class.
+    """
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+        serializer = self.values_serializer_class(
+            context=self.get_serializer_context()
+        )
+        queryset = serializer.get_values(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_representation(page)
+            )
+        return Response(serializer.to_representation(queryset))
+
+
+class BulkWriteMixin:
+    """
+    POST и PATCH списком объектов на <ресурс>/bulk/: все объекты
+    проверяются и записываются в одной транзакции через список
+    сериализаторов (Meta.list_serializer_class = BulkListSerializer).
+    В PATCH каждый объект определяется полем lookup_field.
+    """
+
+    def get_bulk_lookup(self):
+        return 'id' if self.lookup_field == 'pk' else self.lookup_field
+
+    def get_bulk_instances(self, data):
+        lookup = self.get_bulk_lookup()
+        values = [item.get(lookup) for item in data]
+        found = self.get_queryset().in_bulk(
+            [value for value in values if isinstance(value, (int, str))],
+            field_name=self.lookup_field
+        )
+        errors = [
+            {lookup: ['Объект не найден.']}
+            if not isinstance(value, (int, str)) or value not in found
+            else {}
+            for value in values
+        ]
+        if any(errors):
+            raise ValidationError(errors)
+        return [found[value] for value in values]
+
+    @action(methods=['post', 'patch'], detail=False, url_path='bulk')
+    def bulk(self, request):
+        data = request.data
+        if (not isinstance(data, list) or not data
+                or not all(isinstance(item, dict) for item in data)):
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Ожидается непустой список объектов.'
+                ]
+            })
+        if len(data) > MAX_BULK_ITEMS:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Не больше {MAX_BULK_ITEMS} объектов за запрос.'
+                ]
+            })
+        created = request.method == 'POST'
+        instances = None if created else self.get_bulk_instances(data)
+        serializer = self.get_serializer(
+            instances, data=data, many=True, partial=not created
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            objs = serializer.save()
+        saved = self.get_queryset().in_bulk([obj.pk for obj in objs])
+        serializer = self.get_serializer(
+            [saved[obj.pk] for obj in objs], many=True
+        )
+        return Response(
+            serializer.data,
+            status=HTTPStatus.CREATED if created else HTTPStatus.OK
+        )
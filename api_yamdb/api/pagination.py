@@ -0,0 +1,128 @@
+import base64
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+PAGE = 'page'
+CURSOR = 'cursor'
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу (pub_date, id): страница выбирается условием
+    WHERE по последней записи, без COUNT и OFFSET, поэтому время ответа
+    не зависит от глубины страницы.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    ordering = ('pub_date', 'id')
+    invalid_cursor_message = 'Неверный курсор.'
+
+    @staticmethod
+    def get_value(obj, field):
+        # Страница - объекты модели или строки values().
+        return obj[field] if isinstance(obj, dict) else getattr(obj, field)
+
+    def encode_cursor(self, reverse, obj):
+        value_field, key_field = self.ordering
+        value = self.get_value(obj, value_field).isoformat()
+        raw = f'{int(reverse)}|{value}|{self.get_value(obj, key_field)}'
+        encoded = base64.urlsafe_b64encode(raw.encode()).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode()).decode()
+            reverse, value, key = raw.split('|')
+            value = parse_datetime(value)
+            if value is None or reverse not in ('0', '1'):
+                raise ValueError
+            return reverse == '1', value, int(key)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        value_field, key_field = self.ordering
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor[0])
+        if cursor:
+            _, value, key = cursor
+            lookup = 'lt' if reverse else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{value_field}__{lookup}': value})
+                | Q(**{value_field: value, f'{key_field}__{lookup}': key})
+            )
+        if reverse:
+            queryset = queryset.order_by(f'-{value_field}', f'-{key_field}')
+        else:
+            queryset = queryset.order_by(value_field, key_field)
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        self.next = self.previous = None
+        if results and has_next:
+            self.next = self.encode_cursor(False, results[-1])
+        if results and has_previous:
+            self.previous = self.encode_cursor(True, results[0])
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.next),
+            ('previous', self.previous),
+            ('results', data),
+        ]))
+
+
+class SwitchablePagination(BasePagination):
+    """
+    Постраничная пагинация по умолчанию, пагинация по ключу - для
+    представлений с pagination_mode = 'cursor' или по запросу
+    с параметром ?pagination=cursor (или уже полученным курсором).
+    """
+    mode_query_param = 'pagination'
+    page_class = PageNumberPagination
+    cursor_class = KeysetPagination
+
+    def get_mode(self, request, view):
+        if KeysetPagination.cursor_query_param in request.query_params:
+            return CURSOR
+        mode = request.query_params.get(self.mode_query_param)
+        if mode in (PAGE, CURSOR):
+            return mode
+        return getattr(view, 'pagination_mode', PAGE)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.get_mode(request, view) == CURSOR:
+            self.paginator = self.cursor_class()
+        else:
+            self.paginator = self.page_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return data['results']
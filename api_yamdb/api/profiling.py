@@ -0,0 +1,257 @@
+"""
+Профилирование запросов: число и время SQL-запросов, время проверки
+разрешений, сериализации, обработчика и рендеринга. Включается для всех
+запросов настройкой PROFILING_ENABLED или для отдельного запроса
+заголовком X-Profile: 1 от администратора (X-Profile: PROFILING_SECRET -
+от любого клиента). Методы DRF оборачиваются только после первого
+такого запроса или при PROFILING_ENABLED. Замеры возвращаются в заголовке
+Server-Timing и собираются в гистограммы по маршрутам, которые
+сохраняются в JSON-файл PROFILING_REPORT_PATH.
+"""
+import asyncio
+import atexit
+import contextvars
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework import serializers
+from django.utils.crypto import constant_time_compare
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from . import db
+
+# Границы корзин гистограмм, мс.
+BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+METRICS = ('db', 'permissions', 'serialize', 'render', 'view', 'total')
+
+_current = contextvars.ContextVar('profile', default=None)
+
+
+class Profile:
+
+    def __init__(self):
+        self.timings = Counter()
+        self.queries = 0
+        self.active = set()
+
+    @contextmanager
+    def measure(self, name):
+        # Вложенные сериализаторы не учитываются повторно.
+        if name in self.active:
+            yield
+            return
+        self.active.add(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - started
+            self.active.discard(name)
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        self.queries += 1
+        with self.measure('db'):
+            return execute(sql, params, many, context)
+
+    def server_timing(self):
+        descriptions = {'db': f'{self.queries} queries'}
+        return ', '.join(
+            f'{name};dur={self.timings[name] * 1000:.2f}'
+            + (f';desc="{descriptions[name]}"' if name in descriptions
+               else '')
+            for name in METRICS if name in self.timings
+        )
+
+
+def timed(name, function):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return function(*args, **kwargs)
+        with profile.measure(name):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def install():
+    """Оборачивает методы DRF, время которых попадает в замеры."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        _installed = True
+    from .serializers import ValuesSerializer
+
+    for cls in (serializers.Serializer, serializers.ListSerializer,
+                ValuesSerializer):
+        cls.to_representation = timed('serialize', cls.to_representation)
+    for name in ('check_permissions', 'check_object_permissions'):
+        setattr(APIView, name, timed('permissions', getattr(APIView, name)))
+    APIView.dispatch = timed('view', APIView.dispatch)
+    Response.rendered_content = property(
+        timed('render', Response.rendered_content.fget)
+    )
+    atexit.register(dump_report)
+
+
+class RouteHistograms:
+    """Гистограммы замеров по маршрутам, общие для процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.routes = defaultdict(
+            lambda: defaultdict(lambda: [0] * (len(BUCKETS) + 1))
+        )
+        self.totals = defaultdict(Counter)
+
+    def add(self, route, profile):
+        values = dict(profile.timings, queries=profile.queries)
+        with self.lock:
+            self.requests += 1
+            self.totals[route]['count'] += 1
+            for name, value in values.items():
+                self.totals[route][name] += value
+                if name == 'queries':
+                    continue
+                milliseconds = value * 1000
+                index = next(
+                    (idx for idx, bound in enumerate(BUCKETS)
+                     if milliseconds <= bound),
+                    len(BUCKETS)
+                )
+                self.routes[route][name][index] += 1
+            return self.requests
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'buckets_ms': list(BUCKETS) + ['+Inf'],
+                'routes': {
+                    route: {
+                        'count': self.totals[route]['count'],
+                        'queries': self.totals[route]['queries'],
+                        'seconds': {
+                            name: round(self.totals[route][name], 6)
+                            for name in METRICS if name in metrics
+                        },
+                        'histograms': dict(metrics),
+                    }
+                    for route, metrics in self.routes.items()
+                },
+            }
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as report:
+            json.dump(self.snapshot(), report, ensure_ascii=False, indent=2)
+
+
+histograms = RouteHistograms()
+
+
+def dump_report():
+    if settings.PROFILING_REPORT_PATH and histograms.requests:
+        histograms.dump(settings.PROFILING_REPORT_PATH)
+
+
+def get_route(request):
+    match = request.resolver_match
+    view_name = match.view_name if match else 'unresolved'
+    return f'{request.method} {view_name}'
+
+
+class ProfilingMiddleware:
+    """Должен стоять первым в MIDDLEWARE, чтобы total включал всё."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Так Django распознаёт асинхронный промежуточный слой.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        if settings.PROFILING_ENABLED:
+            install()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.is_requested(request):
+            return self.get_response(request)
+        profile = Profile()
+        with self.profiling(profile):
+            response = self.get_response(request)
+        return self.report(request, response, profile)
+
+    async def __acall__(self, request):
+        # Проверка администратора загружает пользователя из базы.
+        if not await sync_to_async(self.is_requested)(request):
+            return await self.get_response(request)
+        profile = Profile()
+        with self.profiling(profile):
+            response = await self.get_response(request)
+        return self.report(request, response, profile)
+
+    @classmethod
+    def is_requested(cls, request):
+        if settings.PROFILING_ENABLED:
+            return True
+        header = request.META.get('HTTP_X_PROFILE')
+        if not header:
+            return False
+        return (
+            settings.PROFILING_SECRET
+            and constant_time_compare(header, settings.PROFILING_SECRET)
+        ) or (header == '1' and cls.is_admin(request))
+
+    @staticmethod
+    @contextmanager
+    def profiling(profile):
+        install()
+        token = _current.set(profile)
+        try:
+            with profile.measure('total'):
+                with db.execute_wrapper(profile.execute_wrapper):
+                    yield
+        finally:
+            _current.reset(token)
+
+    @staticmethod
+    def report(request, response, profile):
+        response['Server-Timing'] = profile.server_timing()
+        count = histograms.add(get_route(request), profile)
+        if count % settings.PROFILING_REPORT_EVERY == 0:
+            dump_report()
+        return response
+
+    @staticmethod
+    def is_admin(request):
+        """Роль проверяется по базе: промежуточный слой работает до DRF."""
+        user = getattr(request, 'user', None)
+        if not (user and user.is_authenticated):
+            try:
+                user, _ = JWTAuthentication().authenticate(request) or (
+                    None, None
+                )
+            except AuthenticationFailed:
+                return False
+        return bool(
+            user and user.is_authenticated
+            and (user.is_admin or user.is_superuser)
+        )
@@ -0,0 +1,64 @@
+"""
+JSON-рендерер ответов API. Кодировщик выбирается настройкой JSON_ENCODER:
+orjson, если он установлен (auto), или json из стандартной библиотеки -
+тогда, как и с отступами (Accept: application/json; indent=4, браузерный
+API), рендерит сам JSONRenderer DRF. Результат orjson совпадает с ним:
+компактные разделители, кириллица без \\u-экранирования, U+2028 и U+2029
+экранируются.
+"""
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson else 0
+)
+# Допустимы в строках JSON, но не JavaScript.
+JS_ESCAPES = (
+    ('\u2028'.encode(), b'\\u2028'),
+    ('\u2029'.encode(), b'\\u2029'),
+)
+# Для типов, которых нет в JSON (даты, Decimal, ленивые строки).
+default = encoders.JSONEncoder().default
+
+
+def get_encoder_name():
+    name = settings.JSON_ENCODER
+    if name == 'auto':
+        return 'orjson' if orjson else 'json'
+    if name == 'orjson' and orjson is None:
+        return 'json'
+    return name
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (get_encoder_name() != 'orjson' or not self.compact
+                or self.ensure_ascii
+                or (accepted_media_type and ';' in accepted_media_type)
+                or (renderer_context and renderer_context.get('indent'))):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        try:
+            content = orjson.dumps(
+                data, default=default, option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            # Например, целые числа больше 64 бит.
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        for char, escaped in JS_ESCAPES:
+            if char in content:
+                content = content.replace(char, escaped)
+        return content
@@ -1,19 +1,27 @@
 import datetime as dt
+from collections import defaultdict
 
 from django.contrib.auth import get_user_model
-from django.db import IntegrityError
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
-from rest_framework.relations import SlugRelatedField
+from rest_framework.settings import api_settings
 from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
 
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import (
+    Category, Comment, Genre, GenreTitle, LeaderboardEntry, Review, Title
+)
+from reviews.signals import bulk_saved
 from users.validators import validate_username
 from .constants import (
     MAX_USERNAME_FIRST_NAME_LAST_NAME_LENGTH,
     MAX_EMAIL_LENGTH,
 )
+from .dictionaries import categories, genres
+from .fields import SlugRelatedField
 
 
 User = get_user_model()
@@ -30,32 +38,41 @@ class UserRegistrationSerializer(serializers.Serializer):
         required=True
     )
 
+    def get_conflicts(self, username, email):
+        """
+        Один запрос: пользователь с этой парой логина и почты или ошибки
+        для занятых логина и почты.
+        """
+        users = User.objects.filter(
+            Q(username=username) | Q(email=email)
+        )[:2]
+        errors = {}
+        for user in users:
+            if user.username == username and user.email == email:
+                return user, {}
+            if user.username == username:
+                errors['username'] = ['Этот логин уже занят']
+            if user.email == email:
+                errors['email'] = ['Этот адрес эл.почты уже занят']
+        return None, errors
+
     def create(self, validated_data):
         username = validated_data['username']
         email = validated_data['email']
-
+        user, errors = self.get_conflicts(username, email)
+        if errors:
+            raise ValidationError(errors)
+        if user is not None:
+            return user
         try:
-            user, created = User.objects.get_or_create(
-                username=username,
-                email=email
-            )
+            with transaction.atomic():
+                return User.objects.create(username=username, email=email)
         except IntegrityError:
-            existing_user = User.objects.filter(username=username).exists()
-            if existing_user:
-                raise ValidationError({'username': ['Этот логин уже занят']})
-
-            existing_email = User.objects.filter(email=email).exists()
-            if existing_email:
-                raise ValidationError(
-                    {'email': ['Этот адрес эл.почты уже занят']}
-                )
-            if existing_user and existing_email:
-                raise ValidationError({
-                    'username': ['Этот логин уже занят'],
-                    'email': ['Этот адрес эл.почты уже занят']
-                })
-
-        return user
+            # Параллельная регистрация заняла логин или почту.
+            user, errors = self.get_conflicts(username, email)
+            if errors:
+                raise ValidationError(errors)
+            return user
 
     class Meta:
         model = User
@@ -100,11 +117,221 @@ class UserUpdateSerializer(UserSerializer):
     role = serializers.CharField(read_only=True)
 
 
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Массовая запись списка объектов. Объекты по слагам загружаются одним
+    запросом на весь список, уникальность проверяется одним запросом на
+    каждое ограничение, запись - через bulk_create/bulk_update.
+    При ошибках возвращается список ошибок по позициям исходного списка.
+    """
+    unique_checks = None
+
+    def get_unique_checks(self):
+        checks = [
+            (tuple(validator.fields), validator)
+            for validator in self.child.validators
+            if isinstance(validator, UniqueTogetherValidator)
+        ]
+        checks.extend(
+            ((name,), validator)
+            for name, field in self.child.fields.items()
+            for validator in field.validators
+            if isinstance(validator, UniqueValidator)
+        )
+        return checks
+
+    def disable_unique_validators(self):
+        unique = (UniqueTogetherValidator, UniqueValidator)
+        self.child.validators = [
+            validator for validator in self.child.validators
+            if not isinstance(validator, unique)
+        ]
+        for field in self.child.fields.values():
+            field.validators = [
+                validator for validator in field.validators
+                if not isinstance(validator, unique)
+            ]
+
+    def preload_related(self, data):
+        for name, field in self.child.fields.items():
+            relation = getattr(field, 'child_relation', field)
+            if field.read_only or not isinstance(relation, SlugRelatedField):
+                continue
+            slugs = []
+            for item in data:
+                value = item.get(name) if isinstance(item, dict) else None
+                slugs.extend(value if isinstance(value, list) else [value])
+            relation.preload(slugs)
+
+    def get_instances(self, data):
+        if self.instance is None:
+            return [None] * len(data)
+        return self.instance
+
+    def check_unique(self, attrs_list, instances, errors):
+        model = self.child.Meta.model
+        excluded = [instance.pk for instance in instances if instance]
+        for fields, validator in self.unique_checks:
+            keys = {}
+            for index, attrs in enumerate(attrs_list):
+                if attrs is None:
+                    continue
+                keys[index] = tuple(
+                    attrs[field] if field in attrs
+                    else getattr(instances[index], field, None)
+                    for field in fields
+                )
+            existing = set(
+                model.objects.filter(**{
+                    f'{fields[0]}__in': {key[0] for key in keys.values()}
+                }).exclude(pk__in=excluded).values_list(*fields)
+            )
+            seen = set()
+            for index, key in keys.items():
+                if key in existing or key in seen:
+                    errors[index] = self.get_unique_error(fields, validator)
+                seen.add(key)
+
+    @staticmethod
+    def get_unique_error(fields, validator):
+        if isinstance(validator, UniqueValidator):
+            return {fields[0]: [validator.message]}
+        return {
+            api_settings.NON_FIELD_ERRORS_KEY: [
+                validator.message.format(field_names=', '.join(fields))
+            ]
+        }
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Ожидается список объектов.'
+                ]
+            })
+        if self.unique_checks is None:
+            self.unique_checks = self.get_unique_checks()
+            self.disable_unique_validators()
+        self.preload_related(data)
+        instances = self.get_instances(data)
+        attrs_list = []
+        errors = []
+        for item, instance in zip(data, instances):
+            self.child.instance = instance
+            try:
+                attrs_list.append(self.child.run_validation(item))
+                errors.append({})
+            except ValidationError as exc:
+                attrs_list.append(None)
+                errors.append(exc.detail)
+        self.child.instance = None
+        self.check_unique(attrs_list, instances, errors)
+        if any(errors):
+            raise ValidationError(errors)
+        return attrs_list
+
+    def split_many_to_many(self, validated_data):
+        names = {
+            field.name for field in self.child.Meta.model._meta.many_to_many
+        }
+        for attrs in validated_data:
+            yield attrs, {
+                name: attrs.pop(name) for name in names if name in attrs
+            }
+
+    def get_db_unique_fields(self):
+        """Первая проверка уникальности, которую гарантирует сама база."""
+        opts = self.child.Meta.model._meta
+        db_unique = {tuple(fields) for fields in opts.unique_together}
+        db_unique.update(
+            constraint.fields for constraint in opts.total_unique_constraints
+        )
+        for fields, _ in self.unique_checks:
+            if fields in db_unique or (
+                len(fields) == 1 and opts.get_field(fields[0]).unique
+            ):
+                return fields
+        raise ImproperlyConfigured(
+            f'У модели {opts.label} нет ограничения уникальности в базе '
+            'для проверок сериализатора.'
+        )
+
+    def fill_pks(self, objs):
+        """
+        bulk_create в Django 3.2 не возвращает первичные ключи на SQLite:
+        они читаются одним запросом по ограничению уникальности базы,
+        поэтому каждому ключу соответствует ровно одна строка.
+        """
+        if all(obj.pk is not None for obj in objs):
+            return
+        fields = self.get_db_unique_fields()
+        pks = {
+            tuple(row[1:]): row[0]
+            for row in self.child.Meta.model.objects.filter(**{
+                f'{fields[0]}__in': {getattr(obj, fields[0]) for obj in objs}
+            }).values_list('pk', *fields)
+        }
+        for obj in objs:
+            obj.pk = pks[tuple(getattr(obj, field) for field in fields)]
+
+    def set_many_to_many(self, objs, related_list):
+        model = self.child.Meta.model
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            changed = [
+                (obj, related[field.name])
+                for obj, related in zip(objs, related_list)
+                if field.name in related
+            ]
+            if not changed:
+                continue
+            through.objects.filter(**{
+                f'{source}__in': [obj.pk for obj, _ in changed]
+            }).delete()
+            through.objects.bulk_create([
+                through(**{source: obj, target: value})
+                for obj, values in changed for value in values
+            ])
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objs = []
+        related_list = []
+        for attrs, related in self.split_many_to_many(validated_data):
+            objs.append(model(**attrs))
+            related_list.append(related)
+        model.objects.bulk_create(objs)
+        self.fill_pks(objs)
+        self.set_many_to_many(objs, related_list)
+        bulk_saved.send(sender=model, instances=objs, created=True)
+        return objs
+
+    def update(self, instances, validated_data):
+        model = self.child.Meta.model
+        fields = set()
+        related_list = []
+        for instance, (attrs, related) in zip(
+            instances, self.split_many_to_many(validated_data)
+        ):
+            for name, value in attrs.items():
+                setattr(instance, name, value)
+            fields.update(attrs)
+            related_list.append(related)
+        if fields:
+            model.objects.bulk_update(instances, fields)
+        self.set_many_to_many(instances, related_list)
+        bulk_saved.send(sender=model, instances=instances, created=False)
+        return instances
+
+
 class CategorySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Category
         fields = ('name', 'slug')
+        list_serializer_class = BulkListSerializer
 
 
 class GenreSerializer(serializers.ModelSerializer):
@@ -112,17 +339,20 @@ class GenreSerializer(serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ('name', 'slug')
+        list_serializer_class = BulkListSerializer
 
 
 class TitleCreateSerializer(serializers.ModelSerializer):
     genre = SlugRelatedField(
         many=True,
         slug_field='slug',
-        queryset=Genre.objects.all()
+        queryset=Genre.objects.all(),
+        dictionary=genres
     )
     category = SlugRelatedField(
         slug_field='slug',
-        queryset=Category.objects.all()
+        queryset=Category.objects.all(),
+        dictionary=categories
     )
 
     class Meta:
@@ -135,7 +365,7 @@ class TitleCreateSerializer(serializers.ModelSerializer):
             'genre',
             'category'
         )
-
+        list_serializer_class = BulkListSerializer
         validators = [
             UniqueTogetherValidator(
                 queryset=Title.objects.all(),
@@ -152,15 +382,18 @@ class TitleCreateSerializer(serializers.ModelSerializer):
         return value
 
     def to_representation(self, value):
-        return TitleSerializer(value).data
+        return TitleSerializer(value, context=self.context).data
 
 
 class TitleSerializer(serializers.ModelSerializer):
-    category = CategorySerializer(read_only=True)
-    genre = GenreSerializer(read_only=True, many=True)
-    rating = serializers.IntegerField(
-        default=0, read_only=True, source='average_score'
-    )
+    """
+    Категория и жанры берутся из справочников в памяти процесса
+    (api.dictionaries); жанры произведения - из title.genretitle_set,
+    который стоит загрузить через prefetch_related.
+    """
+    category = serializers.SerializerMethodField()
+    genre = serializers.SerializerMethodField()
+    rating = serializers.IntegerField(default=0, read_only=True)
 
     class Meta:
         model = Title
@@ -174,6 +407,28 @@ class TitleSerializer(serializers.ModelSerializer):
             'category'
         )
 
+    def get_category(self, title):
+        if title.category_id is None:
+            return None
+        data = categories.represent(
+            [title.category_id], CategorySerializer, self.context
+        )
+        return data[0] if data else None
+
+    def get_genre(self, title):
+        return genres.represent(
+            [link.genre_id for link in title.genretitle_set.all()],
+            GenreSerializer, self.context
+        )
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    title = TitleSerializer(read_only=True)
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ('score', 'reviews_count', 'title')
+
 
 class ReviewSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(read_only=True,
@@ -200,3 +455,96 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ('id', 'text', 'author', 'pub_date')
+
+
+class ValuesSerializer:
+    """
+    Чтение списков без экземпляров моделей и полей ModelSerializer:
+    словари ответа строятся прямо из строк values(). Вывод совпадает
+    с обычным сериализатором того же ресурса, поля перечислены в том же
+    порядке: fields - имя в ответе и поле values().
+    """
+    fields = {}
+    datetime_fields = ()
+    datetime_field = serializers.DateTimeField()
+
+    def __init__(self, context=None):
+        self.context = {} if context is None else context
+
+    def get_values(self, queryset):
+        return queryset.prefetch_related(None).values(*self.fields.values())
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        fields = self.fields.items()
+        to_datetime = self.datetime_field.to_representation
+        data = []
+        for row in rows:
+            item = {name: row[source] for name, source in fields}
+            for name in self.datetime_fields:
+                if item[name] is not None:
+                    item[name] = to_datetime(item[name])
+            data.append(item)
+        self.add_related(data, rows)
+        return data
+
+    def add_related(self, data, rows):
+        """Дополняет data полями, которых нет в строках values()."""
+
+
+class TitleValuesSerializer(ValuesSerializer):
+    """Как TitleSerializer; жанры загружаются одним запросом на страницу."""
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'rating': 'rating',
+        'description': 'description',
+    }
+
+    def get_values(self, queryset):
+        return queryset.prefetch_related(None).values(
+            *self.fields.values(), 'category_id'
+        )
+
+    def add_related(self, data, rows):
+        title_genres = defaultdict(list)
+        if rows:
+            links = GenreTitle.objects.filter(
+                title_id__in=[row['id'] for row in rows]
+            ).values_list('title_id', 'genre_id')
+            for title_id, genre_id in links:
+                title_genres[title_id].append(genre_id)
+        for item, row in zip(data, rows):
+            if item['rating'] is not None:
+                item['rating'] = int(item['rating'])
+            item['genre'] = genres.represent(
+                title_genres[row['id']], GenreSerializer, self.context
+            )
+            category = []
+            if row['category_id'] is not None:
+                category = categories.represent(
+                    [row['category_id']], CategorySerializer, self.context
+                )
+            item['category'] = category[0] if category else None
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    fields = {
+        'id': 'id',
+        'text': 'text',
+        'author': 'author__username',
+        'score': 'score',
+        'pub_date': 'pub_date',
+    }
+    datetime_fields = ('pub_date',)
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    fields = {
+        'id': 'id',
+        'text': 'text',
+        'author': 'author__username',
+        'pub_date': 'pub_date',
+    }
+    datetime_fields = ('pub_date',)
@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import bulk_saved
+from . import dictionaries
+from .cache import (
+    CATEGORIES, COMMENTS, GENRES, REVIEWS, TITLES, invalidate, scoped
+)
+
+User = get_user_model()
+
+# Какие закэшированные ресурсы устаревают при изменении модели:
+# произведения содержат категорию, жанры и рейтинг по отзывам. Связи
+# с жанрами (GenreTitle) отслеживает invalidate_title_genres.
+# Получатели подключаются только к этим моделям: любой получатель
+# post_delete без sender отключает быстрое удаление (одним DELETE)
+# для всех моделей.
+INVALIDATED_RESOURCES = {
+    Category: (CATEGORIES, TITLES),
+    Genre: (GENRES, TITLES),
+    Title: (TITLES,),
+    Review: (TITLES,),
+}
+
+
+def invalidate_api_cache(sender, **kwargs):
+    resources = INVALIDATED_RESOURCES[sender]
+    transaction.on_commit(lambda: invalidate(*resources))
+
+
+for model in INVALIDATED_RESOURCES:
+    for signal in (post_save, post_delete, bulk_saved):
+        signal.connect(invalidate_api_cache, sender=model)
+
+
+def invalidate_dictionaries(sender, **kwargs):
+    dictionaries.DICTIONARIES[sender].changed()
+
+
+for model in dictionaries.DICTIONARIES:
+    for signal in (post_save, post_delete, bulk_saved):
+        signal.connect(invalidate_dictionaries, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        transaction.on_commit(lambda: invalidate(TITLES))
+
+
+def invalidate_on_commit(*resources):
+    transaction.on_commit(lambda: invalidate(*resources))
+
+
+# Списки отзывов и комментариев версионируются по родительскому объекту.
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_title_reviews(sender, instance, **kwargs):
+    invalidate_on_commit(scoped(REVIEWS, instance.title_id))
+
+
+@receiver(post_delete, sender=Review)
+def invalidate_deleted_review_comments(sender, instance, **kwargs):
+    invalidate_on_commit(scoped(COMMENTS, instance.pk))
+
+
+@receiver(post_delete, sender=Title)
+def invalidate_deleted_title_reviews(sender, instance, **kwargs):
+    invalidate_on_commit(scoped(REVIEWS, instance.pk))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_review_comments_list(sender, instance, **kwargs):
+    invalidate_on_commit(scoped(COMMENTS, instance.review_id))
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_names(sender, created, **kwargs):
+    # Отзывы и комментарии показывают имя автора.
+    if not created:
+        invalidate_on_commit(REVIEWS, COMMENTS)
@@ -0,0 +1,230 @@
+"""
+Ограничение частоты запросов к регистрации и получению токена:
+корзина токенов (token bucket) на IP-адрес, имя пользователя и почту.
+Частоты задаются в REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] в формате
+DRF ('5/hour'): корзина вмещает 5 запросов и пополняется равномерно за
+час. Корзины хранятся в памяти процесса (THROTTLE_STORE=memory) или
+в файле SQLite, общем для всех процессов (THROTTLE_STORE=sqlite).
+"""
+import random
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+# Доля запросов, после которых из SQLite удаляются старые корзины.
+SQLITE_PRUNE_PROBABILITY = 0.001
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def count(scope, result):
+    with _stats_lock:
+        _stats[scope, result] += 1
+
+
+def get_stats():
+    """Разрешённые и отклонённые запросы по областям в текущем процессе."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def refill(tokens, updated, now, capacity, rate):
+    """
+    Забирает токен из корзины. Возвращает новое число токенов и время
+    ожидания: 0, если токен был, иначе секунды до появления токена.
+    """
+    tokens = min(capacity, tokens + max(now - updated, 0) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / rate
+
+
+class MemoryBucketStore:
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+        self.buckets = {}
+
+    def consume(self, key, capacity, rate):
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated = self.buckets.get(key, (capacity, now))
+            tokens, wait = refill(tokens, updated, now, capacity, rate)
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.max_keys:
+                self.prune()
+        return wait
+
+    def prune(self):
+        # Сначала старые корзины: они, скорее всего, уже полные.
+        by_age = sorted(self.buckets, key=lambda key: self.buckets[key][1])
+        for key in by_age[:len(by_age) - self.max_keys // 2]:
+            del self.buckets[key]
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class SQLiteBucketStore:
+    """Корзины в файле SQLite: одно соединение на поток."""
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self.local = threading.local()
+
+    def get_connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode = wal')
+            connection.execute('PRAGMA synchronous = normal')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS throttle_bucket ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, '
+                'updated REAL NOT NULL) WITHOUT ROWID'
+            )
+            self.local.connection = connection
+        return connection
+
+    def consume(self, key, capacity, rate):
+        connection = self.get_connection()
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT tokens, updated FROM throttle_bucket WHERE key = ?',
+                (key,)
+            ).fetchone()
+            tokens, updated = row or (capacity, now)
+            tokens, wait = refill(tokens, updated, now, capacity, rate)
+            connection.execute(
+                'INSERT OR REPLACE INTO throttle_bucket '
+                '(key, tokens, updated) VALUES (?, ?, ?)',
+                (key, tokens, now)
+            )
+            if random.random() < SQLITE_PRUNE_PROBABILITY:
+                connection.execute(
+                    'DELETE FROM throttle_bucket WHERE updated < ?',
+                    (now - self.ttl,)
+                )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return wait
+
+    def clear(self):
+        self.get_connection().execute('DELETE FROM throttle_bucket')
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store():
+    backend = settings.THROTTLE_STORE
+    options = (
+        (settings.THROTTLE_SQLITE_PATH, settings.THROTTLE_SQLITE_TTL)
+        if backend == 'sqlite' else (settings.THROTTLE_MAX_KEYS,)
+    )
+    with _stores_lock:
+        if (backend, options) not in _stores:
+            store_class = (
+                SQLiteBucketStore if backend == 'sqlite'
+                else MemoryBucketStore
+            )
+            _stores[backend, options] = store_class(*options)
+        return _stores[backend, options]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Корзина токенов области scope для ключа get_key(). Если ключа нет
+    (например, в запросе нет поля), запрос не ограничивается.
+    """
+    scope = None
+
+    def get_key(self, request):
+        raise NotImplementedError
+
+    def parse_rate(self):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if rate is None:
+            return None
+        num, period = rate.split('/')
+        seconds = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+        return int(num), int(num) / seconds
+
+    def allow_request(self, request, view):
+        rate = self.parse_rate()
+        key = self.get_key(request)
+        if rate is None or key is None:
+            return True
+        capacity, refill_rate = rate
+        self.wait_seconds = get_store().consume(
+            f'{self.scope}:{key}', capacity, refill_rate
+        )
+        allowed = self.wait_seconds == 0
+        count(self.scope, 'allowed' if allowed else 'throttled')
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(TokenBucketThrottle):
+
+    def get_key(self, request):
+        return self.get_ident(request)
+
+
+class FieldThrottle(TokenBucketThrottle):
+    """Ключ - значение поля field из тела запроса без учёта регистра."""
+    field = None
+
+    def get_key(self, request):
+        if not hasattr(request.data, 'get'):
+            return None
+        value = request.data.get(self.field)
+        if not isinstance(value, str) or not value.strip():
+            return None
+        return value.strip().lower()
+
+
+class SignupIPThrottle(IPThrottle):
+    scope = 'signup_ip'
+
+
+class SignupUsernameThrottle(FieldThrottle):
+    scope = 'signup_username'
+    field = 'username'
+
+
+class SignupEmailThrottle(FieldThrottle):
+    scope = 'signup_email'
+    field = 'email'
+
+
+class TokenIPThrottle(IPThrottle):
+    scope = 'token_ip'
+
+
+class TokenUsernameThrottle(FieldThrottle):
+    scope = 'token_username'
+    field = 'username'
@@ -1,10 +1,11 @@
-from django.urls import include, path
+from django.urls import path, re_path
 from rest_framework import routers
 
 from .views import (
     CategoryViewSet, CommentViewSet, GenreViewSet,
     ReviewViewSet, TitleViewSet, UserViewSet,
-    get_token, user_registration
+    cache_stats, export_data, get_token, leaderboard,
+    user_registration
 )
 
 app_name = 'api'
@@ -25,7 +26,19 @@ router_v1.register(
 )
 
 urlpatterns = [
-    path('', include(router_v1.urls)),
-    path('v1/auth/signup/', user_registration),
-    path('v1/auth/token/', get_token),
+    *router_v1.urls,
+    path('v1/auth/signup/', user_registration, name='signup'),
+    path('v1/auth/token/', get_token, name='token'),
+    path('v1/cache/stats/', cache_stats, name='cache-stats'),
+    re_path(
+        r'^v1/export/(?P<name>\w+)\.(?P<file_format>csv|jsonl)$',
+        export_data,
+        name='export'
+    ),
+    re_path(
+        r'^v1/leaderboards/(?P<kind>rated|trending)/'
+        r'(?:(?P<scope>category|genre|year)/(?P<value>[-\w]+)/)?$',
+        leaderboard,
+        name='leaderboard'
+    ),
 ]
@@ -1,34 +1,56 @@
+from functools import partial
 from http import HTTPStatus
 
-from django.db.models import Avg
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
+from django.db import transaction
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (
+    action, api_view, permission_classes, throttle_classes
+)
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import (
     IsAuthenticated,
     IsAuthenticatedOrReadOnly,
     AllowAny
 )
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 from django_filters.rest_framework import DjangoFilterBackend
 
+from reviews import leaderboards
+from reviews.data_files import DATA_FILES_BY_NAME, iter_export
 from reviews.models import Category, Genre, Review, Title
-from .filters import TitleFilter
-from .mixins import CreateListDeleteViewSet
+from users.outbox import enqueue_email
+from . import dictionaries
+from .authentication import RoleAccessToken, requires_db_user
+from .cache import (
+    CATEGORIES, COMMENTS, GENRES, REVIEWS, TITLES, get_stats, scoped
+)
+from .filters import TitleFilter, TitleSearchFilter
+from .mixins import (
+    BulkWriteMixin, CachedListMixin, ConditionalGetMixin,
+    CreateListDeleteViewSet, ReplicaReadMixin, ValuesListMixin
+)
+from .pagination import PAGE, SwitchablePagination
 from .permissions import (
     IsAdminOrReadOnly,
     IsAuthorAndStaffOrReadOnly,
     IsAuthorOrAdmin
 )
 from .serializers import (
-    CategorySerializer, CommentSerializer, GenreSerializer,
-    ReviewSerializer, TitleCreateSerializer, GetTokenSerializer,
+    CategorySerializer, CommentSerializer, CommentValuesSerializer,
+    GenreSerializer, LeaderboardEntrySerializer, ReviewSerializer,
+    ReviewValuesSerializer, TitleCreateSerializer, TitleValuesSerializer,
+    GetTokenSerializer,
     UserRegistrationSerializer, UserSerializer, UserUpdateSerializer
 )
+from .throttling import (
+    SignupEmailThrottle, SignupIPThrottle, SignupUsernameThrottle,
+    TokenIPThrottle, TokenUsernameThrottle
+)
 from api_yamdb.settings import DEFAULT_FROM_EMAIL
 
 User = get_user_model()
@@ -36,22 +58,27 @@ User = get_user_model()
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([
+    SignupIPThrottle, SignupUsernameThrottle, SignupEmailThrottle
+])
 def user_registration(request):
     serializer = UserRegistrationSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    user = serializer.save()
-    confirmation_code = default_token_generator.make_token(user)
-    send_mail(
-        subject='Подтверждение регистрации на YaMDb',
-        message=f'Ваш код подтверждения: {confirmation_code}',
-        from_email=DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email],
-    )
+    with transaction.atomic():
+        user = serializer.save()
+        confirmation_code = default_token_generator.make_token(user)
+        enqueue_email(
+            subject='Подтверждение регистрации на YaMDb',
+            message=f'Ваш код подтверждения: {confirmation_code}',
+            recipient=user.email,
+            from_email=DEFAULT_FROM_EMAIL,
+        )
     return Response(serializer.data, status=HTTPStatus.OK)
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([TokenIPThrottle, TokenUsernameThrottle])
 def get_token(request):
     serializer = GetTokenSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -59,7 +86,7 @@ def get_token(request):
     confirmation_code = serializer.data.get('confirmation_code')
     user = get_object_or_404(User, username=username)
     if default_token_generator.check_token(user, confirmation_code):
-        token = str(AccessToken.for_user(user))
+        token = str(RoleAccessToken.for_user(user))
         return Response(
             {'token': token},
             status=HTTPStatus.OK
@@ -69,7 +96,84 @@ def get_token(request):
         status=HTTPStatus.BAD_REQUEST)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+@requires_db_user
+@api_view(['GET'])
+@permission_classes([IsAuthorOrAdmin])
+def export_data(request, name, file_format):
+    if name not in DATA_FILES_BY_NAME:
+        raise Http404
+    response = StreamingHttpResponse(
+        iter_export(DATA_FILES_BY_NAME[name], file_format),
+        content_type=EXPORT_CONTENT_TYPES[file_format]
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{name}.{file_format}"'
+    )
+    return response
+
+
+LEADERBOARD_SCOPE_DICTIONARIES = {
+    leaderboards.CATEGORY: dictionaries.categories,
+    leaderboards.GENRE: dictionaries.genres,
+}
+
+
+def get_leaderboard_limit(request):
+    limit = request.query_params.get('limit', settings.LEADERBOARD_SIZE)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        limit = 0
+    if not 0 < limit <= settings.LEADERBOARD_MAX_SIZE:
+        raise ValidationError({
+            'limit': 'Допустимое значение от 1 до '
+                     f'{settings.LEADERBOARD_MAX_SIZE}'
+        })
+    return limit
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def leaderboard(request, kind, scope=None, value=None):
+    limit = get_leaderboard_limit(request)
+    if scope in LEADERBOARD_SCOPE_DICTIONARIES:
+        obj = LEADERBOARD_SCOPE_DICTIONARIES[scope].get_by_slug(
+            value, request
+        )
+        if obj is None:
+            raise Http404
+        value = obj.pk
+    elif scope == leaderboards.YEAR and not value.isdigit():
+        raise Http404
+    entries = leaderboards.get_entries(
+        kind, leaderboards.board_key(scope, value), limit
+    )
+    data = LeaderboardEntrySerializer(
+        entries, many=True, context={'request': request}
+    ).data
+    return Response(
+        [
+            {'position': position, **entry}
+            for position, entry in enumerate(data, 1)
+        ],
+        status=HTTPStatus.OK
+    )
+
+
+@requires_db_user
+@api_view(['GET'])
+@permission_classes([IsAuthorOrAdmin])
+def cache_stats(request):
+    return Response(get_stats(), status=HTTPStatus.OK)
+
+
+class UserViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (IsAuthorOrAdmin, )
@@ -77,6 +181,7 @@ class UserViewSet(viewsets.ModelViewSet):
     filter_backends = (DjangoFilterBackend, filters.SearchFilter,)
     search_fields = ('=username',)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    requires_db_user = True
 
     @action(
         methods=['GET', 'PATCH', ],
@@ -99,46 +204,71 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=HTTPStatus.OK)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        average_score=Avg('reviews__score')
-    ).order_by('name')
+class TitleViewSet(ReplicaReadMixin, BulkWriteMixin, ConditionalGetMixin,
+                   CachedListMixin, ValuesListMixin, viewsets.ModelViewSet):
+    queryset = Title.objects.prefetch_related('genretitle_set').order_by(
+        'name'
+    )
     serializer_class = TitleCreateSerializer
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter)
+    values_serializer_class = TitleValuesSerializer
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter)
     filterset_class = TitleFilter
     permission_classes = (IsAdminOrReadOnly,)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    cache_resource = TITLES
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            partial(self.get_cached_response, super().retrieve),
+            request, *args, **kwargs
+        )
 
 
-class CategoryViewSet(CreateListDeleteViewSet):
+class CategoryViewSet(ReplicaReadMixin, BulkWriteMixin, ConditionalGetMixin,
+                      CachedListMixin, CreateListDeleteViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend, filters.SearchFilter)
     search_fields = ('name',)
     lookup_field = 'slug'
+    cache_resource = CATEGORIES
 
 
-class GenreViewSet(CreateListDeleteViewSet):
+class GenreViewSet(ReplicaReadMixin, BulkWriteMixin, ConditionalGetMixin,
+                   CachedListMixin, CreateListDeleteViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend, filters.SearchFilter)
     search_fields = ('name',)
     lookup_field = 'slug'
+    cache_resource = GENRES
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ReplicaReadMixin, ConditionalGetMixin, ValuesListMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     permission_classes = (
         IsAuthorAndStaffOrReadOnly,
         IsAuthenticatedOrReadOnly,
     )
     http_method_names = ['get', 'post', 'patch', 'delete']
+    pagination_class = SwitchablePagination
+    pagination_mode = PAGE
+
+    def get_version_resources(self):
+        return (scoped(COMMENTS, self.kwargs.get('review_id')),)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
 
     def get_queryset(self):
         review = get_object_or_404(Review, pk=self.kwargs.get('review_id'))
-        return review.comments.all()
+        return review.comments.select_related('author')
 
     def perform_create(self, serializer):
         title_id = self.kwargs.get('title_id')
@@ -147,17 +277,29 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user, review=review)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ReplicaReadMixin, ConditionalGetMixin, ValuesListMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
     permission_classes = (
         IsAuthorAndStaffOrReadOnly,
         IsAuthenticatedOrReadOnly,
     )
     http_method_names = ['get', 'post', 'patch', 'delete']
+    pagination_class = SwitchablePagination
+    pagination_mode = PAGE
+
+    def get_version_resources(self):
+        return (scoped(REVIEWS, self.kwargs.get('title_id')),)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
 
     def get_queryset(self):
         title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return title.reviews.select_related('author')
 
     def perform_create(self, serializer):
         title_id = self.kwargs.get('title_id')
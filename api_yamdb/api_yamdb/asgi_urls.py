@@ -0,0 +1,12 @@
+"""Маршруты под ASGI: API из api.async_urls, остальное - из api_yamdb.urls."""
+from django.urls import include, path
+
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/', include('api.async_urls', namespace='api')),
+    *(
+        pattern for pattern in sync_urlpatterns
+        if str(pattern.pattern) != 'api/'
+    ),
+]
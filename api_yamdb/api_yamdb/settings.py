@@ -31,6 +31,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.profiling.ProfilingMiddleware',
+    'api.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -40,7 +42,9 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'api_yamdb.urls'
+# asgi.py подставляет api_yamdb.asgi_urls: горячие GET-маршруты там
+# обслуживают асинхронные представления.
+ROOT_URLCONF = os.getenv('DJANGO_ROOT_URLCONF', 'api_yamdb.urls')
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 TEMPLATES = [
@@ -61,16 +65,163 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+# Потоки, в которых асинхронные представления под ASGI обращаются
+# к базе: не больше стольких запросов выполняются одновременно.
+ASYNC_DB_THREADS = int(os.getenv('ASYNC_DB_THREADS', 4))
+
 
 # Database
 
+# По умолчанию - SQLite в BASE_DIR/db.sqlite3. Для PostgreSQL:
+# DB_ENGINE=django.db.backends.postgresql и DB_NAME, DB_USER, DB_PASSWORD,
+# DB_HOST, DB_PORT. Соединения переиспользуются DB_CONN_MAX_AGE секунд;
+# для пула соединений используйте PgBouncer и
+# DB_DISABLE_SERVER_SIDE_CURSORS=1 в режиме пула по транзакциям.
+
+DB_ENGINE = os.getenv('DB_ENGINE', 'django.db.backends.sqlite3')
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': DB_ENGINE,
+        'NAME': os.getenv('DB_NAME', str(BASE_DIR / 'db.sqlite3')),
+        'USER': os.getenv('DB_USER', ''),
+        'PASSWORD': os.getenv('DB_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', ''),
+        'PORT': os.getenv('DB_PORT', ''),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'DISABLE_SERVER_SIDE_CURSORS': (
+            os.getenv('DB_DISABLE_SERVER_SIDE_CURSORS', '') == '1'
+        ),
+        'OPTIONS': {},
+    }
+}
+
+if DB_ENGINE == 'django.db.backends.sqlite3':
+    # Сколько секунд ждать снятия блокировки записи, прежде чем
+    # вернуть ошибку "database is locked".
+    DATABASES['default']['OPTIONS']['timeout'] = float(
+        os.getenv('SQLITE_BUSY_TIMEOUT', 20)
+    )
+
+# Реплики для чтения: DB_REPLICAS - через запятую хосты реплик, для
+# SQLite - пути к файлам-копиям базы. Безопасные запросы к API читают
+# с реплик, а пользователь после записи DB_REPLICA_LAG секунд читает
+# из основной базы. В тестах реплики совпадают с основной базой.
+DATABASE_REPLICAS = []
+for replica in filter(None, os.getenv('DB_REPLICAS', '').split(',')):
+    alias = f'replica_{len(DATABASE_REPLICAS) + 1}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        ('NAME' if DB_ENGINE == 'django.db.backends.sqlite3' else 'HOST'): (
+            replica.strip()
+        ),
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
     }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['api.db.ReplicaRouter']
+
+DB_REPLICA_LAG = float(os.getenv('DB_REPLICA_LAG', 5))
+
+# Проверять переиспользуемые соединения перед каждым запросом.
+DB_HEALTH_CHECKS = os.getenv('DB_HEALTH_CHECKS', '') == '1'
+
+# Прагмы, которые выполняются при каждом подключении к SQLite:
+# WAL позволяет читать параллельно с записью, synchronous=NORMAL
+# в режиме WAL не теряет целостность базы при сбое.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'normal'),
+    'cache_size': -20000,
+    'temp_store': 'memory',
+    'mmap_size': 128 * 1024 * 1024,
+}
+
+
+# Cache
+# Ответы каталога (категории, жанры, произведения) кэшируются в API_CACHE_ALIAS.
+# Для файлового кэша: API_CACHE_BACKEND=
+# django.core.cache.backends.filebased.FileBasedCache и API_CACHE_LOCATION=
+# путь к каталогу. Отключить кэш можно бэкендом DummyCache.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        'BACKEND': os.getenv(
+            'API_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('API_CACHE_LOCATION', 'api-responses'),
+        'TIMEOUT': int(os.getenv('API_CACHE_TIMEOUT', 300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('API_CACHE_MAX_ENTRIES', 10000)),
+        },
+    },
 }
 
+API_CACHE_ALIAS = 'api'
+
+# ETag и Last-Modified по версиям ресурсов из кэша API (api.mixins.
+# ConditionalGetMixin). Версии должны быть общими для всех процессов,
+# иначе воркер, не видевший изменения, ответит 304 на устаревшие данные:
+# auto - только если кэш API не в памяти процесса, on - всегда (один
+# процесс), off - никогда.
+CONDITIONAL_GET = os.getenv('CONDITIONAL_GET', 'auto')
+
+# Справочники категорий и жанров, которые каждый процесс держит в памяти
+# (api.dictionaries), перечитываются при смене версии в базе и не реже
+# раза в DICTIONARY_SNAPSHOT_TTL секунд.
+DICTIONARY_SNAPSHOT_TTL = int(os.getenv('DICTIONARY_SNAPSHOT_TTL', 60))
+
+
+# Search
+# auto - FTS5 на SQLite, если модуль доступен, иначе таблица токенов;
+# можно явно указать fts5 или table.
+
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'auto')
+SEARCH_MAX_RESULTS = 1000
+
+
+# Leaderboards
+# Байесовская оценка считает, что у каждого произведения есть ещё
+# LEADERBOARD_PRIOR_WEIGHT оценок, равных средней по разрезу. До первого
+# пересчёта rebuild_leaderboards средняя нового разреза - средняя общего
+# рейтинга или LEADERBOARD_DEFAULT_PRIOR_MEAN.
+
+LEADERBOARD_PRIOR_WEIGHT = 10
+LEADERBOARD_DEFAULT_PRIOR_MEAN = float(
+    os.getenv('LEADERBOARD_DEFAULT_PRIOR_MEAN', 5.5)
+)
+LEADERBOARD_TRENDING_DAYS = 7
+LEADERBOARD_SIZE = 10
+LEADERBOARD_MAX_SIZE = 100
+
+
+# Profiling
+# Замеры всех запросов включаются PROFILING_ENABLED=1, отдельного запроса
+# администратора - заголовком X-Profile: 1, любого клиента - заголовком
+# X-Profile со значением PROFILING_SECRET. Гистограммы по маршрутам
+# сохраняются в PROFILING_REPORT_PATH каждые PROFILING_REPORT_EVERY
+# запросов и при завершении процесса.
+
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', '') == '1'
+PROFILING_SECRET = os.getenv('PROFILING_SECRET', '')
+PROFILING_REPORT_PATH = os.getenv('PROFILING_REPORT_PATH', '')
+PROFILING_REPORT_EVERY = 100
+
+
+# Metrics
+# Метрики Prometheus по адресу /metrics. Если задан METRICS_TOKEN,
+# запрос должен содержать заголовок Authorization: Bearer <токен>.
+# Число строк в таблицах пересчитывается раз в METRICS_TABLE_ROWS_TTL
+# секунд.
+
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_TABLE_ROWS_TTL = int(os.getenv('METRICS_TABLE_ROWS_TTL', 60))
+
 
 # Password validation
 
@@ -116,19 +267,68 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
+    # Регистрация и получение токена (api.throttling): число запросов
+    # подряд и период, за который они восстанавливаются.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': os.getenv('THROTTLE_SIGNUP_IP_RATE', '30/hour'),
+        'signup_username': os.getenv(
+            'THROTTLE_SIGNUP_USERNAME_RATE', '5/hour'
+        ),
+        'signup_email': os.getenv('THROTTLE_SIGNUP_EMAIL_RATE', '5/hour'),
+        'token_ip': os.getenv('THROTTLE_TOKEN_IP_RATE', '60/hour'),
+        'token_username': os.getenv(
+            'THROTTLE_TOKEN_USERNAME_RATE', '10/hour'
+        ),
+    },
+    # Число прокси перед приложением: IP-адрес клиента для ограничения
+    # частоты берётся из X-Forwarded-For на столько позиций от конца.
+    # При 0 заголовок не учитывается, иначе клиент подставил бы в него
+    # любой адрес и обошёл ограничение по IP.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 
+# Кодировщик api.renderers.FastJSONRenderer: auto - orjson, если он
+# установлен, иначе json; можно явно указать orjson или json.
+JSON_ENCODER = os.getenv('JSON_ENCODER', 'auto')
+
+# Хранилище корзин ограничения частоты: memory - в памяти процесса,
+# sqlite - файл THROTTLE_SQLITE_PATH, общий для процессов на одной машине.
+THROTTLE_STORE = os.getenv('THROTTLE_STORE', 'memory')
+THROTTLE_SQLITE_PATH = os.getenv(
+    'THROTTLE_SQLITE_PATH', str(BASE_DIR / 'throttle.sqlite3')
+)
+# Через сколько секунд без запросов корзина удаляется из SQLite.
+THROTTLE_SQLITE_TTL = 86400
+# Сколько корзин хранить в памяти процесса.
+THROTTLE_MAX_KEYS = 100000
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=7),
     'AUTH_HEADER_TYPES': ('Bearer',),
     'ROTATE_REFRESH_TOKENS': False,
-    'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
+    'AUTH_TOKEN_CLASSES': ('api.authentication.RoleAccessToken',),
 }
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 DEFAULT_FROM_EMAIL = 'support@yambd.com'
+
+# Письма сохраняются в очередь (users.OutgoingEmail) и отправляются после
+# коммита: в фоновом потоке (thread), в том же потоке (immediate) или
+# только командой send_emails (worker).
+EMAIL_OUTBOX_DELIVERY = os.getenv('EMAIL_OUTBOX_DELIVERY', 'thread')
+EMAIL_OUTBOX_WORKERS = 2
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+# Задержка перед повтором удваивается с каждой попыткой, в секундах.
+EMAIL_OUTBOX_RETRY_DELAY = 30
+EMAIL_OUTBOX_MAX_DELAY = 3600
+EMAIL_OUTBOX_LEASE = 300
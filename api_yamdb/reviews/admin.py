@@ -10,7 +10,7 @@ class GenreInline(admin.TabularInline):
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
     inlines = (GenreInline,)
-    list_display = ('name', 'description', 'category', 'year')
+    list_display = ('name', 'description', 'category', 'year', 'rating')
     list_display_links = ('name',)
     list_editable = ('category',)
     search_fields = ('name', 'year')
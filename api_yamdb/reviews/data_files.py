@@ -0,0 +1,107 @@
+import csv
+import json
+from collections import namedtuple
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+
+User = get_user_model()
+
+DataFile = namedtuple(
+    'DataFile', ('name', 'model', 'columns', 'foreign_keys')
+)
+
+# Файлы static/data в порядке зависимостей. foreign_keys: колонка CSV ->
+# (поле модели, модель, на которую ссылается ключ).
+DATA_FILES = (
+    DataFile(
+        'users', User,
+        ('id', 'username', 'email', 'role', 'bio', 'first_name',
+         'last_name'),
+        {}
+    ),
+    DataFile('category', Category, ('id', 'name', 'slug'), {}),
+    DataFile('genre', Genre, ('id', 'name', 'slug'), {}),
+    DataFile(
+        'titles', Title, ('id', 'name', 'year', 'category'),
+        {'category': ('category_id', Category)}
+    ),
+    DataFile(
+        'genre_title', GenreTitle, ('id', 'title_id', 'genre_id'),
+        {
+            'title_id': ('title_id', Title),
+            'genre_id': ('genre_id', Genre),
+        }
+    ),
+    DataFile(
+        'review', Review,
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        {
+            'title_id': ('title_id', Title),
+            'author': ('author_id', User),
+        }
+    ),
+    DataFile(
+        'comments', Comment,
+        ('id', 'review_id', 'text', 'author', 'pub_date'),
+        {
+            'review_id': ('review_id', Review),
+            'author': ('author_id', User),
+        }
+    ),
+)
+DATA_FILES_BY_NAME = {data_file.name: data_file for data_file in DATA_FILES}
+EXPORT_FORMATS = ('csv', 'jsonl')
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """Псевдобуфер для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat(timespec='milliseconds').replace(
+            '+00:00', 'Z'
+        )
+    return value
+
+
+def iter_rows(data_file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Построчно читает таблицу через серверный курсор,
+    не загружая её в память целиком.
+    """
+    fields = [
+        data_file.foreign_keys.get(column, (column,))[0]
+        for column in data_file.columns
+    ]
+    rows = data_file.model.objects.order_by('id').values_list(*fields)
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield [format_value(value) for value in row]
+
+
+def iter_csv(data_file, chunk_size=DEFAULT_CHUNK_SIZE):
+    writer = csv.writer(Echo())
+    yield writer.writerow(data_file.columns)
+    for row in iter_rows(data_file, chunk_size):
+        yield writer.writerow(['' if value is None else value
+                               for value in row])
+
+
+def iter_jsonl(data_file, chunk_size=DEFAULT_CHUNK_SIZE):
+    for row in iter_rows(data_file, chunk_size):
+        yield json.dumps(
+            dict(zip(data_file.columns, row)), ensure_ascii=False
+        ) + '\n'
+
+
+def iter_export(data_file, file_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    if file_format == 'csv':
+        return iter_csv(data_file, chunk_size)
+    return iter_jsonl(data_file, chunk_size)
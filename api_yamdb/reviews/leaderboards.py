@@ -0,0 +1,217 @@
+"""
+Материализованные рейтинги произведений: общий, по категории, по жанру
+и по году выпуска. Лучшие по байесовской оценке (rated) и самые
+обсуждаемые за последние дни (trending). Позиции произведения
+пересчитываются при изменении его отзывов, средние оценки разрезов -
+полным пересчётом командой rebuild_leaderboards.
+"""
+import datetime as dt
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import GenreTitle, Leaderboard, LeaderboardEntry, Review, Title
+
+RATED = 'rated'
+TRENDING = 'trending'
+KINDS = (RATED, TRENDING)
+
+ALL = 'all'
+CATEGORY = 'category'
+GENRE = 'genre'
+YEAR = 'year'
+SCOPES = (CATEGORY, GENRE, YEAR)
+
+REBUILD_BATCH_SIZE = 2000
+
+
+def board_key(scope=None, value=None):
+    return ALL if scope is None else f'{scope}:{value}'
+
+
+def get_boards(year, category_id, genre_ids):
+    boards = [ALL, board_key(YEAR, year)]
+    if category_id is not None:
+        boards.append(board_key(CATEGORY, category_id))
+    boards.extend(board_key(GENRE, genre_id) for genre_id in genre_ids)
+    return boards
+
+
+def bayesian_score(rating_sum, rating_count, prior_mean):
+    """
+    Средняя оценка, сдвинутая к средней по разрезу так, будто у
+    произведения есть ещё LEADERBOARD_PRIOR_WEIGHT оценок, равных ей:
+    одна десятка не поднимает произведение выше сотни девяток.
+    """
+    weight = settings.LEADERBOARD_PRIOR_WEIGHT
+    return (rating_sum + weight * prior_mean) / (rating_count + weight)
+
+
+def get_trending_since():
+    return timezone.now() - dt.timedelta(
+        days=settings.LEADERBOARD_TRENDING_DAYS
+    )
+
+
+def build_entries(title_id, boards, rating_sum, rating_count, recent_count,
+                  priors):
+    entries = []
+    if rating_count:
+        entries.extend(
+            LeaderboardEntry(
+                kind=RATED,
+                board=board,
+                title_id=title_id,
+                score=bayesian_score(rating_sum, rating_count, priors[board]),
+                reviews_count=rating_count
+            )
+            for board in boards
+        )
+    if recent_count:
+        entries.extend(
+            LeaderboardEntry(
+                kind=TRENDING,
+                board=board,
+                title_id=title_id,
+                score=recent_count,
+                reviews_count=rating_count
+            )
+            for board in boards
+        )
+    return entries
+
+
+def get_priors(boards):
+    """
+    Средние оценки разрезов из последнего полного пересчёта. Разрез,
+    которого ещё нет, получает среднюю общего рейтинга, а до первого
+    появления общего - LEADERBOARD_DEFAULT_PRIOR_MEAN: оценки самого
+    произведения за среднюю не берутся, иначе одна десятка в новом
+    разрезе давала бы десять баллов.
+    """
+    priors = dict(
+        Leaderboard.objects.filter(
+            kind=RATED, board__in={ALL, *boards}
+        ).values_list('board', 'prior_mean')
+    )
+    missing = [board for board in boards if board not in priors]
+    if missing:
+        now = timezone.now()
+        prior_mean = priors.get(ALL, settings.LEADERBOARD_DEFAULT_PRIOR_MEAN)
+        Leaderboard.objects.bulk_create(
+            [
+                Leaderboard(
+                    kind=kind, board=board,
+                    prior_mean=prior_mean if kind == RATED else 0,
+                    refreshed_at=now
+                )
+                for kind in KINDS for board in missing
+            ],
+            ignore_conflicts=True
+        )
+        priors.update(dict.fromkeys(missing, prior_mean))
+    return priors
+
+
+def refresh_title(title_id):
+    """Пересчитывает позиции одного произведения во всех его разрезах."""
+    with transaction.atomic():
+        title = Title.objects.filter(pk=title_id).values(
+            'year', 'category_id', 'rating_sum', 'rating_count'
+        ).first()
+        LeaderboardEntry.objects.filter(title_id=title_id).delete()
+        if title is None:
+            return
+        genre_ids = GenreTitle.objects.filter(title_id=title_id).values_list(
+            'genre_id', flat=True
+        )
+        boards = get_boards(title['year'], title['category_id'], genre_ids)
+        recent_count = Review.objects.filter(
+            title_id=title_id, pub_date__gte=get_trending_since()
+        ).count()
+        # Средние нужны только для rated: без оценок разрезы не создаются.
+        priors = get_priors(boards) if title['rating_count'] else {}
+        LeaderboardEntry.objects.bulk_create(build_entries(
+            title_id, boards, title['rating_sum'], title['rating_count'],
+            recent_count, priors
+        ))
+
+
+def remove_board(scope, value):
+    board = board_key(scope, value)
+    Leaderboard.objects.filter(board=board).delete()
+    LeaderboardEntry.objects.filter(board=board).delete()
+
+
+@transaction.atomic
+def rebuild():
+    """
+    Полный пересчёт всех рейтингов: средние оценки разрезов считаются
+    заново, позиции записываются пачками. Возвращает число позиций.
+    """
+    genres = defaultdict(list)
+    for title_id, genre_id in GenreTitle.objects.values_list(
+        'title_id', 'genre_id'
+    ).iterator(REBUILD_BATCH_SIZE):
+        genres[title_id].append(genre_id)
+    recent = dict(
+        Review.objects.filter(pub_date__gte=get_trending_since()).order_by()
+        .values('title').annotate(recent_count=Count('id'))
+        .values_list('title', 'recent_count')
+    )
+    titles = []
+    board_sums = Counter()
+    board_counts = Counter()
+    for title_id, year, category_id, rating_sum, rating_count in (
+        Title.objects.filter(rating_count__gt=0).order_by('id').values_list(
+            'id', 'year', 'category_id', 'rating_sum', 'rating_count'
+        ).iterator(REBUILD_BATCH_SIZE)
+    ):
+        boards = get_boards(year, category_id, genres[title_id])
+        titles.append((title_id, boards, rating_sum, rating_count))
+        for board in boards:
+            board_sums[board] += rating_sum
+            board_counts[board] += rating_count
+    priors = {
+        board: board_sums[board] / board_counts[board]
+        for board in board_counts
+    }
+    now = timezone.now()
+    created = 0
+    Leaderboard.objects.all().delete()
+    LeaderboardEntry.objects.all().delete()
+    Leaderboard.objects.bulk_create(
+        [
+            Leaderboard(
+                kind=kind, board=board,
+                prior_mean=prior_mean if kind == RATED else 0,
+                refreshed_at=now
+            )
+            for kind in KINDS for board, prior_mean in priors.items()
+        ],
+        batch_size=REBUILD_BATCH_SIZE
+    )
+    batch = []
+    for title_id, boards, rating_sum, rating_count in titles:
+        batch.extend(build_entries(
+            title_id, boards, rating_sum, rating_count,
+            recent.get(title_id, 0), priors
+        ))
+        if len(batch) >= REBUILD_BATCH_SIZE:
+            LeaderboardEntry.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    LeaderboardEntry.objects.bulk_create(batch)
+    created += len(batch)
+    return created
+
+
+def get_entries(kind, board, limit):
+    return LeaderboardEntry.objects.filter(
+        kind=kind, board=board
+    ).select_related('title').prefetch_related(
+        'title__genretitle_set'
+    ).order_by('-score', 'title_id')[:limit]
@@ -0,0 +1,64 @@
+import time
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
+
+from reviews.data_files import (
+    DATA_FILES, DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, iter_export
+)
+
+
+class Command(BaseCommand):
+    help = "Потоковая выгрузка данных в CSV или JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            default='export',
+            help='Каталог для выгружаемых файлов.'
+        )
+        parser.add_argument(
+            '--format',
+            dest='file_format',
+            choices=EXPORT_FORMATS,
+            default='csv',
+            help='Формат выгрузки.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за один раз.'
+        )
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            choices=[data_file.name for data_file in DATA_FILES],
+            help='Выгрузить только указанные таблицы.'
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('Размер порции должен быть больше нуля.')
+        output_dir = Path(options['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        only = options['only']
+        for data_file in DATA_FILES:
+            if only and data_file.name not in only:
+                continue
+            path = output_dir / f'{data_file.name}.{options["file_format"]}'
+            started = time.perf_counter()
+            lines = 0
+            with open(path, 'w', encoding='utf-8', newline='') as output:
+                for line in iter_export(
+                    data_file, options['file_format'], options['chunk_size']
+                ):
+                    output.write(line)
+                    lines += 1
+            elapsed = time.perf_counter() - started
+            rows = lines - 1 if options['file_format'] == 'csv' else lines
+            speed = rows / elapsed if elapsed else rows
+            self.stdout.write(
+                f'{path}: {rows} строк за {elapsed:.2f} с '
+                f'({speed:.0f} строк/с)'
+            )
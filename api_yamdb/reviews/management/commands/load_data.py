@@ -0,0 +1,154 @@
+import time
+from contextlib import contextmanager
+from csv import DictReader
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError, call_command
+from django.db import IntegrityError, transaction
+
+from api import dictionaries
+from api.cache import CATEGORIES, GENRES, RESOURCES, invalidate
+from reviews.data_files import DATA_FILES
+from reviews.models import Review, Title
+
+DEFAULT_DATA_DIR = settings.BASE_DIR / 'static/data'
+DEFAULT_BATCH_SIZE = 1000
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """
+    Отключает auto_now_add, чтобы даты публикации из CSV
+    не затирались текущим временем при bulk_create.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = "Пакетная загрузка всех CSV-файлов из static/data"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            default=DEFAULT_DATA_DIR,
+            help='Каталог с CSV-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одном bulk_create.'
+        )
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            choices=[data_file.name for data_file in DATA_FILES],
+            help='Загрузить только указанные файлы.'
+        )
+        parser.add_argument(
+            '--ignore-conflicts',
+            action='store_true',
+            help='Пропускать строки, которые уже есть в базе.'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('Размер пакета должен быть больше нуля.')
+        only = options['only']
+        files = [
+            data_file for data_file in DATA_FILES
+            if not only or data_file.name in only
+        ]
+        self.id_maps = {}
+        total_rows = 0
+        started = time.perf_counter()
+        with transaction.atomic():
+            for data_file in files:
+                total_rows += self.load_file(data_file, options)
+            if any(data_file.model in (Review, Title) for data_file in files):
+                call_command('recalculate_ratings', stdout=self.stdout)
+                call_command('rebuild_search_index', stdout=self.stdout)
+                call_command('rebuild_leaderboards', stdout=self.stdout)
+            transaction.on_commit(lambda: invalidate(*RESOURCES))
+            transaction.on_commit(
+                lambda: dictionaries.invalidate(CATEGORIES, GENRES)
+            )
+        self.report('Итого', total_rows, time.perf_counter() - started)
+
+    def get_id_map(self, model):
+        if model not in self.id_maps:
+            self.id_maps[model] = set(
+                model.objects.values_list('id', flat=True).iterator()
+            )
+        return self.id_maps[model]
+
+    def build_instance(self, model, foreign_keys, row, location):
+        values = {}
+        for column, value in row.items():
+            if column not in foreign_keys:
+                values[column] = value
+                continue
+            attname, related_model = foreign_keys[column]
+            if not value:
+                values[attname] = None
+                continue
+            related_id = int(value)
+            if related_id not in self.get_id_map(related_model):
+                raise CommandError(
+                    f'{location}: {related_model._meta.verbose_name} '
+                    f'с id={related_id} не найден(а).'
+                )
+            values[attname] = related_id
+        return model(**values)
+
+    def load_file(self, data_file, options):
+        name, model, _, foreign_keys = data_file
+        path = Path(options['data_dir']) / f'{name}.csv'
+        id_map = self.get_id_map(model)
+        rows = 0
+        started = time.perf_counter()
+        with open(path, encoding='utf-8') as csv_file, \
+                keep_auto_now_add(model):
+            reader = DictReader(csv_file)
+            while True:
+                batch = [
+                    self.build_instance(
+                        model, foreign_keys, row,
+                        f'{name}.csv, строка {reader.line_num}'
+                    )
+                    for row in islice(reader, options['batch_size'])
+                ]
+                if not batch:
+                    break
+                try:
+                    model.objects.bulk_create(
+                        batch, ignore_conflicts=options['ignore_conflicts']
+                    )
+                except IntegrityError as error:
+                    raise CommandError(
+                        f'{name}.csv: {error}. Используйте '
+                        '--ignore-conflicts для повторной загрузки.'
+                    )
+                id_map.update(int(instance.pk) for instance in batch)
+                rows += len(batch)
+        self.report(f'{name}.csv', rows, time.perf_counter() - started)
+        return rows
+
+    def report(self, label, rows, elapsed):
+        speed = rows / elapsed if elapsed else rows
+        self.stdout.write(
+            f'{label}: {rows} строк за {elapsed:.2f} с '
+            f'({speed:.0f} строк/с)'
+        )
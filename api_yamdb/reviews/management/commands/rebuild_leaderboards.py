@@ -0,0 +1,20 @@
+import time
+
+from django.core.management import BaseCommand
+
+from reviews.leaderboards import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        "Полный пересчёт рейтингов произведений: средних оценок разрезов "
+        "и окна обсуждаемых. Запускается по расписанию"
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild()
+        self.stdout.write(
+            f'Пересчитано позиций в рейтингах: {count} '
+            f'за {time.perf_counter() - started:.2f} с'
+        )
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from api.cache import TITLES, invalidate
+from reviews.search import get_backend
+
+
+class Command(BaseCommand):
+    help = "Перестроение поискового индекса по произведениям и отзывам"
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        started = time.perf_counter()
+        with transaction.atomic():
+            backend.create_table()
+            count = backend.rebuild()
+            transaction.on_commit(lambda: invalidate(TITLES))
+        self.stdout.write(
+            f'Проиндексировано документов: {count} ({backend.name}) '
+            f'за {time.perf_counter() - started:.2f} с'
+        )
@@ -0,0 +1,33 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from api.cache import TITLES, invalidate
+from reviews.models import Review, Title
+
+
+class Command(BaseCommand):
+    help = "Пересчёт сохранённых рейтингов произведений по отзывам"
+
+    def handle(self, *args, **options):
+        aggregates = {
+            row['title']: (row['score_sum'], row['score_count'])
+            for row in Review.objects.order_by().values('title').annotate(
+                score_sum=Sum('score'),
+                score_count=Count('id')
+            )
+        }
+        titles = list(Title.objects.only('id'))
+        for title in titles:
+            score_sum, score_count = aggregates.get(title.id, (0, 0))
+            title.rating_sum = score_sum
+            title.rating_count = score_count
+            title.rating = score_sum / score_count if score_count else None
+        with transaction.atomic():
+            Title.objects.bulk_update(
+                titles,
+                ('rating_sum', 'rating_count', 'rating'),
+                batch_size=500
+            )
+            transaction.on_commit(lambda: invalidate(TITLES))
+        self.stdout.write(f'Пересчитаны рейтинги {len(titles)} произведений')
@@ -1,6 +1,10 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import (
+    Avg, Case, Count, F, FloatField, OuterRef, Subquery, Sum, When
+)
+from django.db.models.functions import Cast, Coalesce
 
 from api import constants
 
@@ -77,15 +81,81 @@ class Title(models.Model):
         verbose_name='Жанр',
         through='GenreTitle'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок'
+    )
+    rating = models.FloatField(
+        null=True,
+        editable=False,
+        verbose_name='Рейтинг'
+    )
 
     class Meta:
         verbose_name = 'произведение'
         verbose_name_plural = 'произведения'
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name'], name='title_name_idx'),
+            models.Index(fields=['year', 'name'], name='title_year_name_idx'),
+            models.Index(
+                fields=['category', 'name'], name='title_category_name_idx'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['name', 'year'],
+                name='unique_title'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def update_rating(self, score_delta, count_delta=0):
+        """
+        Атомарно сдвигает сохранённые сумму и количество оценок
+        и пересчитывает средний рейтинг одним UPDATE-запросом.
+        """
+        new_sum = F('rating_sum') + score_delta
+        new_count = F('rating_count') + count_delta
+        Title.objects.filter(pk=self.pk).update(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            rating=Case(
+                When(rating_count__lte=-count_delta, then=None),
+                default=Cast(new_sum, FloatField()) / new_count,
+                output_field=FloatField(),
+            )
+        )
+
+    def recalculate_rating(self):
+        """Пересчитывает сумму, количество и средний рейтинг по отзывам."""
+        reviews = Review.objects.filter(title=OuterRef('pk')).order_by()
+        reviews = reviews.values('title')
+
+        def aggregate(function, output_field):
+            return Subquery(
+                reviews.annotate(value=function).values('value'),
+                output_field=output_field
+            )
+
+        Title.objects.filter(pk=self.pk).update(
+            rating_sum=Coalesce(
+                aggregate(Sum('score'), models.IntegerField()), 0
+            ),
+            rating_count=Coalesce(
+                aggregate(Count('id'), models.IntegerField()), 0
+            ),
+            rating=aggregate(Avg('score'), FloatField()),
+        )
+
 
 class GenreTitle(models.Model):
     genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
@@ -94,6 +164,11 @@ class GenreTitle(models.Model):
     class Meta:
         verbose_name = 'жанр'
         verbose_name_plural = 'жанры'
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'], name='genretitle_genre_title_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.title}, жанр - {self.genre}'
@@ -134,6 +209,12 @@ class Review(models.Model):
         verbose_name = 'отзыв'
         verbose_name_plural = 'отзывы'
         ordering = ['pub_date']
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'],
@@ -144,6 +225,13 @@ class Review(models.Model):
     def __str__(self):
         return str(self.title)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        review = super().from_db(db, field_names, values)
+        # Сохранённая оценка: по ней post_save сдвигает рейтинг.
+        review.saved_score = review.__dict__.get('score')
+        return review
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -167,3 +255,142 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'комментарии'
         ordering = ['pub_date']
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            ),
+        ]
+
+
+class DictionaryVersion(models.Model):
+    """
+    Версия справочника (категорий или жанров), общая для всех процессов:
+    меняется при каждой записи в его таблицу.
+    """
+    resource = models.CharField(
+        max_length=constants.MAX_DICTIONARY_RESOURCE_LENGTH,
+        primary_key=True,
+        verbose_name='Справочник'
+    )
+    version = models.BigIntegerField(verbose_name='Версия')
+
+    class Meta:
+        verbose_name = 'версия справочника'
+        verbose_name_plural = 'версии справочников'
+
+    def __str__(self):
+        return f'{self.resource} {self.version}'
+
+
+class SearchToken(models.Model):
+    """
+    Строка инвертированного индекса для поиска без FTS5: слово,
+    документ (произведение или отзыв) и вес слова в документе.
+    """
+    term = models.CharField(
+        max_length=constants.MAX_SEARCH_TERM_LENGTH,
+        verbose_name='Слово'
+    )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='Произведение',
+        related_name='+'
+    )
+    source_kind = models.PositiveSmallIntegerField(
+        verbose_name='Тип документа'
+    )
+    source_id = models.PositiveBigIntegerField(
+        verbose_name='Документ'
+    )
+    weight = models.PositiveIntegerField(verbose_name='Вес')
+
+    class Meta:
+        verbose_name = 'поисковый токен'
+        verbose_name_plural = 'поисковые токены'
+        indexes = [
+            models.Index(
+                fields=['term', 'title'], name='search_term_title_idx'
+            ),
+            models.Index(
+                fields=['source_kind', 'source_id'],
+                name='search_source_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return self.term
+
+
+class Leaderboard(models.Model):
+    """
+    Параметры материализованного рейтинга: средняя оценка в разрезе
+    (априорное среднее байесовской формулы) и время полного пересчёта.
+    """
+    kind = models.CharField(
+        max_length=constants.MAX_LEADERBOARD_KIND_LENGTH,
+        verbose_name='Вид'
+    )
+    board = models.CharField(
+        max_length=constants.MAX_LEADERBOARD_BOARD_LENGTH,
+        verbose_name='Разрез'
+    )
+    prior_mean = models.FloatField(
+        default=0,
+        verbose_name='Средняя оценка в разрезе'
+    )
+    refreshed_at = models.DateTimeField(verbose_name='Пересчитан')
+
+    class Meta:
+        verbose_name = 'рейтинг произведений'
+        verbose_name_plural = 'рейтинги произведений'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'board'],
+                name='unique_leaderboard'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.board}'
+
+
+class LeaderboardEntry(models.Model):
+    kind = models.CharField(
+        max_length=constants.MAX_LEADERBOARD_KIND_LENGTH,
+        verbose_name='Вид'
+    )
+    board = models.CharField(
+        max_length=constants.MAX_LEADERBOARD_BOARD_LENGTH,
+        verbose_name='Разрез'
+    )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='Произведение',
+        related_name='+'
+    )
+    score = models.FloatField(verbose_name='Очки')
+    reviews_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов'
+    )
+
+    class Meta:
+        verbose_name = 'позиция в рейтинге'
+        verbose_name_plural = 'позиции в рейтинге'
+        indexes = [
+            models.Index(
+                fields=['kind', 'board', '-score', 'title'],
+                name='leaderboard_rank_idx'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'board', 'title'],
+                name='unique_leaderboard_entry'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.board}: {self.title_id}'
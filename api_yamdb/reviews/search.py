@@ -0,0 +1,296 @@
+"""
+Полнотекстовый поиск по названиям и описаниям произведений и текстам
+отзывов. На SQLite с FTS5 индекс хранится в виртуальной таблице,
+иначе - в таблице SearchToken с токенами, разобранными в Python.
+"""
+import re
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+)
+
+from api.constants import MAX_SEARCH_TERM_LENGTH
+from .models import Review, SearchToken, Title
+
+TITLE = 0
+REVIEW = 1
+# Вес совпадения в названии, описании и тексте отзыва.
+NAME_WEIGHT = 10
+DESCRIPTION_WEIGHT = 2
+REVIEW_WEIGHT = 1
+# Совпадение в самом произведении важнее совпадения в отзыве о нём.
+KIND_WEIGHTS = {TITLE: 3, REVIEW: 1}
+REBUILD_BATCH_SIZE = 2000
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return [
+        token[:MAX_SEARCH_TERM_LENGTH]
+        for token in TOKEN_RE.findall((text or '').lower())
+    ]
+
+
+def iter_documents():
+    """Все документы индекса: (вид, id, id произведения, название, текст)."""
+    titles = Title.objects.order_by('id').values_list(
+        'id', 'name', 'description'
+    )
+    for pk, name, description in titles.iterator(REBUILD_BATCH_SIZE):
+        yield TITLE, pk, pk, name, description
+    reviews = Review.objects.order_by('id').values_list(
+        'id', 'title_id', 'text'
+    )
+    for pk, title_id, text in reviews.iterator(REBUILD_BATCH_SIZE):
+        yield REVIEW, pk, title_id, '', text
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class FTS5Backend:
+    name = 'fts5'
+    table = 'reviews_search_fts'
+
+    def __init__(self, using):
+        self.using = using
+
+    @staticmethod
+    def rowid(kind, source_id):
+        return source_id * 2 + kind
+
+    def cursor(self):
+        return connections[self.using].cursor()
+
+    def create_table(self):
+        with self.cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING '
+                'fts5(title_id UNINDEXED, name, body)'
+            )
+
+    def index(self, kind, source_id, title_id, name, body):
+        self.index_many([(kind, source_id, title_id, name, body)])
+
+    def index_many(self, documents):
+        rows = [
+            (self.rowid(kind, source_id), title_id, name, body or '')
+            for kind, source_id, title_id, name, body in documents
+        ]
+        with self.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {self.table} WHERE rowid = %s',
+                [(rowid,) for rowid, *_ in rows]
+            )
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, title_id, name, body) '
+                'VALUES (%s, %s, %s, %s)',
+                rows
+            )
+
+    def remove(self, kind, source_id):
+        with self.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s',
+                [self.rowid(kind, source_id)]
+            )
+
+    def clear(self):
+        with self.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+
+    def rebuild(self):
+        count = 0
+        self.clear()
+        with self.cursor() as cursor:
+            for batch in batched(iter_documents(), REBUILD_BATCH_SIZE):
+                cursor.executemany(
+                    f'INSERT INTO {self.table} (rowid, title_id, name, body) '
+                    'VALUES (%s, %s, %s, %s)',
+                    [
+                        (self.rowid(kind, pk), title_id, name, body or '')
+                        for kind, pk, title_id, name, body in batch
+                    ]
+                )
+                count += len(batch)
+        return count
+
+    def search(self, query, limit):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        match = ' '.join(f'"{term}"' for term in terms)
+        with self.cursor() as cursor:
+            cursor.execute(
+                'SELECT title_id, SUM(score) AS total FROM ('
+                f'SELECT title_id, -bm25({self.table}, 0, %s, %s) * '
+                f'CASE rowid %% 2 WHEN {TITLE} THEN %s ELSE %s END AS score '
+                f'FROM {self.table} WHERE {self.table} MATCH %s '
+                # LIMIT -1 не даёт SQLite встроить подзапрос в агрегат:
+                # bm25 нельзя вызывать внутри GROUP BY.
+                'LIMIT -1) '
+                'GROUP BY title_id ORDER BY total DESC, title_id LIMIT %s',
+                [
+                    NAME_WEIGHT, DESCRIPTION_WEIGHT, KIND_WEIGHTS[TITLE],
+                    KIND_WEIGHTS[REVIEW], match, limit
+                ]
+            )
+            return [title_id for title_id, _ in cursor.fetchall()]
+
+
+class TokenTableBackend:
+    name = 'table'
+
+    def __init__(self, using):
+        self.using = using
+
+    def create_table(self):
+        pass
+
+    @staticmethod
+    def build_tokens(kind, source_id, title_id, name, body):
+        weights = Counter()
+        body_weight = DESCRIPTION_WEIGHT if kind == TITLE else REVIEW_WEIGHT
+        for term in tokenize(name):
+            weights[term] += NAME_WEIGHT
+        for term in tokenize(body):
+            weights[term] += body_weight
+        return [
+            SearchToken(
+                term=term, title_id=title_id, source_kind=kind,
+                source_id=source_id, weight=weight
+            ) for term, weight in weights.items()
+        ]
+
+    def index(self, kind, source_id, title_id, name, body):
+        self.index_many([(kind, source_id, title_id, name, body)])
+
+    def index_many(self, documents):
+        sources = defaultdict(list)
+        for kind, source_id, *_ in documents:
+            sources[kind].append(source_id)
+        tokens = SearchToken.objects.using(self.using)
+        for kind, source_ids in sources.items():
+            tokens.filter(source_kind=kind, source_id__in=source_ids).delete()
+        tokens.bulk_create(
+            [
+                token for document in documents
+                for token in self.build_tokens(*document)
+            ],
+            batch_size=REBUILD_BATCH_SIZE
+        )
+
+    def remove(self, kind, source_id):
+        SearchToken.objects.using(self.using).filter(
+            source_kind=kind, source_id=source_id
+        ).delete()
+
+    def clear(self):
+        SearchToken.objects.using(self.using).all().delete()
+
+    def rebuild(self):
+        count = 0
+        self.clear()
+        tokens = SearchToken.objects.using(self.using)
+        for batch in batched(iter_documents(), REBUILD_BATCH_SIZE):
+            tokens.bulk_create(
+                [
+                    token for document in batch
+                    for token in self.build_tokens(*document)
+                ],
+                batch_size=REBUILD_BATCH_SIZE
+            )
+            count += len(batch)
+        return count
+
+    def search(self, query, limit):
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        documents = defaultdict(lambda: [0, 0])
+        rows = SearchToken.objects.using(self.using).filter(
+            term__in=terms
+        ).values_list('title_id', 'source_kind', 'source_id', 'weight')
+        for title_id, kind, source_id, weight in rows.iterator():
+            document = documents[title_id, kind, source_id]
+            document[0] += 1
+            document[1] += weight
+        scores = Counter()
+        for (title_id, kind, _), (matched, weight) in documents.items():
+            if matched == len(terms):
+                scores[title_id] += weight * KIND_WEIGHTS[kind]
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [title_id for title_id, _ in ranked[:limit]]
+
+
+_backends = {}
+
+
+def fts5_available(using):
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    try:
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(probe)'
+            )
+            cursor.execute('DROP TABLE temp.fts5_probe')
+    except OperationalError:
+        return False
+    return True
+
+
+def get_backend(using=DEFAULT_DB_ALIAS):
+    if using not in _backends:
+        name = settings.SEARCH_BACKEND
+        if name == 'auto':
+            name = FTS5Backend.name if fts5_available(using) else (
+                TokenTableBackend.name
+            )
+        backend_class = (
+            FTS5Backend if name == FTS5Backend.name else TokenTableBackend
+        )
+        _backends[using] = backend_class(using)
+    return _backends[using]
+
+
+def index_title(title):
+    get_backend().index(
+        TITLE, title.pk, title.pk, title.name, title.description
+    )
+
+
+def index_titles(titles):
+    get_backend().index_many([
+        (TITLE, title.pk, title.pk, title.name, title.description)
+        for title in titles
+    ])
+
+
+def index_review(review):
+    get_backend().index(REVIEW, review.pk, review.title_id, '', review.text)
+
+
+def remove_title(title):
+    get_backend().remove(TITLE, title.pk)
+
+
+def remove_review(review):
+    get_backend().remove(REVIEW, review.pk)
+
+
+def search_titles(query, limit=None):
+    """id произведений, подходящих под запрос, от лучшего к худшему."""
+    return get_backend().search(query, limit or settings.SEARCH_MAX_RESULTS)
@@ -0,0 +1,87 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from . import leaderboards, search
+from .models import Category, Genre, Review, Title
+
+# Отправляется после массовой записи через bulk_create/bulk_update,
+# для которой Django не отправляет post_save: instances - записанные
+# объекты, created - созданы они или изменены.
+bulk_saved = Signal()
+
+
+def refresh_leaderboards(*title_ids):
+    def refresh():
+        for title_id in title_ids:
+            leaderboards.refresh_title(title_id)
+
+    transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    search.index_title(instance)
+    refresh_leaderboards(instance.pk)
+
+
+@receiver(bulk_saved, sender=Title)
+def index_titles(sender, instances, created, **kwargs):
+    search.index_titles(instances)
+    if not created:
+        refresh_leaderboards(*(title.pk for title in instances))
+
+
+@receiver(post_delete, sender=Title)
+def remove_title_from_index(sender, instance, **kwargs):
+    search.remove_title(instance)
+
+
+@receiver(post_save, sender=Review)
+def index_review(sender, instance, created, update_fields, **kwargs):
+    # Рейтинг сдвигается при любом сохранении отзыва, не только через API.
+    title = Title(pk=instance.title_id)
+    saved_score = getattr(instance, 'saved_score', None)
+    if created:
+        title.update_rating(instance.score, 1)
+    elif update_fields is None or 'score' in update_fields:
+        if saved_score is None:
+            title.recalculate_rating()
+        elif instance.score != saved_score:
+            title.update_rating(instance.score - saved_score)
+    instance.saved_score = instance.score
+    search.index_review(instance)
+    refresh_leaderboards(instance.title_id)
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_from_index(sender, instance, **kwargs):
+    # В том числе при каскадном удалении автора и удалении QuerySet.
+    Title(pk=instance.title_id).update_rating(-instance.score, -1)
+    search.remove_review(instance)
+    refresh_leaderboards(instance.title_id)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def refresh_title_genres(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        refresh_leaderboards(*(pk_set or ()))
+    else:
+        refresh_leaderboards(instance.pk)
+
+
+@receiver(post_delete, sender=Category)
+def remove_category_leaderboard(sender, instance, **kwargs):
+    leaderboards.remove_board(leaderboards.CATEGORY, instance.pk)
+
+
+@receiver(post_delete, sender=Genre)
+def remove_genre_leaderboard(sender, instance, **kwargs):
+    leaderboards.remove_board(leaderboards.GENRE, instance.pk)
+
+
+def create_search_table(sender, using, **kwargs):
+    search.get_backend(using).create_table()
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth import get_user_model
 
+from .models import OutgoingEmail
+
 User = get_user_model()
 
 
@@ -19,3 +21,17 @@ class UserAdmin(admin.ModelAdmin):
     search_fields = ('username', 'role',)
     list_filter = ('username', 'role',)
     list_display_links = ('id',)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'recipient',
+        'subject',
+        'created_at',
+        'attempts',
+        'sent_at',
+    )
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
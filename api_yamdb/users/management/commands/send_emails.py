@@ -0,0 +1,38 @@
+import time
+
+from django.core.management import BaseCommand
+
+from users.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = "Отправка писем из очереди исходящей почты"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить готовые письма и завершить работу.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проверками очереди, в секундах.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Количество писем на одно соединение с почтовым сервером.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_pending(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, ошибок: {failed}'
+                )
+            if options['once']:
+                return
+            time.sleep(options['interval'])
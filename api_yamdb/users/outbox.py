@@ -0,0 +1,143 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+THREAD = 'thread'
+IMMEDIATE = 'immediate'
+WORKER = 'worker'
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.EMAIL_OUTBOX_WORKERS,
+            thread_name_prefix='email-outbox',
+        )
+    return _executor
+
+
+def enqueue_email(subject, message, recipient, from_email=None):
+    """
+    Сохраняет письмо в очередь в текущей транзакции. Доставка начинается
+    после коммита: в фоновом потоке (thread), сразу в том же потоке
+    (immediate) или командой send_emails (worker).
+    """
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipient=recipient,
+    )
+    mode = settings.EMAIL_OUTBOX_DELIVERY
+    if mode == THREAD:
+        transaction.on_commit(lambda: get_executor().submit(_deliver_async))
+    elif mode == IMMEDIATE:
+        transaction.on_commit(deliver_pending)
+    return email
+
+
+def _deliver_async():
+    try:
+        deliver_pending()
+    except Exception:
+        logger.exception('Ошибка при доставке писем из очереди')
+    finally:
+        close_old_connections()
+
+
+def get_retry_delay(attempts):
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_DELAY))
+
+
+def claim_batch(batch_size):
+    """
+    Забирает пачку готовых к отправке писем, сдвигая им следующую
+    попытку на время аренды: параллельные обработчики их не возьмут,
+    а после падения обработчика письма вернутся в очередь.
+    """
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+    candidates = OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        next_attempt_at__lte=now,
+    ).order_by('id')
+    ids = list(candidates.values_list('id', flat=True)[:batch_size])
+    if not ids:
+        return []
+    with transaction.atomic():
+        candidates.filter(id__in=ids).update(next_attempt_at=lease_until)
+        return list(OutgoingEmail.objects.filter(
+            id__in=ids, next_attempt_at=lease_until
+        ))
+
+
+def deliver_batch(emails):
+    """Отправляет письма через одно соединение с почтовым бэкендом."""
+    errors = {}
+    try:
+        with get_connection(fail_silently=False) as connection:
+            for email in emails:
+                try:
+                    connection.send_messages([EmailMessage(
+                        subject=email.subject,
+                        body=email.message,
+                        from_email=email.from_email,
+                        to=[email.recipient],
+                    )])
+                    errors[email.id] = None
+                except Exception as error:
+                    errors[email.id] = error
+    except Exception as error:
+        for email in emails:
+            errors.setdefault(email.id, error)
+
+    # Текст письма с кодом подтверждения не хранится после отправки
+    # и после последней неудачной попытки.
+    now = timezone.now()
+    sent_ids = [email_id for email_id, error in errors.items() if not error]
+    OutgoingEmail.objects.filter(id__in=sent_ids).update(
+        sent_at=now, attempts=F('attempts') + 1, last_error='', message=''
+    )
+    failed = [email for email in emails if errors[email.id]]
+    for email in failed:
+        attempts = email.attempts + 1
+        dead = attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        OutgoingEmail.objects.filter(id=email.id).update(
+            attempts=attempts,
+            next_attempt_at=now + get_retry_delay(attempts),
+            last_error=str(errors[email.id]),
+            **({'message': ''} if dead else {}),
+        )
+        logger.warning(
+            'Не удалось отправить письмо %s (попытка %s): %s',
+            email.id, attempts, errors[email.id]
+        )
+    return len(sent_ids), len(failed)
+
+
+def deliver_pending(batch_size=None):
+    """Отправляет готовые письма пачками, возвращает (отправлено, ошибок)."""
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    total_sent = total_failed = 0
+    while True:
+        emails = claim_batch(batch_size)
+        if not emails:
+            return total_sent, total_failed
+        sent, failed = deliver_batch(emails)
+        total_sent += sent
+        total_failed += failed
@@ -0,0 +1,216 @@
+"""
+Нагрузка на горячие GET-маршруты (список и карточка произведения, отзывы,
+комментарии) при медленных клиентах: WSGI против ASGI.
+
+    python benchmarks/asgi_load.py --threads 4 --clients 20 --slow-clients 20
+
+WSGI - сервер из стандартной библиотеки с пулом из --threads потоков:
+как у синхронного воркера gunicorn, соединение занимает поток, пока
+запрос не прочитан и ответ не отправлен. ASGI - один процесс uvicorn
+(pip install uvicorn) с асинхронными представлениями и пулом
+ASYNC_DB_THREADS=--threads. Быстрые клиенты отправляют запрос сразу,
+медленные растягивают отправку заголовков на --slow-delay секунд.
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+from common import ROOT_DIR, seed, setup_django
+
+PROJECT_DIR = ROOT_DIR / 'api_yamdb'
+# Число частей, на которые медленный клиент делит запрос.
+SLOW_CHUNKS = 10
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+
+class PoolWSGIServer(WSGIServer):
+    """Соединения обрабатываются в пуле из threads потоков."""
+    request_queue_size = 1024
+
+    def __init__(self, address, threads):
+        super().__init__(address, QuietHandler)
+        self.pool = ThreadPoolExecutor(threads)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_in_thread, request, client_address)
+
+    def process_in_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def serve_wsgi(port, threads):
+    sys.path.insert(0, str(PROJECT_DIR))
+    from api_yamdb.wsgi import application
+
+    server = PoolWSGIServer(('127.0.0.1', port), threads)
+    server.set_app(application)
+    server.serve_forever()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, db_path, threads):
+    port = free_port()
+    env = dict(os.environ, DB_NAME=db_path, ASYNC_DB_THREADS=str(threads))
+    env.pop('DJANGO_ROOT_URLCONF', None)
+    if kind == 'WSGI':
+        command = [
+            sys.executable, __file__, '--serve-wsgi', str(port),
+            '--threads', str(threads)
+        ]
+    else:
+        command = [
+            sys.executable, '-m', 'uvicorn', 'api_yamdb.asgi:application',
+            '--port', str(port), '--app-dir', str(PROJECT_DIR),
+            '--log-level', 'warning', '--no-access-log'
+        ]
+    process = subprocess.Popen(command, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.5).close()
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'Сервер {kind} не запустился')
+
+
+async def fetch(port, path, slow_delay=0):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    request = (
+        f'GET {path} HTTP/1.1\r\nHost: localhost\r\n'
+        'Connection: close\r\n\r\n'
+    ).encode()
+    try:
+        if slow_delay:
+            size = len(request) // SLOW_CHUNKS + 1
+            for start in range(0, len(request), size):
+                writer.write(request[start:start + size])
+                await writer.drain()
+                await asyncio.sleep(slow_delay / SLOW_CHUNKS)
+        else:
+            writer.write(request)
+            await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    return int(response.split(b' ', 2)[1])
+
+
+async def client(port, paths, deadline, slow_delay, timings, errors):
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            status = await fetch(port, random.choice(paths), slow_delay)
+        except (OSError, IndexError, ValueError):
+            status = None
+        if status != 200:
+            errors.append(status)
+            continue
+        timings.append((time.perf_counter() - started) * 1000)
+
+
+async def load(port, paths, args):
+    deadline = time.monotonic() + args.seconds
+    fast, slow, errors = [], [], []
+    await asyncio.gather(
+        *(client(port, paths, deadline, 0, fast, errors)
+          for _ in range(args.clients)),
+        *(client(port, paths, deadline, args.slow_delay, slow, errors)
+          for _ in range(args.slow_clients)),
+    )
+    return fast, slow, errors
+
+
+def percentile(values, share):
+    if not values:
+        return 0
+    return sorted(values)[min(len(values) - 1, int(len(values) * share))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--reviews-per-title', type=int, default=10)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--slow-clients', type=int, default=20)
+    parser.add_argument('--slow-delay', type=float, default=2)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--serve-wsgi', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve_wsgi:
+        serve_wsgi(args.serve_wsgi, args.threads)
+        return
+
+    db_path = setup_django()
+    from django.db import connection
+
+    from reviews.models import Review
+
+    seed(args.titles, args.reviews_per_title)
+    reviews = list(Review.objects.values_list('title_id', 'id')[:1000])
+    connection.close()
+    paths = []
+    for title_id, review_id in random.sample(reviews, min(len(reviews), 50)):
+        paths += [
+            f'/api/v1/titles/?page={title_id % 50 + 1}',
+            f'/api/v1/titles/{title_id}/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        ]
+
+    servers = ['WSGI']
+    if importlib.util.find_spec('uvicorn'):
+        servers.append('ASGI')
+    else:
+        print('uvicorn не установлен (pip install uvicorn): только WSGI')
+    print(
+        f'{args.threads} потоков, {args.clients} быстрых и '
+        f'{args.slow_clients} медленных клиентов, {args.seconds:g} с'
+    )
+    print(
+        f'{"сервер":<6} {"запр./с":>8} {"медиана":>8} {"p99, мс":>8} '
+        f'{"медленных":>10} {"ошибки":>7}'
+    )
+    for kind in servers:
+        process, port = start_server(kind, db_path, args.threads)
+        try:
+            fast, slow, errors = asyncio.run(load(port, paths, args))
+        finally:
+            process.terminate()
+            process.wait()
+        median = statistics.median(fast) if fast else 0
+        print(
+            f'{kind:<6} {len(fast) / args.seconds:>8.0f} {median:>8.1f} '
+            f'{percentile(fast, 0.99):>8.1f} {len(slow):>10} '
+            f'{len(errors):>7}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Общие функции для скриптов бенчмарков: Django на отдельной базе SQLite."""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT_DIR / 'api_yamdb'), str(ROOT_DIR)]
+
+
+def setup_django(db_path=None):
+    """
+    Настраивает Django на файл SQLite db_path (по умолчанию - временный)
+    и создаёт таблицы. Возвращает путь к базе.
+    """
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = db_path
+
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    return db_path
+
+
+def seed(title_count, reviews_per_title):
+    """Заполняет базу тем же набором данных, что и тесты производительности."""
+    from tests.fixtures.fixture_perf_data import seed_perf_dataset
+
+    started = time.perf_counter()
+    dataset = seed_perf_dataset(title_count, reviews_per_title)
+    print(
+        f'Набор данных: {title_count} произведений, '
+        f'{title_count * reviews_per_title} отзывов и комментариев '
+        f'за {time.perf_counter() - started:.1f} с'
+    )
+    return dataset
+
+
+def measure(func, repeats=5):
+    """Медиана времени выполнения func в миллисекундах."""
+    func()
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
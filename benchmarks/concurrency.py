@@ -0,0 +1,158 @@
+"""
+Параллельные чтение и запись в SQLite: журнал отката с настройками по
+умолчанию против WAL с прагмами из SQLITE_PRAGMAS.
+
+    python benchmarks/concurrency.py --readers 8 --writers 2 --seconds 5
+
+Каждый читатель и писатель - отдельный процесс со своим соединением,
+как воркеры gunicorn. Читатели выбирают страницу отзывов произведения,
+писатели добавляют комментарии. Ошибки "database is locked"
+считаются отдельно.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import time
+
+from common import seed, setup_django
+
+MODES = {
+    'журнал отката': {
+        'SQLITE_JOURNAL_MODE': 'delete',
+        'SQLITE_SYNCHRONOUS': 'full',
+        'SQLITE_BUSY_TIMEOUT': '5',
+    },
+    'WAL + прагмы': {},
+}
+
+
+def read(title_ids, user_ids, review_ids):
+    from reviews.models import Review
+
+    list(Review.objects.filter(
+        title_id=random.choice(title_ids)
+    ).select_related('author')[:20])
+
+
+def write(title_ids, user_ids, review_ids):
+    from django.db import transaction
+
+    from reviews.models import Comment
+
+    with transaction.atomic():
+        Comment.objects.create(
+            review_id=random.choice(review_ids),
+            author_id=random.choice(user_ids),
+            text='Комментарий из бенчмарка'
+        )
+
+
+def worker(role, db_path, env, seconds, ids, barrier, results):
+    os.environ.update(env, DB_NAME=db_path)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+    django.setup()
+    from django.db import OperationalError, connection
+
+    operation = read if role == 'read' else write
+    timings = []
+    errors = 0
+    # Замер начинается, когда все процессы запущены.
+    barrier.wait()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            operation(*ids)
+        except OperationalError:
+            errors += 1
+            continue
+        timings.append((time.perf_counter() - started) * 1000)
+    connection.close()
+    results.put((role, timings, errors))
+
+
+def percentile(values, share):
+    if not values:
+        return 0
+    return sorted(values)[min(len(values) - 1, int(len(values) * share))]
+
+
+def run(mode, env, source, args, ids):
+    db_path = f'{source}.{len(os.listdir(os.path.dirname(source)))}'
+    shutil.copyfile(source, db_path)
+    journal_mode = env.get('SQLITE_JOURNAL_MODE', 'wal')
+    with sqlite3.connect(db_path) as db:
+        db.execute(f'PRAGMA journal_mode = {journal_mode}')
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    roles = ['read'] * args.readers + ['write'] * args.writers
+    barrier = context.Barrier(len(roles))
+    processes = [
+        context.Process(
+            target=worker,
+            args=(role, db_path, env, args.seconds, ids, barrier, results)
+        )
+        for role in roles
+    ]
+    for process in processes:
+        process.start()
+    totals = {'read': ([], 0), 'write': ([], 0)}
+    for _ in processes:
+        role, timings, errors = results.get()
+        role_timings, role_errors = totals[role]
+        totals[role] = (role_timings + timings, role_errors + errors)
+    for process in processes:
+        process.join()
+
+    for role, (timings, errors) in totals.items():
+        median = statistics.median(timings) if timings else 0
+        print(
+            f'{mode:<15} {role:<6} {len(timings) / args.seconds:>9.0f} '
+            f'{median:>9.2f} {percentile(timings, 0.99):>9.2f} '
+            f'{errors:>7}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--reviews-per-title', type=int, default=10)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    source = setup_django()
+    from django.db import connection
+
+    from reviews.models import Review, Title, User
+
+    seed(args.titles, args.reviews_per_title)
+    ids = tuple(
+        list(model.objects.values_list('id', flat=True))
+        for model in (Title, User, Review)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    connection.close()
+
+    print(
+        f'{args.readers} читателей, {args.writers} писателей, '
+        f'{args.seconds:g} с'
+    )
+    print(
+        f'{"режим":<15} {"роль":<6} {"опер./с":>9} {"медиана":>9} '
+        f'{"p99, мс":>9} {"ошибки":>7}'
+    )
+    for mode, env in MODES.items():
+        run(mode, env, source, args, ids)
+
+
+if __name__ == '__main__':
+    main()
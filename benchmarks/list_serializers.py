@@ -0,0 +1,90 @@
+"""
+Страницы списков из 1000 объектов: ModelSerializer против сериализаторов
+по строкам values() (api.serializers.ValuesSerializer).
+
+    python benchmarks/list_serializers.py --page-size 1000
+
+Замеряются запрос страницы и построение данных ответа, без рендеринга:
+произведения (TitleSerializer), отзывы одного произведения
+и комментарии одного отзыва.
+"""
+import argparse
+
+from common import measure, seed, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.utils import timezone
+
+    from api.serializers import (
+        CommentSerializer, CommentValuesSerializer, ReviewSerializer,
+        ReviewValuesSerializer, TitleSerializer, TitleValuesSerializer
+    )
+    from api.views import TitleViewSet
+    from reviews.models import Comment, GenreTitle, Review, Title
+
+    # Одно произведение с page_size отзывами, остальные - без отзывов.
+    dataset = seed(1, args.page_size)
+    title = Title.objects.get(pk=dataset['title_id'])
+    Title.objects.bulk_create(
+        Title(
+            name=f'Ещё произведение {idx:04}', year=2000,
+            category_id=title.category_id
+        ) for idx in range(args.page_size - 1)
+    )
+    genre_ids = list(title.genre.values_list('id', flat=True))
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title_id=pk, genre_id=genre_id)
+        for pk in Title.objects.exclude(pk=title.pk).values_list(
+            'pk', flat=True
+        )
+        for genre_id in genre_ids
+    )
+    review = Review.objects.get(pk=dataset['review_id'])
+    Comment.objects.bulk_create(
+        Comment(
+            review=review, author_id=review.author_id,
+            text=f'Ещё комментарий {idx}', pub_date=timezone.now()
+        ) for idx in range(args.page_size - 1)
+    )
+    reviews = Review.objects.filter(title=title).select_related('author')
+    comments = Comment.objects.filter(review=review).select_related('author')
+    cases = (
+        ('произведения', TitleViewSet.queryset, TitleSerializer,
+         TitleValuesSerializer),
+        ('отзывы', reviews, ReviewSerializer, ReviewValuesSerializer),
+        ('комментарии', comments, CommentSerializer,
+         CommentValuesSerializer),
+    )
+    print(f'Страница: {args.page_size} объектов')
+    print(f'{"список":<14} {"ModelSerializer":>16} {"values()":>10} '
+          f'{"ускорение":>10}')
+    for name, queryset, serializer_class, values_class in cases:
+        page = slice(0, args.page_size)
+
+        def model_path():
+            return serializer_class(
+                list(queryset[page]), many=True, context={}
+            ).data
+
+        def values_path():
+            serializer = values_class(context={})
+            return serializer.to_representation(
+                serializer.get_values(queryset)[page]
+            )
+
+        assert [dict(item) for item in model_path()] == values_path()
+        model_ms = measure(model_path, args.repeats)
+        values_ms = measure(values_path, args.repeats)
+        print(f'{name:<14} {model_ms:>13.1f} мс {values_ms:>7.1f} мс '
+              f'{model_ms / values_ms:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Планы и время запросов каталога до и после составных индексов.
+
+    python benchmarks/query_plans.py --titles 20000 --reviews-per-title 10
+
+Индексы из Meta.indexes сначала удаляются ("до"), затем создаются
+заново ("после"); для каждого запроса выводится EXPLAIN QUERY PLAN.
+"""
+import argparse
+
+from common import measure, seed, setup_django
+
+
+def get_queries(dataset):
+    from reviews.models import Comment, Review, Title
+
+    title_id = dataset['title_id']
+    last_review = Review.objects.filter(title_id=title_id).order_by(
+        'pub_date', 'id'
+    )[4]
+    return {
+        'titles ORDER BY name': Title.objects.order_by('name')[:5],
+        'titles WHERE category ORDER BY name': Title.objects.filter(
+            category__slug=dataset['slug']
+        ).order_by('name')[:5],
+        'titles WHERE genre ORDER BY name': Title.objects.filter(
+            genre__slug=dataset['genre']
+        ).order_by('name')[:5],
+        'titles WHERE year ORDER BY name': Title.objects.filter(
+            year=1950
+        ).order_by('name')[:5],
+        'reviews WHERE title ORDER BY pub_date': Review.objects.filter(
+            title_id=title_id
+        ).order_by('pub_date', 'id')[:5],
+        'reviews keyset page': Review.objects.filter(
+            title_id=title_id, pub_date__gt=last_review.pub_date
+        ).order_by('pub_date', 'id')[:5],
+        'comments WHERE review ORDER BY pub_date': Comment.objects.filter(
+            review_id=dataset['review_id']
+        ).order_by('pub_date', 'id')[:5],
+    }
+
+
+def get_indexes():
+    from reviews.models import Comment, GenreTitle, Review, Title
+
+    return [
+        (model, index)
+        for model in (Title, GenreTitle, Review, Comment)
+        for index in model._meta.indexes
+    ]
+
+
+def run(dataset, repeats):
+    results = {}
+    for name, queryset in get_queries(dataset).items():
+        results[name] = (
+            queryset.explain(),
+            measure(lambda: list(queryset.all()), repeats),
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--reviews-per-title', type=int, default=10)
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--db', help='Файл SQLite (по умолчанию временный).')
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.db import connection
+
+    dataset = seed(args.titles, args.reviews_per_title)
+    indexes = get_indexes()
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.remove_index(model, index)
+    connection.cursor().execute('ANALYZE')
+    before = run(dataset, args.repeats)
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.add_index(model, index)
+    connection.cursor().execute('ANALYZE')
+    after = run(dataset, args.repeats)
+
+    for name in before:
+        (plan_before, ms_before), (plan_after, ms_after) = (
+            before[name], after[name]
+        )
+        print(f'\n== {name}: {ms_before:.2f} мс -> {ms_after:.2f} мс')
+        print('  до:\n    ' + plan_before.replace('\n', '\n    '))
+        print('  после:\n    ' + plan_after.replace('\n', '\n    '))
+
+
+if __name__ == '__main__':
+    main()
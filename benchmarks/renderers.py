@@ -0,0 +1,62 @@
+"""
+Рендеринг страниц произведений (TitleSerializer) в JSON: JSONRenderer
+DRF против FastJSONRenderer с orjson (без orjson он сам вызывает JSONRenderer).
+
+    python benchmarks/renderers.py --titles 2000 --page-sizes 5 100 1000
+
+Данные сериализуются один раз, замеряется только рендеринг.
+"""
+import argparse
+
+from common import measure, seed, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--reviews-per-title', type=int, default=1)
+    parser.add_argument(
+        '--page-sizes', type=int, nargs='+', default=[5, 100, 1000]
+    )
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import override_settings
+    from rest_framework.renderers import JSONRenderer
+
+    from api import renderers
+    from api.serializers import TitleSerializer
+    from api.views import TitleViewSet
+
+    seed(args.titles, args.reviews_per_title)
+    candidates = [('JSONRenderer', 'json', JSONRenderer)]
+    if renderers.orjson:
+        candidates.append(
+            ('FastJSONRenderer', 'orjson', renderers.FastJSONRenderer)
+        )
+    else:
+        print('orjson не установлен (pip install orjson)')
+
+    print(f'{"рендерер":<17} {"кодировщик":<10} {"размер":>7} '
+          f'{"мс":>8} {"КБ":>8}')
+    for page_size in args.page_sizes:
+        titles = TitleViewSet.queryset.all()[:page_size]
+        data = {
+            'count': args.titles, 'next': None, 'previous': None,
+            'results': TitleSerializer(titles, many=True).data,
+        }
+        for name, encoder, renderer_class in candidates:
+            renderer = renderer_class()
+            with override_settings(JSON_ENCODER=encoder):
+                content = renderer.render(data, 'application/json')
+                median = measure(
+                    lambda: renderer.render(data, 'application/json'),
+                    args.repeats
+                )
+            print(f'{name:<17} {encoder:<10} {page_size:>7} '
+                  f'{median:>8.3f} {len(content) / 1024:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Задержка полнотекстового поиска: FTS5, таблица токенов и icontains.
+
+    python benchmarks/search.py --titles 100000 --reviews-per-title 10
+
+По умолчанию - 1 000 000 отзывов. Для каждого бэкенда индекс строится
+заново, затем замеряются запросы с редким и частым словом.
+"""
+import argparse
+import time
+
+from common import measure, seed, setup_django
+
+QUERIES = {
+    'редкое слово (название)': '000123',
+    'два слова (название)': 'произведение 000123',
+    'частое слово (все отзывы)': 'отзыв',
+}
+
+
+def icontains_search(query):
+    from django.db.models import Q
+
+    from reviews.models import Title
+
+    return list(Title.objects.filter(
+        Q(name__icontains=query)
+        | Q(description__icontains=query)
+        | Q(reviews__text__icontains=query)
+    ).distinct().values_list('id', flat=True)[:1000])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=100000)
+    parser.add_argument('--reviews-per-title', type=int, default=10)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--db', help='Файл SQLite (по умолчанию временный).')
+    parser.add_argument(
+        '--skip-icontains', action='store_true',
+        help='Не замерять поиск через icontains (на больших данных долго).'
+    )
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.db import transaction
+
+    from reviews import search
+
+    seed(args.titles, args.reviews_per_title)
+    results = {}
+    for name, backend_class in (
+        ('fts5', search.FTS5Backend), ('table', search.TokenTableBackend)
+    ):
+        backend = backend_class('default')
+        started = time.perf_counter()
+        with transaction.atomic():
+            backend.create_table()
+            documents = backend.rebuild()
+        print(
+            f'{name}: индекс из {documents} документов за '
+            f'{time.perf_counter() - started:.1f} с'
+        )
+        for label, query in QUERIES.items():
+            results[label, name] = measure(
+                lambda: backend.search(query, 1000), args.repeats
+            )
+        backend.clear()
+    if not args.skip_icontains:
+        for label, query in QUERIES.items():
+            results[label, 'icontains'] = measure(
+                lambda: icontains_search(query), args.repeats
+            )
+
+    print(f'\n{"запрос":<30}{"бэкенд":<12}{"мс":>10}')
+    for (label, name), ms in results.items():
+        print(f'{label:<30}{name:<12}{ms:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
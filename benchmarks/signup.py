@@ -0,0 +1,126 @@
+"""
+Повторная регистрация: запросы к /api/v1/auth/signup/ с данными уже
+зарегистрированных пользователей (повторный запрос кода), с занятым
+логином или почтой и с новыми данными.
+
+    python benchmarks/signup.py --users 10000 --requests 300
+
+Сравниваются прежний путь (get_or_create, при IntegrityError - ещё два
+exists()) и поиск конфликтов одним запросом. Ограничение частоты
+отключено, письма только ставятся в очередь.
+"""
+import argparse
+import logging
+import statistics
+import time
+
+from common import setup_django
+
+
+def legacy_create(self, validated_data):
+    """Прежняя реализация UserRegistrationSerializer.create."""
+    from django.db import IntegrityError
+    from rest_framework.exceptions import ValidationError
+
+    from users.models import User
+
+    username = validated_data['username']
+    email = validated_data['email']
+    try:
+        user, created = User.objects.get_or_create(
+            username=username, email=email
+        )
+    except IntegrityError:
+        if User.objects.filter(username=username).exists():
+            raise ValidationError({'username': ['Этот логин уже занят']})
+        if User.objects.filter(email=email).exists():
+            raise ValidationError(
+                {'email': ['Этот адрес эл.почты уже занят']}
+            )
+    return user
+
+
+SCENARIOS = {
+    'повторный запрос кода': lambda idx, run: (
+        f'user{idx}', f'user{idx}@yamdb.fake'
+    ),
+    'занят логин': lambda idx, run: (
+        f'user{idx}', f'{run}-other{idx}@yamdb.fake'
+    ),
+    'занята почта': lambda idx, run: (
+        f'{run}_other{idx}', f'user{idx}@yamdb.fake'
+    ),
+    'новый пользователь': lambda idx, run: (
+        f'{run}_new{idx}', f'{run}-new{idx}@yamdb.fake'
+    ),
+}
+
+
+def run_scenario(client, make_data, run, count, users):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings = []
+    queries = []
+    for idx in range(count):
+        username, email = make_data(idx * users // count, run)
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            client.post('/api/v1/auth/signup/', data={
+                'username': username, 'email': email
+            })
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(context))
+    return statistics.median(timings), statistics.mean(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=300)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+
+    from api.serializers import UserRegistrationSerializer
+    from users.models import User
+
+    override_settings(
+        EMAIL_OUTBOX_DELIVERY='worker',
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}
+        },
+    ).enable()
+    # Ответы 400 иначе попадают в лог django.request.
+    logging.disable(logging.WARNING)
+    User.objects.bulk_create(
+        (
+            User(username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+            for idx in range(args.users)
+        ),
+        batch_size=2000
+    )
+    print(f'Пользователей: {args.users}, запросов на сценарий: '
+          f'{args.requests}')
+    print(f'{"сценарий":<24} {"реализация":<12} {"мс":>7} {"запросов":>9}')
+    client = APIClient()
+    current_create = UserRegistrationSerializer.create
+    for run, (name, create) in enumerate((
+        ('прежняя', legacy_create), ('один запрос', current_create)
+    )):
+        UserRegistrationSerializer.create = create
+        for scenario, make_data in SCENARIOS.items():
+            median, queries = run_scenario(
+                client, make_data, f'r{run}', args.requests, args.users
+            )
+            print(
+                f'{scenario:<24} {name:<12} {median:>7.2f} {queries:>9.1f}'
+            )
+    UserRegistrationSerializer.create = current_create
+
+
+if __name__ == '__main__':
+    main()
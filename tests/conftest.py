@@ -1,8 +1,12 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
+from api import dictionaries, throttling
+from api.cache import get_cache, reset_stats
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
 
@@ -32,4 +36,21 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_perf_data',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_api_cache():
+    get_cache().clear()
+    # Таблицы очищаются между тестами без сигналов.
+    for dictionary in dictionaries.DICTIONARIES.values():
+        dictionary.snapshot = None
+    throttling.get_store().clear()
+    throttling.reset_stats()
+    reset_stats()
+
+
+@pytest.fixture(autouse=True)
+def deliver_emails_immediately(settings):
+    settings.EMAIL_OUTBOX_DELIVERY = 'immediate'
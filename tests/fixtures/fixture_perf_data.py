@@ -0,0 +1,149 @@
+import os
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+
+User = get_user_model()
+
+# Масштаб набора данных: 100 произведений, 1000 отзывов и 1000 комментариев
+# на единицу. Для замеров на больших объёмах задайте, например,
+# YAMDB_PERF_SCALE=100 (10 000 произведений, 100 000 отзывов).
+PERF_SCALE = int(os.environ.get('YAMDB_PERF_SCALE', 1))
+TITLES_PER_SCALE = 100
+REVIEWS_PER_TITLE = 10
+CATEGORY_COUNT = 10
+GENRE_COUNT = 20
+BATCH_SIZE = 2000
+
+
+def next_id(model):
+    return (model.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+
+
+def seed_perf_dataset(title_count=TITLES_PER_SCALE * PERF_SCALE,
+                      reviews_per_title=REVIEWS_PER_TITLE):
+    """Заполняет базу детерминированным набором данных через bulk_create."""
+    category_start = next_id(Category)
+    categories = Category.objects.bulk_create(
+        Category(
+            id=category_start + idx,
+            name=f'Категория {idx:03}',
+            slug=f'perf-category-{idx}'
+        ) for idx in range(CATEGORY_COUNT)
+    )
+    genre_start = next_id(Genre)
+    genres = Genre.objects.bulk_create(
+        Genre(
+            id=genre_start + idx,
+            name=f'Жанр {idx:03}',
+            slug=f'perf-genre-{idx}'
+        ) for idx in range(GENRE_COUNT)
+    )
+    user_start = next_id(User)
+    authors = User.objects.bulk_create(
+        User(
+            id=user_start + idx,
+            username=f'perf_author_{idx}',
+            email=f'perf_author_{idx}@yamdb.fake'
+        ) for idx in range(reviews_per_title)
+    )
+    admin = User.objects.create_user(
+        username='perf_admin', email='perf_admin@yamdb.fake', role='admin'
+    )
+
+    scores = [idx % 10 + 1 for idx in range(reviews_per_title)]
+    title_start = next_id(Title)
+    Title.objects.bulk_create(
+        (
+            Title(
+                id=title_start + idx,
+                name=f'Произведение {idx:06}',
+                year=1900 + idx % 120,
+                description=f'Описание произведения {idx}',
+                category=categories[idx % CATEGORY_COUNT],
+                rating_sum=sum(scores),
+                rating_count=len(scores),
+                rating=sum(scores) / len(scores),
+            ) for idx in range(title_count)
+        ),
+        batch_size=BATCH_SIZE
+    )
+    GenreTitle.objects.bulk_create(
+        (
+            GenreTitle(
+                title_id=title_start + idx,
+                genre=genres[(idx + shift) % GENRE_COUNT]
+            ) for idx in range(title_count) for shift in (0, 1)
+        ),
+        batch_size=BATCH_SIZE
+    )
+    pub_date = timezone.now() - timedelta(days=1)
+    review_start = next_id(Review)
+    Review.objects.bulk_create(
+        (
+            Review(
+                id=review_start + idx * reviews_per_title + num,
+                title_id=title_start + idx,
+                author=author,
+                text=f'Отзыв {num} на произведение {idx}',
+                score=scores[num],
+                pub_date=pub_date + timedelta(seconds=num),
+            )
+            for idx in range(title_count)
+            for num, author in enumerate(authors)
+        ),
+        batch_size=BATCH_SIZE
+    )
+    comment_start = next_id(Comment)
+    Comment.objects.bulk_create(
+        (
+            Comment(
+                id=comment_start + idx,
+                review_id=review_start + idx,
+                author=authors[idx % reviews_per_title],
+                text=f'Комментарий к отзыву {idx}',
+                pub_date=pub_date,
+            ) for idx in range(title_count * reviews_per_title)
+        ),
+        batch_size=BATCH_SIZE
+    )
+    call_command('rebuild_search_index', stdout=StringIO())
+    call_command('rebuild_leaderboards', stdout=StringIO())
+    return {
+        'admin': admin,
+        'username': authors[0].username,
+        'slug': categories[0].slug,
+        'title_id': title_start,
+        'review_id': review_start,
+        'comment_id': comment_start,
+        'genre': genres[0].slug,
+    }
+
+
+@pytest.fixture(scope='module')
+def perf_dataset(request, django_db_setup, django_db_blocker):
+    scale = getattr(request, 'param', PERF_SCALE)
+    with django_db_blocker.unblock():
+        dataset = seed_perf_dataset(TITLES_PER_SCALE * scale)
+    yield dataset
+    with django_db_blocker.unblock():
+        for model in (Comment, Review, GenreTitle, Title, Category, Genre,
+                      User):
+            model.objects.all().delete()
+
+
+@pytest.fixture
+def perf_admin_client(perf_dataset):
+    client = APIClient()
+    token = AccessToken.for_user(perf_dataset['admin'])
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
@@ -375,3 +375,24 @@ class Test00UserRegistration:
             'пользователя, созданного администратором,  возвращает ответ '
             'со статусом 200.'
         )
+
+    def test_signup_conflicts_resolved_in_one_query(
+            self, client, django_assert_num_queries
+    ):
+        for idx in (1, 2):
+            client.post(self.URL_SIGNUP, data={
+                'email': f'user{idx}@yamdb.fake', 'username': f'user{idx}'
+            })
+        # Транзакция и один SELECT пользователей.
+        with django_assert_num_queries(2):
+            response = client.post(self.URL_SIGNUP, data={
+                'email': 'user2@yamdb.fake', 'username': 'user1'
+            })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'username': ['Этот логин уже занят'],
+            'email': ['Этот адрес эл.почты уже занят'],
+        }, (
+            'Проверьте, что при занятых логине и почте в ответе '
+            'перечислены оба поля.'
+        )
@@ -1,6 +1,8 @@
 from http import HTTPStatus
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from tests.utils import (
     check_pagination, check_permissions, create_categories, create_genre,
@@ -353,3 +355,68 @@ class Test04TitleAPI:
             f'Проверьте, что PUT-запрос к `{self.TITLES_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_07_titles_list_query_count(self, client, admin_client,
+                                        django_assert_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        # Версии справочников, COUNT для пагинации, произведения
+        # с категориями, жанры.
+        expected_queries = 4
+        with django_assert_num_queries(expected_queries):
+            client.get(self.TITLES_URL)
+
+        for idx in range(6):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[idx % 2]['slug'],
+            })
+        for url in (self.TITLES_URL, f'{self.TITLES_URL}?page=2'):
+            with django_assert_num_queries(expected_queries):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+        with django_assert_num_queries(3):
+            client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                )
+            )
+
+    def test_08_title_genres_resolved_in_one_query(self, admin_client):
+        categories = create_categories(admin_client)
+        slugs = [f'genre-{idx}' for idx in range(10)]
+        for slug in slugs:
+            admin_client.post('/api/v1/genres/', data={
+                'name': slug, 'slug': slug
+            })
+
+        query_counts = []
+        # Первый запрос загружает справочники в память процесса.
+        for idx, genre_count in enumerate((1, 1, len(slugs))):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(self.TITLES_URL, data={
+                    'name': f'Произведение {idx}',
+                    'year': 2000,
+                    'genre': slugs[:genre_count],
+                    'category': categories[0]['slug'],
+                })
+            assert response.status_code == HTTPStatus.CREATED
+            query_counts.append(len(context))
+        assert query_counts[1] == query_counts[2], (
+            'Проверьте, что жанры произведения ищутся одним запросом '
+            'независимо от их количества.'
+        )
+
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Произведение',
+            'year': 2000,
+            'genre': [slugs[0], 'unknown', 'missing'],
+            'category': categories[0]['slug'],
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        message = str(response.json().get('genre'))
+        assert 'unknown' in message and 'missing' in message, (
+            'Проверьте, что в ошибке перечислены все несуществующие '
+            'жанры сразу.'
+        )
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, client, admin_client,
+                                              admin, user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется при создании '
+            'отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 9}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения обновляется при изменении '
+            'оценки в отзыве.'
+        )
+
+        for review in reviews:
+            response = admin_client.delete(
+                self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                    title_id=title_id, review_id=review['id']
+                )
+            )
+            assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что после удаления всех отзывов рейтинг произведения '
+            'равен `None`.'
+        )
+
+    def test_02_recalculate_ratings_command(self, client, admin_client,
+                                            admin, user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+
+        call_command('recalculate_ratings')
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (10, 2)
+        assert self.get_rating(client, titles[0]['id']) == 5, (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'рейтинг произведения по отзывам.'
+        )
+        assert self.get_rating(client, titles[1]['id']) is None
+
+    def test_03_rating_follows_other_deletes(self, client, admin_client,
+                                             admin, user_client, user,
+                                             moderator_client, moderator):
+        author_map = {
+            admin: admin_client, user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        Review.objects.filter(pk=reviews[0]['id']).update(score=4)
+        review = Review.objects.get(pk=reviews[1]['id'])
+        review.score = 10
+        review.save()
+        title = Title.objects.get(pk=title_id)
+        title.recalculate_rating()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (19, 3)
+
+        response = admin_client.delete(f'/api/v1/users/{admin.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (15, 2), (
+            'Проверьте, что удаление автора вместе с отзывами обновляет '
+            'рейтинг произведения.'
+        )
+        assert title.rating == 7.5
+
+        Review.objects.filter(author=moderator).delete()
+        assert self.get_rating(client, title_id) == 10, (
+            'Проверьте, что удаление отзывов QuerySet обновляет рейтинг.'
+        )
@@ -0,0 +1,102 @@
+import json
+import os
+import statistics
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.cache import get_cache
+from api.urls import router_v1
+from tests.fixtures.fixture_perf_data import PERF_SCALE
+
+BUDGETS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'performance_budgets.json'
+)
+with open(BUDGETS_PATH, encoding='utf-8') as budgets_file:
+    BUDGETS_DATA = json.load(budgets_file)
+BUDGETS = BUDGETS_DATA['routes']
+# Масштаб данных, для которого заданы бюджеты. Обычный прогон идёт на
+# YAMDB_PERF_SCALE, прогон на масштабе бюджетов помечен `slow`:
+# pytest -m slow tests/test_09_performance.py
+BUDGETS_SCALE = BUDGETS_DATA['scale']
+SCALES = [PERF_SCALE] + (
+    [pytest.param(BUDGETS_SCALE, marks=pytest.mark.slow)]
+    if BUDGETS_SCALE != PERF_SCALE else []
+)
+
+# Во сколько раз можно превысить бюджет времени: замеры на общих
+# CI-машинах шумные, поэтому по умолчанию допускаем запас.
+TIME_TOLERANCE = float(os.environ.get('YAMDB_PERF_TIME_TOLERANCE', 3))
+REPEATS = 5
+REPORT_PATH = os.environ.get('YAMDB_PERF_REPORT')
+measurements = {}
+
+
+def measure(client, url):
+    """Замеряет ответ без кэша API: бюджеты относятся к холодному пути."""
+    client.get(url)
+    timings = []
+    for _ in range(REPEATS):
+        get_cache().clear()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'status': response.status_code,
+        'queries': len(queries),
+        'ms': round(statistics.median(timings), 2),
+        'bytes': len(response.content),
+    }
+
+
+@pytest.fixture(scope='module', autouse=True)
+def performance_report():
+    yield
+    if REPORT_PATH:
+        with open(REPORT_PATH, 'w', encoding='utf-8') as report:
+            json.dump(measurements, report, indent=4, sort_keys=True)
+
+
+def test_00_every_route_has_budget():
+    budgeted_routes = {budget['route'] for budget in BUDGETS.values()}
+    missing = {url.name for url in router_v1.urls} - budgeted_routes
+    assert not missing, (
+        'Для маршрутов router_v1 не заданы бюджеты в '
+        f'`performance_budgets.json`: {", ".join(sorted(missing))}.'
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', sorted(BUDGETS))
+@pytest.mark.parametrize(
+    'perf_dataset', SCALES, indirect=True, ids=lambda scale: f'x{scale}'
+)
+def test_01_endpoint_budget(name, perf_dataset, perf_admin_client):
+    budget = BUDGETS[name]
+    client = (
+        perf_admin_client if budget['auth'] == 'admin' else APIClient()
+    )
+    url = budget['url'].format(**perf_dataset)
+    result = measure(client, url)
+    measurements[name] = dict(result, url=url)
+
+    assert result['status'] == budget['status'], (
+        f'GET-запрос к `{url}` вернул статус {result["status"]}, '
+        f'ожидался {budget["status"]}.'
+    )
+    assert result['queries'] <= budget['max_queries'], (
+        f'GET-запрос к `{url}` выполняет {result["queries"]} SQL-запросов, '
+        f'бюджет - {budget["max_queries"]}.'
+    )
+    assert result['bytes'] <= budget['max_bytes'], (
+        f'Ответ на GET-запрос к `{url}` занимает {result["bytes"]} байт, '
+        f'бюджет - {budget["max_bytes"]}.'
+    )
+    assert result['ms'] <= budget['max_ms'] * TIME_TOLERANCE, (
+        f'GET-запрос к `{url}` выполняется {result["ms"]} мс, '
+        f'бюджет - {budget["max_ms"]} мс.'
+    )
@@ -0,0 +1,55 @@
+import csv
+import os
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+
+from reviews.models import Comment, Genre, GenreTitle, Review, Title
+from tests.conftest import MANAGE_PATH
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+User = get_user_model()
+
+
+def count_rows(name):
+    with open(os.path.join(DATA_DIR, f'{name}.csv'), encoding='utf-8') as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+
+@pytest.mark.django_db
+class Test10LoadData:
+
+    def test_01_load_all_files(self):
+        call_command('load_data', batch_size=7, stdout=StringIO())
+
+        for name, model in (
+            ('users', User), ('genre', Genre), ('titles', Title),
+            ('genre_title', GenreTitle), ('review', Review),
+            ('comments', Comment),
+        ):
+            assert model.objects.count() == count_rows(name), (
+                f'Проверьте, что команда `load_data` загружает все строки '
+                f'файла `{name}.csv`.'
+            )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что команда `load_data` сохраняет дату публикации '
+            'из CSV-файла.'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        assert title.rating_count == title.reviews.count(), (
+            'Проверьте, что после загрузки отзывов пересчитываются рейтинги.'
+        )
+
+    def test_02_reload_conflicts(self):
+        output = StringIO()
+        call_command('load_data', stdout=output)
+        with pytest.raises(CommandError):
+            call_command('load_data', only=['genre'], stdout=output)
+        call_command(
+            'load_data', only=['genre'], ignore_conflicts=True,
+            stdout=output
+        )
+        assert Genre.objects.count() == count_rows('genre')
@@ -0,0 +1,75 @@
+import csv
+import json
+import os
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.conftest import MANAGE_PATH
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def read_data_file(name):
+    with open(os.path.join(DATA_DIR, f'{name}.csv'), encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+@pytest.mark.django_db
+class Test11Export:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/export/{name}.{file_format}'
+
+    @pytest.fixture(autouse=True)
+    def load_data(self):
+        call_command('load_data', stdout=StringIO())
+
+    def test_01_export_permissions(self, client, user_client):
+        url = self.EXPORT_URL_TEMPLATE.format(name='review', file_format='csv')
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{url}` возвращает ответ со статусом 401.'
+        )
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что GET-запрос пользователя с ролью `user` к '
+            f'`{url}` возвращает ответ со статусом 403.'
+        )
+
+    def test_02_export_csv_layout(self, admin_client):
+        for name in ('titles', 'review', 'comments'):
+            url = self.EXPORT_URL_TEMPLATE.format(name=name, file_format='csv')
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.streaming, (
+                f'Проверьте, что ответ на GET-запрос к `{url}` '
+                'отдаётся потоково.'
+            )
+            content = b''.join(response.streaming_content).decode()
+            exported = list(csv.reader(StringIO(content)))
+            expected = read_data_file(name)
+            assert exported[0] == expected[0], (
+                f'Проверьте, что выгрузка `{name}` повторяет колонки файла '
+                f'`{name}.csv`.'
+            )
+            assert len(exported) == len(expected)
+        response = admin_client.get(
+            self.EXPORT_URL_TEMPLATE.format(name='unknown', file_format='csv')
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_export_command_jsonl(self, tmp_path):
+        call_command(
+            'export_data', output_dir=tmp_path, file_format='jsonl',
+            only=['review'], chunk_size=10, stdout=StringIO()
+        )
+        with open(tmp_path / 'review.jsonl', encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+        expected = read_data_file('review')
+        assert len(rows) == len(expected) - 1
+        assert list(rows[0]) == expected[0]
+        assert rows[0]['pub_date'] == expected[1][-1], (
+            'Проверьте, что даты в выгрузке совпадают с форматом '
+            'файлов static/data.'
+        )
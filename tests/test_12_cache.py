@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.db.models.deletion import Collector
+from django.test import override_settings
+
+from reviews.models import GenreTitle, LeaderboardEntry, SearchToken
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    CATEGORIES_URL = '/api/v1/categories/'
+    GENRES_URL = '/api/v1/genres/'
+    STATS_URL = '/api/v1/cache/stats/'
+
+    def test_01_repeated_get_is_served_from_cache(
+            self, client, admin_client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        for url in (
+            self.TITLES_URL, self.CATEGORIES_URL, self.GENRES_URL,
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
+        ):
+            first = client.get(url)
+            with django_assert_num_queries(0):
+                second = client.get(url)
+            assert second.status_code == HTTPStatus.OK
+            assert second.json() == first.json(), (
+                f'Проверьте, что закэшированный ответ на GET-запрос к '
+                f'`{url}` совпадает с исходным.'
+            )
+
+    def test_02_writes_invalidate_cache(self, client, admin_client,
+                                        user_client):
+        titles, _, genres = create_titles(admin_client)
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        client.get(self.TITLES_URL)
+        client.get(title_url)
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 8)
+        assert client.get(title_url).json()['rating'] == 8, (
+            'Проверьте, что после создания отзыва кэш произведения '
+            'сбрасывается.'
+        )
+
+        admin_client.patch(title_url, data={'genre': [genres[2]['slug']]})
+        data = client.get(self.TITLES_URL).json()
+        title = next(
+            item for item in data['results'] if item['id'] == titles[0]['id']
+        )
+        assert [genre['slug'] for genre in title['genre']] == [
+            genres[2]['slug']
+        ]
+
+        client.get(self.CATEGORIES_URL)
+        admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        assert client.get(self.CATEGORIES_URL).json()['count'] == 3, (
+            'Проверьте, что создание категории сбрасывает кэш категорий.'
+        )
+
+    def test_03_cache_stats(self, client, admin_client, user_client):
+        assert client.get(self.STATS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.STATS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        client.get(self.GENRES_URL)
+        client.get(self.GENRES_URL)
+        client.get(f'{self.GENRES_URL}?search=x')
+        response = admin_client.get(self.STATS_URL)
+        assert response.status_code == HTTPStatus.OK
+        stats = response.json()['genres']
+        assert (stats['hits'], stats['misses']) == (1, 2)
+
+    def test_04_file_based_backend(self, client, admin_client, tmp_path,
+                                   django_assert_num_queries):
+        file_cache = {
+            **settings.CACHES,
+            'api': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': str(tmp_path),
+            },
+        }
+        with override_settings(CACHES=file_cache):
+            create_titles(admin_client)
+            client.get(self.TITLES_URL)
+            with django_assert_num_queries(0):
+                response = client.get(self.TITLES_URL)
+            assert response.json()['count'] == 2
+            assert any(tmp_path.iterdir()), (
+                'Проверьте, что ответы сохраняются в файловый кэш.'
+            )
+
+    def test_05_fast_delete_not_disabled(self):
+        for model in (SearchToken, LeaderboardEntry, GenreTitle):
+            collector = Collector(using='default')
+            assert collector.can_fast_delete(model.objects.all()), (
+                'Проверьте, что сброс кэша подключён к сигналам только '
+                f'нужных моделей: удаление {model.__name__} должно '
+                'выполняться одним DELETE.'
+            )
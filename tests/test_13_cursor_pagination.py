@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13CursorPagination:
+
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_cursor_pages(self, client, admin_client, admin, user_client,
+                             user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        created = [
+            create_single_comment(
+                user_client, titles[0]['id'], reviews[0]['id'], f'c{idx}'
+            ).json()['id']
+            for idx in range(12)
+        ]
+
+        response = client.get(url)
+        assert 'count' in response.json(), (
+            'Проверьте, что по умолчанию используется постраничная '
+            'пагинация.'
+        )
+
+        received = []
+        next_url = f'{url}?pagination=cursor'
+        while next_url:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(next_url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data
+            assert not any(
+                'COUNT(' in query['sql'] for query in queries
+            ), 'Пагинация по курсору не должна выполнять COUNT-запрос.'
+            received.extend(item['id'] for item in data['results'])
+            last_page = data
+            next_url = data['next']
+        assert received == created, (
+            'Проверьте, что пагинация по курсору возвращает все комментарии '
+            'в порядке (pub_date, id).'
+        )
+
+        previous = client.get(last_page['previous']).json()
+        assert [item['id'] for item in previous['results']] == created[5:10]
+        assert previous['next'] and previous['previous']
+
+    def test_02_invalid_cursor(self, client, admin_client, admin,
+                               user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = '/api/v1/titles/{title_id}/reviews/?cursor=broken'.format(
+            title_id=titles[0]['id']
+        )
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,107 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+from users.outbox import deliver_pending
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, idx):
+        data = {'email': f'user{idx}@yamdb.fake', 'username': f'user{idx}'}
+        response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+        return data
+
+    def test_01_signup_is_queued(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        data = self.signup(client, 1)
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо в запросе, '
+            'а только ставит его в очередь.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == data['email'] and email.sent_at is None
+
+        call_command('send_emails', once=True, stdout=StringIO())
+        assert [message.to for message in mail.outbox] == [[data['email']]]
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 1
+        assert email.message == '', (
+            'Проверьте, что текст отправленного письма с кодом '
+            'подтверждения не хранится в базе.'
+        )
+
+    def test_02_batch_uses_one_connection(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        settings.EMAIL_BACKEND = f'{__name__}.CountingBackend'
+        for idx in range(5):
+            self.signup(client, idx)
+        CountingBackend.opened = 0
+
+        assert deliver_pending() == (5, 0)
+        assert len(mail.outbox) == 5
+        assert CountingBackend.opened == 1, (
+            'Проверьте, что пачка писем отправляется через одно соединение.'
+        )
+
+    def test_03_retry_with_backoff(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        settings.EMAIL_BACKEND = f'{__name__}.FailingBackend'
+        self.signup(client, 1)
+
+        assert deliver_pending() == (0, 1)
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1 and email.sent_at is None
+        assert 'SMTP' in email.last_error
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что повторная отправка откладывается.'
+        )
+        assert deliver_pending() == (0, 0)
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        assert deliver_pending() == (1, 0)
+        email.refresh_from_db()
+        assert email.attempts == 2 and email.sent_at is not None
+
+    def test_04_dead_email_message_cleared(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        settings.EMAIL_BACKEND = f'{__name__}.FailingBackend'
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        self.signup(client, 1)
+
+        deliver_pending()
+        assert OutgoingEmail.objects.get().message, (
+            'Проверьте, что письмо сохраняет текст до последней попытки.'
+        )
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        deliver_pending()
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 2 and email.message == '', (
+            'Проверьте, что после последней неудачной попытки текст '
+            'письма с кодом подтверждения удаляется.'
+        )
@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from rest_framework.test import APIClient
+
+from api.authentication import RoleAccessToken
+from tests.utils import create_titles
+
+
+def get_claims_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15StatelessJWT:
+
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+    ME_URL = '/api/v1/users/me/'
+
+    def test_01_token_contains_claims(self, client, user):
+        code = default_token_generator.make_token(user)
+        response = client.post(
+            '/api/v1/auth/token/',
+            data={'username': user.username, 'confirmation_code': code}
+        )
+        assert response.status_code == HTTPStatus.OK
+        token = RoleAccessToken(response.json()['token'])
+        assert token['username'] == user.username
+        assert token['role'] == user.role
+        assert token['is_superuser'] is False
+
+    def test_02_safe_requests_skip_user_query(
+            self, admin, admin_client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        claims_client = get_claims_client(admin)
+        # Версии справочников, произведение и его жанры, без загрузки
+        # самого администратора.
+        with django_assert_num_queries(3):
+            response = claims_client.get(
+                f'{self.TITLES_URL}{titles[0]["id"]}/'
+            )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_full_profile_and_writes_use_database(
+            self, user, admin_client, admin):
+        titles, _, _ = create_titles(admin_client)
+        claims_client = get_claims_client(user)
+
+        response = claims_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['bio'] == user.bio, (
+            'Проверьте, что `/users/me/` возвращает полный профиль из базы.'
+        )
+
+        response = claims_client.post(
+            f'{self.TITLES_URL}{titles[0]["id"]}/reviews/',
+            data={'text': 'Текст', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+
+        response = get_claims_client(admin).get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK
+        response = claims_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_04_demoted_admin_loses_access(self, admin):
+        claims_client = get_claims_client(admin)
+        assert claims_client.get(self.USERS_URL).status_code == HTTPStatus.OK
+        admin.role = admin.USER
+        admin.is_superuser = False
+        admin.save()
+        response = claims_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что список пользователей проверяет роль по базе, '
+            'а не по утверждениям ещё действующего токена.'
+        )
+        response = claims_client.get('/api/v1/export/users.csv')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что выгрузка проверяет роль по базе.'
+        )
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews import search
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture(params=['fts5', 'table'])
+def search_backend(request, settings, monkeypatch):
+    settings.SEARCH_BACKEND = request.param
+    monkeypatch.setattr(search, '_backends', {})
+    backend = search.get_backend()
+    backend.create_table()
+    backend.rebuild()
+    return backend
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Search:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_search_is_ranked_and_synced(
+            self, client, admin_client, user_client, search_backend):
+        titles, _, _ = create_titles(admin_client)
+        terminator, die_hard = titles[0]['id'], titles[1]['id']
+
+        assert self.search(client, 'терминатор') == [terminator], (
+            'Проверьте, что параметр `search` ищет по названию '
+            'произведения без учёта регистра.'
+        )
+        assert self.search(client, 'back') == [terminator], (
+            'Проверьте, что параметр `search` ищет по описанию.'
+        )
+        assert self.search(client, 'несуществующее') == []
+
+        create_single_review(
+            user_client, die_hard, 'Лучше, чем Терминатор', 9
+        )
+        assert self.search(client, 'Терминатор') == [terminator, die_hard], (
+            'Проверьте, что поиск учитывает тексты отзывов, а совпадение '
+            'в названии ранжируется выше.'
+        )
+
+        admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=terminator),
+            data={'name': 'Хищник'}
+        )
+        assert self.search(client, 'хищник') == [terminator]
+        admin_client.delete(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=die_hard)
+        )
+        assert self.search(client, 'терминатор') == []
+
+    def test_02_rebuild_command(self, client, admin_client, search_backend):
+        titles, _, _ = create_titles(admin_client)
+        search_backend.clear()
+        assert self.search(client, 'орешек') == []
+        call_command('rebuild_search_index', stdout=StringIO())
+        assert self.search(client, 'орешек') == [titles[1]['id']]
@@ -0,0 +1,183 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.leaderboards import ALL, RATED
+from reviews.models import Leaderboard
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Leaderboards:
+
+    LEADERBOARD_URL = '/api/v1/leaderboards/{kind}/'
+    SCOPED_LEADERBOARD_URL = '/api/v1/leaderboards/{kind}/{scope}/{value}/'
+    TITLES_URL = '/api/v1/titles/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def create_scored_titles(self, admin_client, user_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Терминатор 2',
+            'year': 1991,
+            'genre': [genres[2]['slug']],
+            'category': categories[0]['slug'],
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        single, pair, weak = (
+            titles[0]['id'], titles[1]['id'], response.json()['id']
+        )
+        create_single_review(admin_client, single, 'Шедевр', 10)
+        reviews = {}
+        for title_id, score in ((pair, 9), (weak, 1)):
+            reviews[title_id] = [
+                create_single_review(
+                    client, title_id, 'Отзыв', score
+                ).json()['id']
+                for client in (admin_client, user_client)
+            ]
+        return (single, pair, weak), reviews, categories, genres
+
+    def get_ids(self, client, url, **params):
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return [entry['title']['id'] for entry in response.json()]
+
+    def test_01_rated_leaderboard_is_bayesian(self, client, admin_client,
+                                              user_client):
+        (single, pair, weak), _, categories, genres = (
+            self.create_scored_titles(admin_client, user_client)
+        )
+        call_command('rebuild_leaderboards')
+
+        url = self.LEADERBOARD_URL.format(kind='rated')
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [entry['title']['id'] for entry in data] == [
+            pair, single, weak
+        ], (
+            'Проверьте, что рейтинг лучших произведений использует '
+            'байесовскую оценку: две девятки выше одной десятки.'
+        )
+        assert [entry['position'] for entry in data] == [1, 2, 3]
+        assert data[0]['reviews_count'] == 2
+        assert data[0]['title']['rating'] == 9, (
+            'Проверьте, что позиция в рейтинге содержит данные '
+            'произведения.'
+        )
+        assert self.get_ids(client, url, limit=1) == [pair]
+        assert client.get(url, {'limit': 0}).status_code == (
+            HTTPStatus.BAD_REQUEST
+        )
+
+        assert self.get_ids(client, self.SCOPED_LEADERBOARD_URL.format(
+            kind='rated', scope='category', value=categories[0]['slug']
+        )) == [single, weak], (
+            'Проверьте, что рейтинг по категории содержит только '
+            'произведения этой категории.'
+        )
+        assert self.get_ids(client, self.SCOPED_LEADERBOARD_URL.format(
+            kind='rated', scope='genre', value=genres[2]['slug']
+        )) == [pair, weak]
+        assert self.get_ids(client, self.SCOPED_LEADERBOARD_URL.format(
+            kind='rated', scope='year', value=1988
+        )) == [pair]
+        response = client.get(self.SCOPED_LEADERBOARD_URL.format(
+            kind='rated', scope='category', value='unknown'
+        ))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_leaderboards_follow_writes(self, client, admin_client,
+                                           user_client):
+        (single, pair, weak), reviews, categories, _ = (
+            self.create_scored_titles(admin_client, user_client)
+        )
+        rated_url = self.LEADERBOARD_URL.format(kind='rated')
+        assert set(self.get_ids(client, rated_url)) == {single, pair, weak}, (
+            'Проверьте, что рейтинг обновляется при создании отзыва без '
+            'полного пересчёта.'
+        )
+        assert self.get_ids(
+            client, self.LEADERBOARD_URL.format(kind='trending')
+        ) == [pair, weak, single], (
+            'Проверьте, что рейтинг обсуждаемых упорядочен по числу '
+            'недавних отзывов.'
+        )
+
+        for review_id in reviews[weak]:
+            response = admin_client.delete(
+                self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                    title_id=weak, review_id=review_id
+                )
+            )
+            assert response.status_code == HTTPStatus.NO_CONTENT
+        assert weak not in self.get_ids(client, rated_url), (
+            'Проверьте, что произведение без отзывов пропадает из рейтинга.'
+        )
+
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{single}/',
+            data={'category': categories[1]['slug']}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for category, expected in zip(categories, ([], [single, pair])):
+            ids = self.get_ids(client, self.SCOPED_LEADERBOARD_URL.format(
+                kind='rated', scope='category', value=category['slug']
+            ))
+            assert sorted(ids) == sorted(expected), (
+                'Проверьте, что при смене категории произведение '
+                'переносится в рейтинг новой категории.'
+            )
+
+    def test_03_leaderboard_query_count(self, client, admin_client,
+                                        user_client,
+                                        django_assert_num_queries):
+        _, _, categories, _ = self.create_scored_titles(
+            admin_client, user_client
+        )
+        # Версии справочников, позиции с произведениями, жанры; категории
+        # и жанры - из справочников в памяти процесса.
+        with django_assert_num_queries(3):
+            client.get(self.LEADERBOARD_URL.format(kind='rated'))
+        # Категория по слагу тоже берётся из справочника.
+        with django_assert_num_queries(3):
+            client.get(self.SCOPED_LEADERBOARD_URL.format(
+                kind='trending', scope='category', value=categories[0]['slug']
+            ))
+
+    def test_04_new_boards_use_global_prior(self, client, admin_client,
+                                            user_client, settings):
+        (single, pair, _), _, categories, genres = self.create_scored_titles(
+            admin_client, user_client
+        )
+        ids = self.get_ids(client, self.LEADERBOARD_URL.format(kind='rated'))
+        assert ids.index(pair) < ids.index(single), (
+            'Проверьте, что до пересчёта средняя нового разреза не берётся '
+            'из оценок первого произведения в нём.'
+        )
+        priors = Leaderboard.objects.filter(kind=RATED).values_list(
+            'prior_mean', flat=True
+        )
+        assert set(priors) == {settings.LEADERBOARD_DEFAULT_PRIOR_MEAN}
+
+        Leaderboard.objects.filter(kind=RATED, board=ALL).update(
+            prior_mean=7
+        )
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Новое', 'year': 2020, 'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+        title_id = response.json()['id']
+        create_single_review(admin_client, title_id, 'Отзыв', 10)
+        assert Leaderboard.objects.get(
+            kind=RATED, board='year:2020'
+        ).prior_mean == 7, (
+            'Проверьте, что новый разрез получает среднюю общего рейтинга.'
+        )
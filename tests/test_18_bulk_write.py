@@ -0,0 +1,202 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import TitleCreateSerializer
+from reviews.models import Title
+from tests.utils import create_categories, create_genre, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18BulkWrite:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_BULK_URL = '/api/v1/titles/bulk/'
+    GENRES_BULK_URL = '/api/v1/genres/bulk/'
+    CATEGORIES_BULK_URL = '/api/v1/categories/bulk/'
+
+    def make_titles(self, count, genres, categories, prefix='Сериал'):
+        return [
+            {
+                'name': f'{prefix} {idx}',
+                'year': 2000 + idx % 20,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[idx % 2]['slug'],
+            }
+            for idx in range(count)
+        ]
+
+    def bulk_create_titles(self, admin_client, data):
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                self.TITLES_BULK_URL, data=data, format='json'
+            )
+        return response, len(context)
+
+    def test_01_bulk_create_titles(self, client, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        # Фильтры загружают справочники в память процесса до замеров.
+        assert client.get(self.TITLES_URL, {
+            'genre': genres[0]['slug'], 'category': categories[0]['slug']
+        }).json()['count'] == 0
+
+        response, few_queries = self.bulk_create_titles(
+            admin_client, self.make_titles(2, genres, categories)
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к '
+            f'`{self.TITLES_BULK_URL}` со списком корректных произведений '
+            'возвращает ответ со статусом 201.'
+        )
+        data = response.json()
+        assert [title['name'] for title in data] == ['Сериал 0', 'Сериал 1']
+        assert all(title['id'] for title in data)
+        assert data[1]['category'] == categories[1]
+        assert sorted(genre['slug'] for genre in data[0]['genre']) == sorted(
+            genre['slug'] for genre in genres
+        ), 'Проверьте, что массовое создание сохраняет жанры произведений.'
+
+        response, many_queries = self.bulk_create_titles(
+            admin_client,
+            self.make_titles(30, genres, categories, prefix='Фильм')
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert many_queries == few_queries, (
+            'Проверьте, что число SQL-запросов массового создания не '
+            'зависит от количества произведений в запросе.'
+        )
+
+        response = client.get(self.TITLES_URL, {'search': 'сериал'})
+        assert response.json()['count'] == 2, (
+            'Проверьте, что массово созданные произведения попадают в '
+            'поисковый индекс и сбрасывают кэш списка произведений.'
+        )
+
+    def test_02_bulk_create_reports_item_errors(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        data = self.make_titles(4, genres, categories)
+        data[1]['genre'] = ['unknown', 'missing']
+        data[2].update(name=titles[0]['name'], year=titles[0]['year'])
+        data[3].update(name=data[0]['name'], year=data[0]['year'])
+
+        response = admin_client.post(
+            self.TITLES_BULK_URL, data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == len(data), (
+            'Проверьте, что ответ с ошибками содержит по элементу на каждый '
+            'объект запроса.'
+        )
+        assert errors[0] == {}
+        assert 'genre' in errors[1]
+        assert 'non_field_errors' in errors[2], (
+            'Проверьте, что массовое создание проверяет уникальность '
+            'пары название-год с уже существующими произведениями.'
+        )
+        assert 'non_field_errors' in errors[3], (
+            'Проверьте, что массовое создание проверяет уникальность '
+            'внутри самого запроса.'
+        )
+        assert client.get(self.TITLES_URL).json()['count'] == len(titles), (
+            'Проверьте, что при ошибках ни одно произведение не создаётся.'
+        )
+
+        for payload in ({'name': 'Сериал'}, [], ['Сериал']):
+            response = admin_client.post(
+                self.TITLES_BULK_URL, data=payload, format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_bulk_update_titles(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.patch(
+            self.TITLES_BULK_URL,
+            data=[
+                {'id': titles[0]['id'], 'name': 'Терминатор 2'},
+                {'id': titles[1]['id'], 'genre': [genres[0]['slug']]},
+            ],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что PATCH-запрос администратора к '
+            f'`{self.TITLES_BULK_URL}` возвращает ответ со статусом 200.'
+        )
+        first, second = (
+            client.get(f'{self.TITLES_URL}{title["id"]}/').json()
+            for title in titles
+        )
+        assert first['name'] == 'Терминатор 2'
+        assert first['year'] == titles[0]['year']
+        assert [genre['slug'] for genre in second['genre']] == [
+            genres[0]['slug']
+        ]
+
+        response = admin_client.patch(
+            self.TITLES_BULK_URL,
+            data=[
+                {'id': titles[0]['id'], 'name': titles[1]['name'],
+                 'year': titles[1]['year']},
+                {'id': 0, 'name': 'Нет такого'},
+            ],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'id' in response.json()[1]
+
+        response = admin_client.patch(
+            self.TITLES_BULK_URL,
+            data=[{'id': titles[0]['id'], 'name': titles[1]['name'],
+                   'year': titles[1]['year']}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'non_field_errors' in response.json()[0]
+
+    def test_04_bulk_genres_and_categories(self, client, admin_client,
+                                           user_client):
+        data = [
+            {'name': 'Вестерн', 'slug': 'western'},
+            {'name': 'Мюзикл', 'slug': 'musical'},
+        ]
+        for url in (self.GENRES_BULK_URL, self.CATEGORIES_BULK_URL):
+            response = user_client.post(url, data=data, format='json')
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что POST-запрос пользователя к `{url}` '
+                'возвращает ответ со статусом 403.'
+            )
+            response = admin_client.post(url, data=data, format='json')
+            assert response.status_code == HTTPStatus.CREATED
+            assert response.json() == data
+
+            response = admin_client.post(url, data=data, format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert all('slug' in errors for errors in response.json())
+
+            response = admin_client.patch(
+                url, data=[{'slug': 'western', 'name': 'Спагетти-вестерн'}],
+                format='json'
+            )
+            assert response.status_code == HTTPStatus.OK
+            list_url = url.replace('bulk/', '')
+            names = [item['name'] for item in client.get(list_url).json()[
+                'results'
+            ]]
+            assert 'Спагетти-вестерн' in names, (
+                f'Проверьте, что PATCH-запрос к `{url}` изменяет объекты и '
+                'сбрасывает кэш списка.'
+            )
+
+    def test_05_title_pks_read_by_db_unique_key(self):
+        serializer = TitleCreateSerializer(many=True, data=[])
+        serializer.is_valid()
+        assert serializer.get_db_unique_fields() == ('name', 'year'), (
+            'Проверьте, что первичные ключи после bulk_create читаются по '
+            'ограничению уникальности базы.'
+        )
+        Title.objects.create(name='Сериал', year=2000)
+        with pytest.raises(IntegrityError), transaction.atomic():
+            Title.objects.create(name='Сериал', year=2000)
@@ -0,0 +1,185 @@
+import time
+from email.utils import formatdate
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from django.conf import settings as django_settings
+
+from api.cache import get_cache
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Часы, по которым ConditionalGetMixin решает, отдавать ли Last-Modified."""
+    clock = SimpleNamespace(time=lambda: time.time() + 1)
+    monkeypatch.setattr('api.mixins.time', clock)
+    return clock
+
+
+@pytest.fixture(autouse=True)
+def conditional_get(settings, clock):
+    settings.CONDITIONAL_GET = 'on'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def get_etag(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('ETag'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок ETag.'
+        )
+        assert response.has_header('Last-Modified')
+        return response['ETag']
+
+    def assert_not_modified(self, client, url, etag,
+                            django_assert_num_queries):
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            'If-None-Match возвращает ответ 304 без запросов к базе.'
+        )
+        assert not response.content
+        assert response['ETag'] == etag
+
+    def test_01_titles_not_modified(self, client, admin_client,
+                                    django_assert_num_queries):
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        etag = self.get_etag(client, self.TITLES_URL)
+        self.assert_not_modified(
+            client, self.TITLES_URL, etag, django_assert_num_queries
+        )
+        response = client.get(
+            self.TITLES_URL,
+            HTTP_IF_MODIFIED_SINCE=client.get(self.TITLES_URL)[
+                'Last-Modified'
+            ]
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что запрос с If-Modified-Since не раньше '
+            'Last-Modified возвращает ответ 304.'
+        )
+        assert self.get_etag(client, f'{self.TITLES_URL}?year=1984') != etag, (
+            'Проверьте, что ETag зависит от параметров запроса.'
+        )
+
+        response = admin_client.patch(
+            '/api/v1/categories/bulk/',
+            data=[{'slug': 'films', 'name': 'Кино'}], format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения данных ETag списка '
+            'произведений меняется.'
+        )
+
+    def test_02_reviews_and_comments_not_modified(
+            self, client, admin_client, admin, user_client, user,
+            moderator_client, django_assert_num_queries):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id, other_title_id = titles[0]['id'], titles[1]['id']
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[0]['id']
+        )
+        reviews_etag = self.get_etag(client, reviews_url)
+        comments_etag = self.get_etag(client, comments_url)
+        for url, etag in ((reviews_url, reviews_etag),
+                          (comments_url, comments_etag)):
+            self.assert_not_modified(
+                client, url, etag, django_assert_num_queries
+            )
+        detail_url = f'{reviews_url}{reviews[0]["id"]}/'
+        self.assert_not_modified(
+            client, detail_url, self.get_etag(client, detail_url),
+            django_assert_num_queries
+        )
+
+        create_single_review(admin_client, other_title_id, 'Отзыв', 7)
+        assert client.get(
+            reviews_url, HTTP_IF_NONE_MATCH=reviews_etag
+        ).status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что отзыв к другому произведению не меняет ETag '
+            'списка отзывов.'
+        )
+
+        create_single_review(moderator_client, title_id, 'Отзыв', 3)
+        assert client.get(
+            reviews_url, HTTP_IF_NONE_MATCH=reviews_etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что новый отзыв меняет ETag списка отзывов '
+            'произведения.'
+        )
+
+        response = user_client.patch(
+            f'{comments_url}{comments[1]["id"]}/', data={'text': 'Правка'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(
+            comments_url, HTTP_IF_NONE_MATCH=comments_etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение комментария меняет ETag списка '
+            'комментариев.'
+        )
+
+    def test_03_last_modified_rounded_up(self, client, clock):
+        changed_at = 1_700_000_000.3
+        get_cache().set('api:version:titles', int(changed_at * 10 ** 9))
+        clock.time = lambda: changed_at + 0.2
+        response = client.get(self.TITLES_URL)
+        assert response.has_header('ETag')
+        assert not response.has_header('Last-Modified'), (
+            'Проверьте, что Last-Modified не отдаётся, пока не закончилась '
+            'секунда последнего изменения.'
+        )
+
+        clock.time = lambda: changed_at + 1.2
+        last_modified = client.get(self.TITLES_URL)['Last-Modified']
+        assert last_modified == formatdate(1_700_000_001, usegmt=True), (
+            'Проверьте, что время изменения округляется вверх.'
+        )
+        response = client.get(
+            self.TITLES_URL, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        get_cache().set('api:version:titles', 1_700_000_001_100_000_000)
+        response = client.get(
+            self.TITLES_URL, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение после отданного Last-Modified не '
+            'даёт ответ 304.'
+        )
+
+    def test_04_auto_requires_shared_cache(self, client, settings, tmp_path):
+        settings.CONDITIONAL_GET = 'auto'
+        assert not client.get(self.TITLES_URL).has_header('ETag'), (
+            'Проверьте, что с кэшем в памяти процесса условные GET-запросы '
+            'выключены: другие процессы не видят сброса версий.'
+        )
+        settings.CACHES = {
+            **django_settings.CACHES,
+            'api': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': str(tmp_path),
+            },
+        }
+        assert client.get(self.TITLES_URL).has_header('ETag')
@@ -0,0 +1,94 @@
+import json
+import re
+
+import pytest
+
+from api import profiling
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Profiling:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_timings(self, response):
+        return {
+            item.split(';')[0]: item
+            for item in response['Server-Timing'].split(', ')
+        }
+
+    def test_01_profile_header_for_admin(self, client, admin_client,
+                                         user_client):
+        create_titles(admin_client)
+        assert not client.get(self.TITLES_URL).has_header('Server-Timing')
+        for not_admin in (client, user_client):
+            response = not_admin.get(self.TITLES_URL, HTTP_X_PROFILE='1')
+            assert not response.has_header('Server-Timing'), (
+                'Проверьте, что замеры по заголовку X-Profile отдаются '
+                'только администратору.'
+            )
+
+        response = admin_client.get(
+            f'{self.TITLES_URL}?year=1984', HTTP_X_PROFILE='1'
+        )
+        assert response.has_header('Server-Timing'), (
+            'Проверьте, что запрос администратора с заголовком X-Profile: 1 '
+            'получает заголовок Server-Timing.'
+        )
+        timings = self.get_timings(response)
+        for name in ('db', 'permissions', 'serialize', 'view', 'total'):
+            assert name in timings, (
+                f'Проверьте, что Server-Timing содержит замер `{name}`.'
+            )
+        assert re.search(r'desc="\d+ queries"', timings['db']), (
+            'Проверьте, что замер `db` содержит число SQL-запросов.'
+        )
+
+    def test_02_profiling_report(self, client, admin_client, settings,
+                                 tmp_path):
+        report_path = tmp_path / 'profile.json'
+        settings.PROFILING_ENABLED = True
+        settings.PROFILING_REPORT_PATH = str(report_path)
+        settings.PROFILING_REPORT_EVERY = 1
+
+        response = client.get(self.TITLES_URL)
+        assert response.has_header('Server-Timing'), (
+            'Проверьте, что при PROFILING_ENABLED замеряются все запросы.'
+        )
+        report = json.loads(report_path.read_text(encoding='utf-8'))
+        route = report['routes']['GET api:title-list']
+        assert route['count'] >= 1
+        assert sum(route['histograms']['total']) == route['count'], (
+            'Проверьте, что отчёт содержит гистограммы замеров по маршрутам.'
+        )
+        assert len(report['buckets_ms']) == len(route['histograms']['total'])
+
+    def test_03_header_ignored_for_others(self, client, user_client,
+                                          monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            profiling, 'install', lambda: calls.append('install')
+        )
+        monkeypatch.setattr(
+            profiling.ProfilingMiddleware, 'profiling',
+            staticmethod(lambda profile: calls.append('profiling'))
+        )
+        for not_admin in (client, user_client):
+            response = not_admin.get(self.TITLES_URL, HTTP_X_PROFILE='1')
+            assert not response.has_header('Server-Timing')
+        assert calls == [], (
+            'Проверьте, что запрос не профилируется, пока не подтверждены '
+            'администратор или секрет, и что без PROFILING_ENABLED методы '
+            'DRF не оборачиваются.'
+        )
+
+    def test_04_profiling_secret(self, client, settings):
+        settings.PROFILING_SECRET = 'load-test'
+        response = client.get(self.TITLES_URL, HTTP_X_PROFILE='1')
+        assert not response.has_header('Server-Timing')
+        response = client.get(self.TITLES_URL, HTTP_X_PROFILE='load-test')
+        assert response.has_header('Server-Timing'), (
+            'Проверьте, что заголовок X-Profile со значением '
+            'PROFILING_SECRET включает замеры для любого клиента.'
+        )
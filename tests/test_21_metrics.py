@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Metrics:
+
+    METRICS_URL = '/metrics'
+    TITLES_URL = '/api/v1/titles/'
+    SIGNUP_URL = '/api/v1/auth/signup/'
+
+    def get_metrics(self, client, **headers):
+        response = client.get(self.METRICS_URL, **headers)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.METRICS_URL}` возвращает '
+            'ответ со статусом 200.'
+        )
+        assert response['Content-Type'].startswith('text/plain')
+        samples = {}
+        for line in response.content.decode().splitlines():
+            if line and not line.startswith('#'):
+                name, value = line.rsplit(' ', 1)
+                samples[name] = float(value)
+        return samples
+
+    def test_01_metrics_cover_routes(self, client, admin_client, admin,
+                                     user_client, user):
+        create_reviews(admin_client, {admin: admin_client, user: user_client})
+        requests_sample = (
+            'yamdb_http_requests_total'
+            '{route="api:title-list",method="GET",status="200"}'
+        )
+        signup_sample = (
+            'yamdb_http_requests_total'
+            '{route="api:signup",method="POST",status="400"}'
+        )
+        before = self.get_metrics(client)
+        for _ in range(3):
+            client.get(self.TITLES_URL)
+        client.post(self.SIGNUP_URL, data={})
+        after = self.get_metrics(client)
+
+        assert (
+            after[requests_sample] - before.get(requests_sample, 0) == 3
+        ), (
+            'Проверьте, что метрики считают запросы по маршрутам, методам '
+            'и кодам ответа.'
+        )
+        assert after[signup_sample] - before.get(signup_sample, 0) == 1, (
+            'Проверьте, что метрики покрывают представления авторизации.'
+        )
+        labels = '{route="api:title-list",method="GET"'
+        count = after[f'yamdb_http_request_duration_seconds_count{labels}}}']
+        assert after[
+            f'yamdb_http_request_duration_seconds_bucket{labels},le="+Inf"}}'
+        ] == count, 'Проверьте гистограмму длительности запросов.'
+        assert f'yamdb_db_queries_total{labels}}}' in after
+        assert after['yamdb_table_rows{table="reviews"}'] == 2, (
+            'Проверьте, что метрики содержат число строк в таблице отзывов.'
+        )
+        assert 'yamdb_api_cache_hits_total{resource="titles"}' in after
+
+    def test_02_metrics_token(self, client, settings):
+        settings.METRICS_TOKEN = 'secret'
+        response = client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что при заданном METRICS_TOKEN метрики без токена '
+            'недоступны.'
+        )
+        self.get_metrics(client, HTTP_AUTHORIZATION='Bearer secret')
+
+    def test_03_table_rows_cached(self, client, django_assert_num_queries):
+        self.get_metrics(client)
+        with django_assert_num_queries(0):
+            samples = self.get_metrics(client)
+        assert samples['yamdb_table_rows{table="reviews"}'] == 0, (
+            'Проверьте, что число строк в таблицах не пересчитывается '
+            'при каждом опросе метрик.'
+        )
@@ -0,0 +1,42 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, connections
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Database:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_sqlite_pragmas(self):
+        connection.close()
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            synchronous, = cursor.fetchone()
+            cursor.execute('PRAGMA temp_store')
+            temp_store, = cursor.fetchone()
+        assert (synchronous, temp_store) == (1, 2), (
+            'Проверьте, что при подключении к SQLite выполняются прагмы '
+            'из SQLITE_PRAGMAS.'
+        )
+
+    def test_02_health_checks(self, client, settings, monkeypatch):
+        wrapper = type(connections['default'])
+        closed = []
+        monkeypatch.setattr(wrapper, 'is_usable', lambda self: False)
+        monkeypatch.setattr(wrapper, 'close', lambda self: closed.append(self))
+        connections['default'].ensure_connection()
+
+        client.get(self.TITLES_URL)
+        assert not closed, (
+            'Проверьте, что без DB_HEALTH_CHECKS соединения перед запросом '
+            'не проверяются.'
+        )
+        settings.DB_HEALTH_CHECKS = True
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert closed, (
+            'Проверьте, что при DB_HEALTH_CHECKS неработающее постоянное '
+            'соединение закрывается перед запросом.'
+        )
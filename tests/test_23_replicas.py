@@ -0,0 +1,105 @@
+import sqlite3
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+from api.db import check_replicas
+
+from tests.utils import create_single_review, create_titles
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    """Файл SQLite как реплика: копия основной базы на момент sync()."""
+    path = str(tmp_path / 'replica.sqlite3')
+    connections.databases[REPLICA] = {
+        'ENGINE': 'django.db.backends.sqlite3', 'NAME': path,
+    }
+    settings.DATABASE_REPLICAS = [REPLICA]
+
+    def sync():
+        connections[REPLICA].close()
+        primary = connections['default']
+        primary.ensure_connection()
+        target = sqlite3.connect(path)
+        primary.connection.backup(target)
+        target.close()
+
+    yield sync
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Replicas:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_reads_from_replica(self, client, admin_client, replica,
+                                   settings):
+        settings.CONDITIONAL_GET = 'on'
+        titles, _, _ = create_titles(admin_client)
+        replica()
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        response = admin_client.patch(url, data={'name': 'Новое название'})
+        assert response.status_code == HTTPStatus.OK
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == titles[0]['name'], (
+            'Проверьте, что GET-запросы к API читают данные с реплики.'
+        )
+        assert not response.has_header('ETag'), (
+            'Проверьте, что ответ отстающей реплики не получает ETag '
+            'новой версии данных.'
+        )
+        assert admin_client.get(url).json()['name'] == 'Новое название', (
+            'Проверьте, что после записи пользователь читает из основной '
+            'базы и видит свои изменения.'
+        )
+
+        replica()
+        assert client.get(url).json()['name'] == 'Новое название'
+
+    def test_02_writes_go_to_primary(self, client, admin_client, user_client,
+                                     replica):
+        titles, _, _ = create_titles(admin_client)
+        replica()
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 5)
+        response = user_client.post(
+            reviews_url, data={'text': 'Ещё отзыв', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что проверка единственности отзыва при POST-запросе '
+            'выполняется в основной базе, а не на реплике.'
+        )
+        assert user_client.get(reviews_url).json()['count'] == 1, (
+            'Проверьте, что автор сразу видит свой отзыв.'
+        )
+        assert client.get(reviews_url).json()['count'] == 0, (
+            'Проверьте, что списки отзывов читаются с реплики.'
+        )
+
+    def test_03_pins_require_shared_cache(self, settings, tmp_path):
+        settings.DATABASE_REPLICAS = [REPLICA]
+        with pytest.raises(ImproperlyConfigured):
+            check_replicas()
+        settings.CACHES = {
+            **django_settings.CACHES,
+            'api': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': str(tmp_path),
+            },
+        }
+        check_replicas()
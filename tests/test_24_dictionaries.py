@@ -0,0 +1,110 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.db import DatabaseError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api import dictionaries
+from api.cache import CATEGORIES, GENRES, TITLES, invalidate
+from reviews.models import Category, Genre
+from tests.utils import create_titles
+
+DICTIONARY_TABLES = re.compile(r'"reviews_(category|genre)"')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Dictionaries:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_titles_without_dictionary_queries(self, client,
+                                                  admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        url = (
+            f'{self.TITLES_URL}?category={categories[0]["slug"]}'
+            f'&genre={genres[0]["slug"]}'
+        )
+        client.get(url)
+        invalidate(TITLES)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [titles[0]['id']]
+        assert results[0]['category'] == categories[0]
+        assert results[0]['genre'] == [genres[1], genres[0]], (
+            'Проверьте, что жанры произведения выводятся по алфавиту.'
+        )
+        tables = [
+            query['sql'] for query in context.captured_queries
+            if DICTIONARY_TABLES.search(query['sql'])
+        ]
+        assert not tables, (
+            'Проверьте, что категории и жанры при выводе и фильтрации '
+            'произведений берутся из справочников в памяти процесса.'
+        )
+
+    def test_02_invalidation_from_other_process(self, client, admin_client):
+        _, categories, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?year=1984'
+        client.get(url)
+        # Изменение без сигналов, как в другом процессе.
+        Category.objects.filter(slug=categories[0]['slug']).update(
+            name='Кино'
+        )
+        invalidate(TITLES)
+        category = client.get(url).json()['results'][0]['category']
+        assert category['name'] == categories[0]['name']
+
+        dictionaries.invalidate(CATEGORIES)
+        invalidate(TITLES)
+        category = client.get(url).json()['results'][0]['category']
+        assert category['name'] == 'Кино', (
+            'Проверьте, что справочник перечитывается после смены его '
+            'версии в базе.'
+        )
+
+    def test_03_rolled_back_changes_not_cached(self):
+        with pytest.raises(DatabaseError):
+            with transaction.atomic():
+                Category.objects.create(name='Черновик', slug='draft')
+                assert dictionaries.categories.get_by_slug('draft')
+                raise DatabaseError
+        assert dictionaries.categories.get_by_slug('draft') is None, (
+            'Проверьте, что отменённые изменения не остаются в справочнике.'
+        )
+
+    def test_04_snapshot_ttl(self, client, admin_client, settings):
+        _, categories, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?year=1984'
+        client.get(url)
+        Category.objects.filter(slug=categories[0]['slug']).update(
+            name='Кино'
+        )
+        settings.DICTIONARY_SNAPSHOT_TTL = 0
+        invalidate(TITLES)
+        category = client.get(url).json()['results'][0]['category']
+        assert category['name'] == 'Кино', (
+            'Проверьте, что снимок справочника перечитывается по истечении '
+            'DICTIONARY_SNAPSHOT_TTL даже без смены версии.'
+        )
+
+    def test_05_genre_deleted_in_other_process(self, admin_client):
+        _, categories, _ = create_titles(admin_client)
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Вестерн', 'slug': 'western'}
+        )
+        assert dictionaries.genres.get_by_slug('western')
+        # Удаление в другом процессе: без сигналов этого процесса, но
+        # со сменой версии в базе.
+        Genre.objects.filter(slug='western')._raw_delete('default')
+        dictionaries.invalidate(GENRES)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Новое', 'year': 2000, 'genre': ['western'],
+            'category': categories[0]['slug'],
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что жанр, удалённый в другом процессе, не проходит '
+            'проверку по устаревшему снимку.'
+        )
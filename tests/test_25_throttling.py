@@ -0,0 +1,124 @@
+from http import HTTPStatus
+
+import pytest
+
+from api import throttling
+
+
+@pytest.fixture
+def throttle_rates(settings):
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates
+            },
+        }
+    return set_rates
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Throttling:
+
+    SIGNUP_URL = '/api/v1/auth/signup/'
+    TOKEN_URL = '/api/v1/auth/token/'
+
+    def signup(self, client, idx, email=None, **extra):
+        return client.post(self.SIGNUP_URL, data={
+            'username': f'user{idx}',
+            'email': email or f'user{idx}@yamdb.fake',
+        }, **extra)
+
+    def test_01_signup_per_ip(self, client, throttle_rates):
+        throttle_rates(signup_ip='3/hour')
+        for idx in range(3):
+            assert self.signup(client, idx).status_code == HTTPStatus.OK
+        response = self.signup(client, 3)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрация ограничена по IP-адресу.'
+        )
+        assert int(response['Retry-After']) > 0
+        response = self.signup(client, 3, REMOTE_ADDR='10.0.0.2')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ограничение по IP-адресу не затрагивает '
+            'другие адреса.'
+        )
+
+    def test_02_signup_per_email_and_username(self, client, throttle_rates):
+        throttle_rates(signup_email='2/hour', signup_username='2/hour')
+        for idx in range(2):
+            self.signup(client, idx, email='Same@yamdb.fake')
+        response = self.signup(client, 2, email='same@yamdb.fake')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрация ограничена по адресу почты '
+            'без учёта регистра.'
+        )
+        for _ in range(2):
+            self.signup(client, 5)
+        response = self.signup(client, 5, email='other@yamdb.fake')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрация ограничена по имени пользователя.'
+        )
+
+    def test_03_token_per_username(self, client, user, throttle_rates):
+        throttle_rates(token_username='2/hour')
+        data = {'username': user.username, 'confirmation_code': 'wrong'}
+        for _ in range(2):
+            response = client.post(self.TOKEN_URL, data=data)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.post(self.TOKEN_URL, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что подбор кода подтверждения для одного '
+            'пользователя ограничен.'
+        )
+        stats = throttling.get_stats()
+        assert stats['token_username', 'allowed'] == 2
+        assert stats['token_username', 'throttled'] == 1
+        metrics = client.get('/metrics').content.decode()
+        assert (
+            'yamdb_throttle_requests_total'
+            '{scope="token_username",result="throttled"} 1'
+        ) in metrics, (
+            'Проверьте, что счётчики ограничения частоты есть в метриках.'
+        )
+
+    def test_04_sqlite_store(self, client, settings, tmp_path,
+                             throttle_rates):
+        settings.THROTTLE_STORE = 'sqlite'
+        settings.THROTTLE_SQLITE_PATH = str(tmp_path / 'throttle.sqlite3')
+        throttle_rates(signup_ip='2/hour')
+        for idx in range(2):
+            assert self.signup(client, idx).status_code == HTTPStatus.OK
+        assert self.signup(client, 2).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+        # Другой процесс видит те же корзины.
+        store = throttling.SQLiteBucketStore(
+            settings.THROTTLE_SQLITE_PATH, settings.THROTTLE_SQLITE_TTL
+        )
+        assert store.consume('signup_ip:127.0.0.1', 2, 2 / 3600) > 0, (
+            'Проверьте, что корзины хранятся в файле SQLite.'
+        )
+
+    def test_05_forwarded_for_not_trusted(self, client, settings,
+                                          throttle_rates):
+        throttle_rates(signup_ip='3/hour')
+        statuses = [
+            self.signup(
+                client, idx, HTTP_X_FORWARDED_FOR=f'10.1.0.{idx}'
+            ).status_code
+            for idx in range(6)
+        ]
+        assert statuses.count(HTTPStatus.TOO_MANY_REQUESTS) == 3, (
+            'Проверьте, что без NUM_PROXIES адрес из X-Forwarded-For не '
+            'учитывается и ограничение по IP нельзя обойти.'
+        )
+
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+        response = self.signup(
+            client, 6, HTTP_X_FORWARDED_FOR='10.1.0.1, 10.2.0.1'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что с NUM_PROXIES адрес клиента берётся из '
+            'X-Forwarded-For, добавленного прокси.'
+        )
@@ -0,0 +1,185 @@
+import asyncio
+import time
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.test import AsyncClient
+from django.urls import resolve
+
+from api import async_views
+from api.cache import get_cache
+from tests.utils import (
+    create_single_comment, create_single_review, create_titles
+)
+
+
+@pytest.fixture
+def asgi_urls(settings):
+    settings.ROOT_URLCONF = 'api_yamdb.asgi_urls'
+
+
+def get_all(urls):
+    """Одновременные GET-запросы через ASGI-обработчик."""
+    client = AsyncClient()
+
+    async def get_many():
+        return await asyncio.gather(*(client.get(url) for url in urls))
+
+    return async_to_sync(get_many)()
+
+
+def call_asgi(path, **headers):
+    """
+    GET-запрос прямо к ASGIHandler: в отличие от AsyncClient, тело
+    потокового ответа перебирается в цикле событий, как на сервере.
+    """
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': b'',
+        'query_string': b'', 'root_path': '',
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 0),
+        'headers': [
+            (name.encode(), value.encode())
+            for name, value in headers.items()
+        ],
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send_message(message):
+        messages.append(message)
+
+    async def request():
+        await ASGIHandler()(scope, receive, send_message)
+
+    async_to_sync(request)()
+    return messages[0]['status'], b''.join(
+        message.get('body', b'') for message in messages[1:]
+    )
+
+
+def send(method, url, **kwargs):
+    async def request():
+        return await getattr(AsyncClient(), method)(url, **kwargs)
+
+    return async_to_sync(request)()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26AsyncViews:
+
+    def urls(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        review = create_single_review(
+            admin_client, titles[0]['id'], 'Ого', 5
+        ).json()
+        create_single_comment(
+            admin_client, titles[0]['id'], review['id'], 'Согласен'
+        )
+        return [
+            f'/api/v1/titles/?genre={genres[0]["slug"]}',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}'
+            '/comments/',
+        ]
+
+    def test_01_same_responses(self, client, admin_client, asgi_urls,
+                               settings):
+        settings.CONDITIONAL_GET = 'on'
+        urls = self.urls(admin_client)
+        for url in urls:
+            assert asyncio.iscoroutinefunction(resolve(url.split('?')[0]).func), (
+                f'Проверьте, что под ASGI маршрут {url} обслуживает '
+                'асинхронное представление.'
+            )
+        responses = get_all(urls)
+        for url, response in zip(urls, responses):
+            expected = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json() == expected.json(), (
+                f'Проверьте, что асинхронное представление {url} отвечает '
+                'так же, как синхронное.'
+            )
+            assert response['ETag'] == expected['ETag']
+
+    def test_02_bounded_pool(self, admin_client, asgi_urls, settings,
+                             monkeypatch):
+        urls = self.urls(admin_client)
+        settings.ASYNC_DB_THREADS = 2
+        monkeypatch.setattr('api.db._executor', None)
+        active = peak = 0
+        render = async_views.render
+
+        def slow_render(*args, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            time.sleep(0.05)
+            try:
+                return render(*args, **kwargs)
+            finally:
+                active -= 1
+
+        monkeypatch.setattr(async_views, 'render', slow_render)
+        responses = get_all(urls * 3)
+        assert all(
+            response.status_code == HTTPStatus.OK for response in responses
+        )
+        assert peak == 2, (
+            'Проверьте, что запросы к базе выполняются параллельно, но не '
+            'более чем в ASYNC_DB_THREADS потоках.'
+        )
+
+    def test_03_writes_and_metrics(self, admin_client, asgi_urls):
+        urls = self.urls(admin_client)
+        token = admin_client._credentials['HTTP_AUTHORIZATION']
+        response = send(
+            'patch', urls[1], data={'name': 'Новое'},
+            content_type='application/json', authorization=token
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что запись на асинхронных маршрутах выполняется '
+            'синхронными представлениями.'
+        )
+        get_cache().clear()
+        assert get_all(urls[1:2])[0].json()['name'] == 'Новое'
+        metrics = send('get', '/metrics').content.decode()
+        queries = dict(
+            line.rsplit(' ', 1) for line in metrics.splitlines()
+            if line.startswith('yamdb_db_queries_total')
+        )
+        route = 'yamdb_db_queries_total{route="api:title-detail",method=%s}'
+        assert float(queries[route % '"GET"']) > 0, (
+            'Проверьте, что в метриках учитываются SQL-запросы, '
+            'выполненные в пуле потоков.'
+        )
+        assert float(queries[route % '"PATCH"']) > 0
+
+    def test_04_profiling(self, admin_client, asgi_urls):
+        urls = self.urls(admin_client)
+        token = admin_client._credentials['HTTP_AUTHORIZATION']
+        response = send('get', urls[1], x_profile='1')
+        assert not response.has_header('Server-Timing')
+        response = send('get', urls[1], x_profile='1', authorization=token)
+        assert response.has_header('Server-Timing'), (
+            'Проверьте, что под ASGI запрос администратора с заголовком '
+            'X-Profile: 1 получает заголовок Server-Timing.'
+        )
+
+    def test_05_export(self, admin_client, asgi_urls):
+        self.urls(admin_client)
+        token = admin_client._credentials['HTTP_AUTHORIZATION']
+        for name in ('users', 'review'):
+            url = f'/api/v1/export/{name}.csv'
+            status, content = call_asgi(url, authorization=token)
+            assert status == HTTPStatus.OK
+            expected = b''.join(admin_client.get(url).streaming_content)
+            assert content == expected and content.count(b'\n') > 1, (
+                'Проверьте, что под ASGI выгрузка отдаёт все строки '
+                'таблицы, а не только заголовок.'
+            )
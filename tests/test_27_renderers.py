@@ -0,0 +1,66 @@
+import datetime
+from collections import OrderedDict
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from api.renderers import FastJSONRenderer
+from tests.utils import create_titles
+
+DATA = {
+    'count': 3,
+    'next': None,
+    'results': ReturnList([
+        OrderedDict(
+            id=1, name='Ёжик в тумане', rating=7.5, score=Decimal('8.25'),
+            year=datetime.date(1975, 1, 1), flag=True,
+            pub_date=datetime.datetime(
+                2023, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc
+            ),
+            naive=datetime.datetime(2023, 5, 1, 12, 30),
+            text='Кавычки " и \\ , перевод\nстроки, \x01, \u2028 и \u2029',
+            detail=gettext_lazy('Не найдено.'),
+            genre=[{'name': 'Драма', 'slug': 'drama'}],
+        ),
+    ], serializer=None),
+    10: 'числовой ключ',
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Renderers:
+
+    @pytest.mark.parametrize('encoder', ['orjson', 'json'])
+    def test_01_same_bytes(self, settings, encoder):
+        settings.JSON_ENCODER = encoder
+        content = FastJSONRenderer().render(DATA, 'application/json')
+        assert content == JSONRenderer().render(DATA, 'application/json'), (
+            'Проверьте, что FastJSONRenderer выводит те же байты, что и '
+            'JSONRenderer DRF.'
+        )
+        assert 'Ёжик'.encode() in content
+        assert b'\\u2028' in content
+        assert FastJSONRenderer().render({'big': 2 ** 70}) == (
+            b'{"big":1180591620717411303424}'
+        )
+
+    def test_02_api_responses(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/json'
+        assert response.content == JSONRenderer().render(response.data), (
+            'Проверьте, что ответы API выводит FastJSONRenderer в том же '
+            'виде, что и JSONRenderer.'
+        )
+        response = client.get(
+            '/api/v1/titles/', HTTP_ACCEPT='application/json; indent=4'
+        )
+        assert b'\n    "count": ' in response.content, (
+            'Проверьте, что отступы из заголовка Accept поддерживаются.'
+        )
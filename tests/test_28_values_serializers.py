@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+
+from api import views
+from api.cache import get_cache
+from api.serializers import ValuesSerializer
+from reviews.models import Title
+from tests.utils import (
+    create_single_comment, create_single_review, create_titles
+)
+
+VIEWSETS = (views.TitleViewSet, views.ReviewViewSet, views.CommentViewSet)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ValuesSerializers:
+
+    def create_data(self, admin_client, user_client):
+        titles, _, genres = create_titles(admin_client)
+        Title.objects.create(name='Без категории', year=2000, description=None)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Отзыв "с кавычками"', 7)
+        review = create_single_review(
+            user_client, title_id, 'Второй отзыв\nв две строки', 4
+        ).json()
+        for text in ('Первый', 'Второй'):
+            create_single_comment(user_client, title_id, review['id'], text)
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        comments_url = f'{reviews_url}{review["id"]}/comments/'
+        return [
+            '/api/v1/titles/',
+            '/api/v1/titles/?year=2000',
+            f'/api/v1/titles/?genre={genres[0]["slug"]}',
+            '/api/v1/titles/?search=терминатор',
+            reviews_url,
+            f'{reviews_url}?pagination=cursor',
+            comments_url,
+            f'{comments_url}?pagination=cursor',
+        ]
+
+    def get_contents(self, client, urls):
+        get_cache().clear()
+        responses = [client.get(url) for url in urls]
+        assert all(
+            response.status_code == HTTPStatus.OK for response in responses
+        )
+        return [response.content for response in responses]
+
+    def test_01_same_bytes(self, client, admin_client, user_client,
+                           monkeypatch):
+        urls = self.create_data(admin_client, user_client)
+        calls = []
+        to_representation = ValuesSerializer.to_representation
+
+        def spy(self, rows):
+            calls.append(type(self))
+            return to_representation(self, rows)
+
+        monkeypatch.setattr(ValuesSerializer, 'to_representation', spy)
+        fast = self.get_contents(client, urls)
+        assert len(calls) == len(urls), (
+            'Проверьте, что списки произведений, отзывов и комментариев '
+            'строятся из строк values().'
+        )
+        for viewset in VIEWSETS:
+            monkeypatch.setattr(viewset, 'values_serializer_class', None)
+        expected = self.get_contents(client, urls)
+        for url, fast_content, content in zip(urls, fast, expected):
+            assert fast_content == content, (
+                f'Проверьте, что ответ {url} совпадает с ответом '
+                'ModelSerializer побайтно.'
+            )